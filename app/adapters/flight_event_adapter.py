@@ -1,32 +1,142 @@
 import httpx
+import time
 
-from typing import List, Dict, Any, Optional
+from importlib.util import find_spec
+from typing import Callable, List, Dict, Any, Optional
 from app.utils.config_vars import ConfigVars
-from app.utils.logger import report_error
+from app.utils.json_stream import JSONArrayStreamParser
+from app.utils.logger import report_error, report_info
+from app.utils.metrics import STAGE_SECONDS, counter
+
+UPSTREAM_FETCHES = counter(
+    "flights_api_upstream_fetches_total",
+    "Fetches of the flight-events feed, by outcome.",
+    ("outcome",),
+)
+UPSTREAM_BYTES = counter(
+    "flights_api_upstream_bytes_total",
+    "Bytes of flight-events feed downloaded.",
+)
+UPSTREAM_EVENTS = counter(
+    "flights_api_upstream_events_total",
+    "Flight events streamed from the upstream feed.",
+)
 
 class FlightEventAdapter:
-    def __init__(self):
-        self.base_url = ConfigVars.FLIGHT_EVENTS_API_URL
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        base_url: Optional[str] = None,
+    ):
+        self.base_url = ConfigVars.FLIGHT_EVENTS_API_URL if base_url is None else base_url
         self.timeout = ConfigVars.DEFAULT_API_TIMEOUT
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=ConfigVars.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=ConfigVars.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=ConfigVars.HTTP_KEEPALIVE_EXPIRY,
+                ),
+                http2=self.http2_enabled(),
+                transport=self.transport,
+            )
+        return self._client
 
+    @staticmethod
+    def http2_enabled() -> bool:
+        if not ConfigVars.HTTP2_ENABLED:
+            return False
+        if find_spec("h2") is None:
+            report_info("HTTP/2 requested but the h2 package is missing, using HTTP/1.1")
+            return False
+        return True
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def fetch_flight_events(self) -> Optional[List[Dict[str, Any]]]:
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.base_url)
+            response = await self.get_client().get(self.base_url)
+            response.raise_for_status()
+
+            return response.json()
+
+        except Exception as exc:
+            self.report_fetch_error(exc)
+
+        return None
+
+    async def stream_flight_events(
+        self, on_event: Callable[[Dict[str, Any]], None]
+    ) -> Optional[int]:
+        """Parses the feed while it downloads, handing each event to ``on_event``.
+
+        Returns the number of events streamed, or None when the fetch failed.
+        The whole download is timed as the "fetch" stage and the work done on
+        each chunk (JSON parsing plus ``on_event``) as the "parse" stage.
+        """
+        started = time.perf_counter()
+        parse_seconds = 0.0
+        size = 0
+        try:
+            async with self.get_client().stream("GET", self.base_url) as response:
                 response.raise_for_status()
 
-                return response.json()
+                parser = JSONArrayStreamParser()
+                count = 0
+                async for chunk in response.aiter_bytes():
+                    chunk_started = time.perf_counter()
+                    size += len(chunk)
+                    for raw_event in parser.feed(chunk):
+                        on_event(raw_event)
+                        count += 1
+                    parse_seconds += time.perf_counter() - chunk_started
+                chunk_started = time.perf_counter()
+                for raw_event in parser.close():
+                    on_event(raw_event)
+                    count += 1
+                parse_seconds += time.perf_counter() - chunk_started
+
+            STAGE_SECONDS.labels("fetch").observe(time.perf_counter() - started)
+            STAGE_SECONDS.labels("parse").observe(parse_seconds)
+            UPSTREAM_FETCHES.labels("ok").inc()
+            UPSTREAM_EVENTS.inc(count)
+            return count
+
+        except Exception as exc:
+            UPSTREAM_FETCHES.labels(self.fetch_outcome(exc)).inc()
+            self.report_fetch_error(exc)
+        finally:
+            UPSTREAM_BYTES.inc(size)
+
+        return None
+
+    @staticmethod
+    def fetch_outcome(exc: Exception) -> str:
+        if isinstance(exc, httpx.TimeoutException):
+            return "timeout"
+        if isinstance(exc, httpx.RequestError):
+            return "connection_error"
+        if isinstance(exc, httpx.HTTPStatusError):
+            return "http_error"
+        return "error"
 
-        except httpx.TimeoutException as exc:
+    @staticmethod
+    def report_fetch_error(exc: Exception):
+        if isinstance(exc, httpx.TimeoutException):
             report_error(f"Timeout error while requesting flight events: {str(exc)}")
-        except httpx.RequestError as exc:
+        elif isinstance(exc, httpx.RequestError):
             report_error(f"Connection error while requesting flight events: {str(exc)}")
-        except httpx.HTTPStatusError as exc:
+        elif isinstance(exc, httpx.HTTPStatusError):
             report_error(
                 f"HTTP {exc.response.status_code} error received from flight events API, {str(exc)}",
             )
-        except Exception as exc:
+        else:
             report_error(f"Unexpected error when fetching flight events: {str(exc)}")
-
-        return None
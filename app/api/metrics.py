@@ -0,0 +1,81 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.services.flight_snapshot_cache import flight_snapshot_cache
+from app.services.hot_route_cache import hot_route_cache
+from app.services.journey_result_cache import journey_result_cache
+from app.utils.metrics import registry
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(tags=["metrics"])
+
+
+def cache_families():
+    """Values owned by the process-wide caches, read at scrape time."""
+    snapshot = flight_snapshot_cache.snapshot
+    if snapshot is not None:
+        yield (
+            "flights_api_snapshot_events",
+            "gauge",
+            "Flight events in the snapshot being served.",
+            [("flights_api_snapshot_events", {}, len(snapshot.graph))],
+        )
+        yield (
+            "flights_api_snapshot_age_seconds",
+            "gauge",
+            "Seconds since the snapshot being served was fetched.",
+            [("flights_api_snapshot_age_seconds", {}, snapshot.age())],
+        )
+        yield (
+            "flights_api_snapshot_version",
+            "gauge",
+            "Version of the snapshot being served.",
+            [("flights_api_snapshot_version", {}, snapshot.version)],
+        )
+
+    stats = journey_result_cache.stats()
+    yield (
+        "flights_api_result_cache_entries",
+        "gauge",
+        "Search results held by the result cache.",
+        [("flights_api_result_cache_entries", {}, stats.pop("size"))],
+    )
+    yield (
+        "flights_api_result_cache_events_total",
+        "counter",
+        "Result cache lookups and removals, by event.",
+        [
+            ("flights_api_result_cache_events_total", {"event": event}, value)
+            for event, value in stats.items()
+        ],
+    )
+
+    hot_stats = hot_route_cache.stats()
+    yield (
+        "flights_api_hot_route_entries",
+        "gauge",
+        "Precomputed hot-route searches for the snapshot being served.",
+        [("flights_api_hot_route_entries", {}, hot_stats["entries"])],
+    )
+    if hot_stats["build_seconds"] is not None:
+        yield (
+            "flights_api_hot_route_build_seconds",
+            "gauge",
+            "Duration of the last hot-route build.",
+            [
+                (
+                    "flights_api_hot_route_build_seconds",
+                    {},
+                    hot_stats["build_seconds"],
+                )
+            ],
+        )
+
+
+registry.add_collector(cache_families)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(registry.render(), media_type=PROMETHEUS_MEDIA_TYPE)
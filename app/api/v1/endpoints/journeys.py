@@ -1,11 +1,32 @@
-from fastapi import APIRouter, Depends
-from typing import List
+import json
+import time
 
-from fastapi import Query
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from typing import AsyncIterator, List, Optional
+
+from fastapi import Header, Query
+from fastapi.encoders import jsonable_encoder
 from datetime import date
+from app.api.v1.requests.journey_search import BatchJourneySearchRequest
+from app.api.v1.responses.batch_journey_response import BatchJourneySearchResponse
+from app.api.v1.responses.journey_encoder import JourneyEncoder
 from app.api.v1.responses.journey_response import JourneyResponse
+from app.services.hot_route_cache import HotRouteCache
+from app.services.journey_result_cache import JourneyResultCache
 from app.services.journey_service import JourneyService
 from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.utils.config_vars import ConfigVars
+from app.utils.cursor import CursorExpiredError, decode_cursor, encode_cursor
+from app.utils.metrics import STAGE_SECONDS
+from app.utils.profiling import (
+    InlineExecutor,
+    ProfilerBusyError,
+    RequestProfiler,
+    profiling_allowed,
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
 router = APIRouter(prefix="/journeys", tags=["journeys"])
 
@@ -19,8 +40,164 @@ async def search_flights(
     destination: str = Query(
         ..., alias="to", min_length=3, max_length=3, pattern=r"^[A-Z]+$"
     ),
+    limit: Optional[int] = Query(None, ge=1, le=ConfigVars.SEARCH_MAX_LIMIT),
+    cursor: Optional[str] = Query(None),
+    accept: Optional[str] = Header(None),
+    profile: Optional[str] = Query(None, include_in_schema=False),
+    x_profile_token: Optional[str] = Header(None, include_in_schema=False),
 ):
     filter_dto = FlightFilterDTO(date, origin, destination)
-    raw_results = await JourneyService().build_journeys(filter_dto)
+    ndjson = bool(accept and NDJSON_MEDIA_TYPE in accept)
+    if profile is not None or x_profile_token is not None:
+        return await profiled_search(
+            filter_dto, x_profile_token or profile, limit, cursor, ndjson
+        )
+    service = JourneyService()
+    if ndjson:
+        return StreamingResponse(
+            ndjson_journeys(service, service.stream_journeys(filter_dto)),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+    if limit is not None or cursor is not None:
+        return await search_flights_page(service, filter_dto, limit, cursor)
+    raw_results = await service.build_journeys(filter_dto)
+
+    with STAGE_SECONDS.labels("serialize").time():
+        content = journey_encoder(service).encode(raw_results)
+    return Response(content, media_type="application/json")
+
+
+async def search_flights_page(
+    service: JourneyService,
+    filter_dto: FlightFilterDTO,
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> Response:
+    """One page of results; the cursor of the next page is in X-Next-Cursor."""
+    snapshot_version, offset = None, 0
+    if cursor is not None:
+        try:
+            snapshot_version, offset = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    try:
+        page = await service.search_page(
+            filter_dto,
+            ConfigVars.SEARCH_DEFAULT_LIMIT if limit is None else limit,
+            offset,
+            snapshot_version,
+        )
+    except CursorExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+    headers = {}
+    if page.next_offset is not None:
+        headers["X-Next-Cursor"] = encode_cursor(
+            page.snapshot_version, page.next_offset
+        )
+    with STAGE_SECONDS.labels("serialize").time():
+        content = journey_encoder(service).encode(page.journeys)
+    return Response(content, media_type="application/json", headers=headers)
+
+
+async def profiled_search(
+    filter_dto: FlightFilterDTO,
+    token: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    ndjson: bool = False,
+) -> Response:
+    """Profiles one search and its response encoding, in the mode requested
+    (a JSON array, a page or an NDJSON stream).
+
+    Returns the stage and strategy timings and the top functions, or, with
+    PROFILE_OUTPUT_DIR set, the usual response with the report's path in
+    X-Profile-File. The search bypasses the result and hot-route caches and
+    runs its strategies inline, so the profile shows the work a cache miss
+    does.
+    """
+    if not profiling_allowed(token):
+        raise HTTPException(status_code=403, detail="profiling is not allowed")
+    service = JourneyService(
+        result_cache=JourneyResultCache(max_entries=0),
+        executor=InlineExecutor(),
+        hot_routes=HotRouteCache(routes=[]),
+    )
+    try:
+        with RequestProfiler() as profiler:
+            if ndjson:
+                mode = "ndjson"
+                lines = [
+                    line
+                    async for line in ndjson_journeys(
+                        service, service.stream_journeys(filter_dto)
+                    )
+                ]
+                response = Response(b"".join(lines), media_type=NDJSON_MEDIA_TYPE)
+            elif limit is not None or cursor is not None:
+                mode = "page"
+                response = await search_flights_page(service, filter_dto, limit, cursor)
+            else:
+                mode = "json"
+                raw_results = await service.build_journeys(filter_dto)
+                with STAGE_SECONDS.labels("serialize").time():
+                    content = journey_encoder(service).encode(raw_results)
+                response = Response(content, media_type="application/json")
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    journeys = len(lines) if ndjson else len(json.loads(response.body))
+    report = profiler.report(search=filter_dto.__dict__, mode=mode, journeys=journeys)
+    if not ConfigVars.PROFILE_OUTPUT_DIR:
+        headers = {}
+        if "X-Next-Cursor" in response.headers:
+            headers["X-Next-Cursor"] = response.headers["X-Next-Cursor"]
+        return JSONResponse(jsonable_encoder(report), headers=headers)
+    response.headers["X-Profile-File"] = profiler.save(
+        ConfigVars.PROFILE_OUTPUT_DIR, report
+    )
+    return response
+
+
+def journey_encoder(service: JourneyService) -> JourneyEncoder:
+    # Responses are encoded directly in the JourneyResponse wire format, so
+    # response_model only documents the schema. The snapshot that served the
+    # search has the fragments of its events, even if it was replaced since.
+    return JourneyEncoder.of(service.served_snapshot)
+
+
+async def ndjson_journeys(
+    service: JourneyService, journeys: AsyncIterator[dict]
+) -> AsyncIterator[bytes]:
+    """One JourneyResponse per line, up to STREAM_MAX_JOURNEYS (0 = no limit)."""
+    limit = ConfigVars.STREAM_MAX_JOURNEYS
+    sent = 0
+    encoder = None
+    # Only the encoding is timed, not the waits for the next journey.
+    serialize_seconds = 0.0
+    try:
+        async for journey in journeys:
+            started = time.perf_counter()
+            if encoder is None:
+                encoder = journey_encoder(service)
+            line = encoder.encode_line(journey)
+            serialize_seconds += time.perf_counter() - started
+            yield line
+            sent += 1
+            if limit and sent >= limit:
+                break
+    finally:
+        await journeys.aclose()
+        if sent:
+            STAGE_SECONDS.labels("serialize").observe(serialize_seconds)
+
+
+@router.post("/search/batch", response_model=BatchJourneySearchResponse)
+async def search_flights_batch(request: BatchJourneySearchRequest):
+    filters = request.to_dtos()
+    service = JourneyService()
+    raw_results = await service.build_journeys_batch(filters)
 
-    return list(map(JourneyResponse.from_dto, raw_results))
+    with STAGE_SECONDS.labels("serialize").time():
+        content = journey_encoder(service).encode_batch(filters, raw_results)
+    return Response(content, media_type="application/json")
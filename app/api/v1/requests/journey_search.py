@@ -1,14 +1,17 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Annotated
-from datetime import date as input_date
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import Annotated, List, Optional
+from datetime import date as input_date, timedelta
 from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.utils.config_vars import ConfigVars
+
+CityCode = Annotated[str, Field(min_length=3, max_length=3, pattern=r"^[A-Z]+$")]
 
 
 class FlightSearchRequest(BaseModel):
     date: input_date = Field(..., description="Date in format YYYY-MM-DD")
-    from_:str= Field(..., alias='from')
+    from_: CityCode = Field(..., alias='from')
     to: Annotated[
-        str, Field(..., description="Destination airport code (3 uppercase letters)")
+        CityCode, Field(..., description="Destination airport code (3 uppercase letters)")
     ]
 
     model_config = ConfigDict(populate_by_name=True)
@@ -19,3 +22,52 @@ class FlightSearchRequest(BaseModel):
             origin=self.from_,
             destination=self.to,
         )
+
+
+class DateRangeSearchRequest(BaseModel):
+    start: input_date = Field(..., description="First date, YYYY-MM-DD")
+    end: input_date = Field(..., description="Last date (inclusive), YYYY-MM-DD")
+    from_: CityCode = Field(..., alias='from')
+    to: CityCode
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    @model_validator(mode="after")
+    def check_range(self) -> "DateRangeSearchRequest":
+        if self.end < self.start:
+            raise ValueError("end must not be before start")
+        return self
+
+    @property
+    def days(self) -> int:
+        return (self.end - self.start).days + 1
+
+    def to_dtos(self) -> List[FlightFilterDTO]:
+        return [
+            FlightFilterDTO(self.start + timedelta(days=i), self.from_, self.to)
+            for i in range(self.days)
+        ]
+
+
+class BatchJourneySearchRequest(BaseModel):
+    queries: List[FlightSearchRequest] = Field(default_factory=list)
+    date_range: Optional[DateRangeSearchRequest] = None
+
+    @model_validator(mode="after")
+    def check_queries(self) -> "BatchJourneySearchRequest":
+        if bool(self.queries) == (self.date_range is not None):
+            raise ValueError("provide either queries or date_range")
+        # Counted without building the filters, so a huge range is cheap to reject.
+        count = (
+            self.date_range.days if self.date_range is not None else len(self.queries)
+        )
+        if count > ConfigVars.BATCH_MAX_QUERIES:
+            raise ValueError(
+                f"a batch may contain at most {ConfigVars.BATCH_MAX_QUERIES} queries"
+            )
+        return self
+
+    def to_dtos(self) -> List[FlightFilterDTO]:
+        if self.date_range is not None:
+            return self.date_range.to_dtos()
+        return [query.to_dto() for query in self.queries]
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field, ConfigDict
+from datetime import date as result_date
+from typing import List
+from app.api.v1.responses.journey_response import JourneyResponse
+
+
+class BatchJourneyResult(BaseModel):
+    date: result_date
+    from_: str = Field(..., alias='from')
+    to: str
+    journeys: List[JourneyResponse]
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class BatchJourneySearchResponse(BaseModel):
+    results: List[BatchJourneyResult]
@@ -0,0 +1,48 @@
+from typing import Iterable, List, Optional
+
+from app.core.event_fragments import EventFragments
+from app.core.flight_snapshot import FlightSnapshot
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.utils.fast_json import dumps
+
+
+class JourneyEncoder:
+    """Encodes journeys in the JourneyResponse wire format without models.
+
+    Legs are the pre-rendered FlightItem fragments of the snapshot the
+    journeys were found in, so encoding a response is a byte join.
+    """
+
+    def __init__(self, fragments: Optional[EventFragments] = None):
+        self.fragments = EventFragments() if fragments is None else fragments
+
+    @classmethod
+    def of(cls, snapshot: Optional[FlightSnapshot]) -> "JourneyEncoder":
+        return cls(None if snapshot is None else snapshot.fragments)
+
+    def journey(self, journey: dict) -> bytes:
+        return b'{"connections":%d,"path":[%s]}' % (
+            journey["connections"],
+            b",".join(map(self.fragments.fragment, journey["path"])),
+        )
+
+    def encode(self, journeys: Iterable[dict]) -> bytes:
+        return b"[" + b",".join(map(self.journey, journeys)) + b"]"
+
+    def encode_line(self, journey: dict) -> bytes:
+        return self.journey(journey) + b"\n"
+
+    def encode_batch(
+        self, flight_filters: List[FlightFilterDTO], results: List[List[dict]]
+    ) -> bytes:
+        """BatchJourneySearchResponse for ``results`` in query order."""
+        items = (
+            dumps({"date": f.date.isoformat(), "from": f.origin, "to": f.destination})[
+                :-1
+            ]
+            + b',"journeys":'
+            + self.encode(journeys)
+            + b"}"
+            for f, journeys in zip(flight_filters, results)
+        )
+        return b'{"results":[' + b",".join(items) + b"]}"
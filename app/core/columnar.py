@@ -0,0 +1,166 @@
+import weakref
+
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+from app.core.flight_graph import FlightEvents, FlightGraph
+from app.dtos.flight_event_dto import FlightEventDTO
+
+# Route keys and departure offsets are packed into one int64 so a single
+# searchsorted finds a layover window inside a route.
+_ROUTE_SHIFT = 1 << 32
+
+
+def columnar_available() -> bool:
+    return np is not None
+
+
+class ColumnarFlightTable:
+    """NumPy column store over a feed snapshot.
+
+    City codes are integer-coded and times are int64 epoch seconds, so
+    journey filters run as vectorized masks and searchsorted joins. Rows keep
+    the departure-time order of the source FlightGraph.
+    """
+
+    _tables: "weakref.WeakKeyDictionary[FlightGraph, ColumnarFlightTable]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self, graph: FlightGraph):
+        if np is None:
+            raise RuntimeError("numpy is required for the columnar flight table")
+
+        self.events: List[FlightEventDTO] = graph.events
+        self.cities: List[str] = sorted(
+            {e.departure_city for e in self.events}
+            | {e.arrival_city for e in self.events}
+        )
+        self.city_codes: Dict[str, int] = {c: i for i, c in enumerate(self.cities)}
+
+        size = len(self.events)
+        codes = self.city_codes
+        self.departure_city = np.fromiter(
+            (codes[e.departure_city] for e in self.events), np.int64, size
+        )
+        self.arrival_city = np.fromiter(
+            (codes[e.arrival_city] for e in self.events), np.int64, size
+        )
+        self.departure_ts = np.fromiter(
+            (e.departure_ts for e in self.events), np.int64, size
+        )
+        self.arrival_ts = np.fromiter(
+            (e.arrival_ts for e in self.events), np.int64, size
+        )
+        self.departure_day = np.fromiter(
+            (e.departure_date.toordinal() for e in self.events), np.int64, size
+        )
+
+        self.base_ts = int(self.departure_ts.min()) if size else 0
+        route_key = self.departure_city * len(self.cities) + self.arrival_city
+        self.route_order = np.lexsort((self.departure_ts, route_key))
+        self.route_departures = (
+            route_key[self.route_order] * _ROUTE_SHIFT
+            + (self.departure_ts[self.route_order] - self.base_ts)
+        )
+        self.origin_order = np.lexsort((self.departure_ts, self.departure_city))
+        self.origin_departures = self.departure_city[self.origin_order]
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @classmethod
+    def of(cls, flight_events: FlightEvents) -> "ColumnarFlightTable":
+        """Returns the table of a graph, building it once per graph."""
+        graph = FlightGraph.of(flight_events)
+        table = cls._tables.get(graph)
+        if table is None:
+            table = cls(graph)
+            cls._tables[graph] = table
+        return table
+
+    def city_code(self, city: str) -> int:
+        return self.city_codes.get(city, -1)
+
+    def route_slice(self, origin: int, destination: int) -> Tuple[int, int]:
+        key = (origin * len(self.cities) + destination) * _ROUTE_SHIFT
+        return (
+            int(np.searchsorted(self.route_departures, key, "left")),
+            int(np.searchsorted(self.route_departures, key + _ROUTE_SHIFT, "left")),
+        )
+
+    def departures_on(self, origin: str, day_ordinal: int) -> "np.ndarray":
+        """Row indices of flights leaving ``origin`` on a day, in departure order."""
+        origin_code = self.city_code(origin)
+        if origin_code < 0:
+            return np.empty(0, np.int64)
+
+        lo = int(np.searchsorted(self.origin_departures, origin_code, "left"))
+        hi = int(np.searchsorted(self.origin_departures, origin_code, "right"))
+        rows = self.origin_order[lo:hi]
+        return rows[self.departure_day[rows] == day_ordinal]
+
+    def direct(
+        self, origin: str, destination: str, day_ordinal: int, max_seconds: int
+    ) -> "np.ndarray":
+        """Row indices of direct flights, in departure order."""
+        origin_code = self.city_code(origin)
+        destination_code = self.city_code(destination)
+        if origin_code < 0 or destination_code < 0:
+            return np.empty(0, np.int64)
+
+        lo, hi = self.route_slice(origin_code, destination_code)
+        rows = self.route_order[lo:hi]
+        mask = (self.departure_day[rows] == day_ordinal) & (
+            self.arrival_ts[rows] - self.departure_ts[rows] <= max_seconds
+        )
+        return rows[mask]
+
+    def one_stop(
+        self,
+        first_legs: Optional["np.ndarray"],
+        destination: str,
+        max_layover_seconds: int,
+        max_journey_seconds: int,
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Joins ``first_legs`` with second legs into ``destination``.
+
+        A second leg departs from the first leg's arrival city within
+        ``(arrival, arrival + max_layover_seconds]`` and the whole journey
+        lasts at most ``max_journey_seconds``. Returns parallel row-index
+        arrays ordered by first leg, then second-leg departure. Every row is
+        a first-leg candidate when ``first_legs`` is None.
+        """
+        if first_legs is None:
+            first_legs = np.arange(len(self.events))
+        destination_code = self.city_code(destination)
+        if destination_code < 0 or not len(first_legs):
+            empty = np.empty(0, np.int64)
+            return empty, empty
+
+        hub_keys = (
+            self.arrival_city[first_legs] * len(self.cities) + destination_code
+        ) * _ROUTE_SHIFT
+        window_start = hub_keys + (self.arrival_ts[first_legs] - self.base_ts)
+        lo = np.searchsorted(self.route_departures, window_start, "right")
+        hi = np.searchsorted(
+            self.route_departures, window_start + max_layover_seconds, "right"
+        )
+
+        counts = hi - lo
+        total = int(counts.sum())
+        if not total:
+            empty = np.empty(0, np.int64)
+            return empty, empty
+
+        first = np.repeat(first_legs, counts)
+        group_start = np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.arange(total) - group_start + np.repeat(lo, counts)
+        second = self.route_order[positions]
+
+        keep = self.arrival_ts[second] - self.departure_ts[first] <= max_journey_seconds
+        return first[keep], second[keep]
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.utils.fast_json import dumps
+
+# Same format as FlightItem.from_dto in app/api/v1/responses/journey_response.py.
+TIME_FORMAT = "%Y-%m-%d %H:%M"
+
+
+class EventFragments:
+    """FlightItem JSON of each event, rendered once per snapshot.
+
+    Journeys are serialized by joining these byte fragments. Rendering is
+    done up front for every event when ``events`` is given, and an event of
+    another snapshot is then rendered without being kept; otherwise events
+    are rendered and kept on first use. Feed timestamps repeat a lot, so
+    each distinct datetime is formatted only once.
+    """
+
+    def __init__(self, events: Optional[Iterable[FlightEventDTO]] = None):
+        self._fragments: Dict[FlightEventDTO, bytes] = {}
+        # Keyed with the offset: the same instant in two offsets compares
+        # equal but formats differently.
+        self._times: Dict[Tuple[datetime, Optional[timedelta]], str] = {}
+        self._eager = events is not None
+        if events is not None:
+            for event in events:
+                self._fragments[event] = self.render(event)
+        # The time cache is only worth its memory while the snapshot loads.
+        self._times.clear()
+
+    def patched(
+        self, added: Iterable[FlightEventDTO], removed: Iterable[FlightEventDTO]
+    ) -> "EventFragments":
+        """A copy without the ``removed`` events' fragments and, when this
+        one was rendered up front, with the ``added`` ones rendered."""
+        fragments = EventFragments()
+        fragments._fragments = dict(self._fragments)
+        fragments._eager = self._eager
+        for event in removed:
+            fragments._fragments.pop(event, None)
+        if self._eager:
+            for event in added:
+                fragments._fragments[event] = fragments.render(event)
+            fragments._times.clear()
+        return fragments
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def nbytes(self) -> int:
+        return sum(map(len, self._fragments.values()))
+
+    def format_time(self, moment: datetime) -> str:
+        key = (moment, moment.utcoffset())
+        formatted = self._times.get(key)
+        if formatted is None:
+            formatted = moment.strftime(TIME_FORMAT)
+            self._times[key] = formatted
+        return formatted
+
+    def render(self, event: FlightEventDTO) -> bytes:
+        fragment = dumps(
+            {
+                "flight_number": event.flight_number,
+                "from": event.departure_city,
+                "to": event.arrival_city,
+                "departure_time": self.format_time(event.departure_datetime),
+                "arrival_time": self.format_time(event.arrival_datetime),
+            }
+        )
+        # orjson returns bytes backed by an oversized buffer (about 1 KiB);
+        # copying keeps a long-lived fragment at its real size.
+        return bytes(memoryview(fragment))
+
+    def fragment(self, event: FlightEventDTO) -> bytes:
+        fragment = self._fragments.get(event)
+        if fragment is None:
+            fragment = self.render(event)
+            if self._eager:
+                # Not one of this snapshot's events; keep neither it nor
+                # its times, so long-lived fragments do not grow.
+                self._times.clear()
+            else:
+                self._fragments[event] = fragment
+        return fragment
@@ -0,0 +1,204 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from itertools import chain, islice
+from operator import le
+from typing import Callable, Dict, Hashable, Iterable, List, Sequence, Tuple, Union
+
+from app.dtos.flight_event_dto import FlightEventDTO
+
+
+def departure_key(event: FlightEventDTO) -> int:
+    return event.departure_ts
+
+
+def local_date_key(event: FlightEventDTO) -> Tuple[date, int]:
+    return event.departure_date, event.departure_ts
+
+
+class FlightBucket:
+    """Flight events sorted by departure time, searchable with bisect.
+
+    Departure dates are local to each event, so with mixed UTC offsets they
+    are not in departure-time order; such buckets keep a second copy of the
+    events sorted by (local date, departure time) for departing_on.
+    """
+
+    __slots__ = ("events", "departures", "dates", "dated_events")
+
+    def __init__(self, events: Iterable[FlightEventDTO] = ()):
+        self.events: List[FlightEventDTO] = sorted(events, key=departure_key)
+        self.departures: List[int] = [e.departure_ts for e in self.events]
+        self.dates: List[date] = [e.departure_date for e in self.events]
+        self.dated_events = self.events
+        if not all(map(le, self.dates, islice(self.dates, 1, None))):
+            self.dated_events = sorted(self.events, key=local_date_key)
+            self.dates = [e.departure_date for e in self.dated_events]
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def departing_on(self, day: date) -> List[FlightEventDTO]:
+        return self.dated_events[
+            bisect_left(self.dates, day) : bisect_right(self.dates, day)
+        ]
+
+    def departing_between(self, start_ts: int, end_ts: int) -> List[FlightEventDTO]:
+        """Events departing in the half-open window ``(start_ts, end_ts]``."""
+        return self.events[
+            bisect_right(self.departures, start_ts) : bisect_right(
+                self.departures, end_ts
+            )
+        ]
+
+
+EMPTY_BUCKET = FlightBucket()
+
+
+class FlightGraphBuilder:
+    """Buckets flight events one at a time, e.g. while the feed downloads."""
+
+    def __init__(self):
+        self.events: List[FlightEventDTO] = []
+        self.by_departure_city: Dict[str, List[FlightEventDTO]] = defaultdict(list)
+        self.by_route: Dict[Tuple[str, str], List[FlightEventDTO]] = defaultdict(
+            list
+        )
+        self.by_departure_date: Dict[date, List[FlightEventDTO]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def add(self, event: FlightEventDTO):
+        self.events.append(event)
+        self.by_departure_city[event.departure_city].append(event)
+        self.by_route[(event.departure_city, event.arrival_city)].append(event)
+        self.by_departure_date[event.departure_date].append(event)
+
+    def build(self) -> "FlightGraph":
+        return FlightGraph.from_builder(self)
+
+
+class FlightGraph:
+    """In-memory index over a feed snapshot.
+
+    Events are bucketed by departure city, by route (departure city, arrival
+    city) and by departure date. Every bucket is sorted by departure time.
+    """
+
+    def __init__(self, flight_events: Iterable[FlightEventDTO] = ()):
+        builder = FlightGraphBuilder()
+        for event in flight_events:
+            builder.add(event)
+        self._index(builder)
+
+    @classmethod
+    def from_builder(cls, builder: FlightGraphBuilder) -> "FlightGraph":
+        graph = cls.__new__(cls)
+        graph._index(builder)
+        return graph
+
+    def _index(self, builder: FlightGraphBuilder):
+        self._events: List[FlightEventDTO] = sorted(builder.events, key=departure_key)
+        self._size = len(self._events)
+        self.by_departure_city = {
+            k: FlightBucket(v) for k, v in builder.by_departure_city.items()
+        }
+        self.by_route = {k: FlightBucket(v) for k, v in builder.by_route.items()}
+        self.by_departure_date = {
+            k: FlightBucket(v) for k, v in builder.by_departure_date.items()
+        }
+
+    def apply(
+        self, added: Sequence[FlightEventDTO], removed: Sequence[FlightEventDTO]
+    ) -> "FlightGraph":
+        """A new graph with the changes applied; this one is left untouched.
+
+        Only buckets that gain or lose events are rebuilt, every other bucket
+        is shared with this graph.
+        """
+        removed_events = set(removed)
+        graph = FlightGraph.__new__(FlightGraph)
+        graph._events = None
+        graph._size = self._size + len(added) - len(removed)
+        graph.by_departure_city = self._patch(
+            self.by_departure_city,
+            added,
+            removed_events,
+            lambda e: e.departure_city,
+        )
+        graph.by_route = self._patch(
+            self.by_route,
+            added,
+            removed_events,
+            lambda e: (e.departure_city, e.arrival_city),
+        )
+        graph.by_departure_date = self._patch(
+            self.by_departure_date,
+            added,
+            removed_events,
+            lambda e: e.departure_date,
+        )
+        return graph
+
+    @staticmethod
+    def _patch(
+        buckets: Dict[Hashable, FlightBucket],
+        added: Sequence[FlightEventDTO],
+        removed: set,
+        key: Callable[[FlightEventDTO], Hashable],
+    ) -> Dict[Hashable, FlightBucket]:
+        changes: Dict[Hashable, List[FlightEventDTO]] = defaultdict(list)
+        for event in added:
+            changes[key(event)].append(event)
+        for event in removed:
+            changes.setdefault(key(event), [])
+
+        patched = dict(buckets)
+        for bucket_key, new_events in changes.items():
+            bucket = buckets.get(bucket_key, EMPTY_BUCKET)
+            events = [e for e in bucket.events if e not in removed] + new_events
+            if events:
+                patched[bucket_key] = FlightBucket(events)
+            else:
+                patched.pop(bucket_key, None)
+        return patched
+
+    @property
+    def events(self) -> List[FlightEventDTO]:
+        """Every event by departure time; built on first use for patched graphs."""
+        if self._events is None:
+            self._events = sorted(
+                chain.from_iterable(
+                    bucket.events for bucket in self.by_departure_date.values()
+                ),
+                key=departure_key,
+            )
+        return self._events
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        return iter(self.events)
+
+    @classmethod
+    def of(cls, flight_events: "FlightEvents") -> "FlightGraph":
+        if isinstance(flight_events, cls):
+            return flight_events
+        return cls(flight_events)
+
+    def departures_from(self, city: str) -> FlightBucket:
+        return self.by_departure_city.get(city, EMPTY_BUCKET)
+
+    def route(self, origin: str, destination: str) -> FlightBucket:
+        return self.by_route.get((origin, destination), EMPTY_BUCKET)
+
+    def departures_on(self, day: date) -> FlightBucket:
+        return self.by_departure_date.get(day, EMPTY_BUCKET)
+
+
+FlightEvents = Union[Sequence[FlightEventDTO], FlightGraph]
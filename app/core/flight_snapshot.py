@@ -0,0 +1,66 @@
+import time
+from typing import Dict, List, Optional
+
+from app.core.event_fragments import EventFragments
+from app.core.flight_graph import FlightEvents, FlightGraph
+from app.core.route_reachability import RouteReachability
+from app.core.snapshot_delta import EventKey, SnapshotDelta
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.utils.config_vars import ConfigVars
+
+
+class FlightSnapshot:
+    """Immutable view of the flight-events feed at a given point in time."""
+
+    def __init__(
+        self,
+        flight_events: FlightEvents,
+        version: int,
+        loaded_at: Optional[float] = None,
+    ):
+        self.graph = FlightGraph.of(flight_events)
+        self.reachability = RouteReachability(self.graph)
+        self.fragments = EventFragments(
+            self.graph if ConfigVars.PRERENDER_EVENT_FRAGMENTS else None
+        )
+        self.version = version
+        self.loaded_at = time.monotonic() if loaded_at is None else loaded_at
+        # Set on snapshots derived from a previous one; see from_delta.
+        self.delta: Optional[SnapshotDelta] = None
+        self.event_index: Optional[Dict[EventKey, FlightEventDTO]] = None
+
+    @classmethod
+    def from_delta(
+        cls,
+        previous: "FlightSnapshot",
+        delta: SnapshotDelta,
+        version: int,
+        event_index: Optional[Dict[EventKey, FlightEventDTO]] = None,
+        loaded_at: Optional[float] = None,
+    ) -> "FlightSnapshot":
+        """The successor of ``previous``, updating only what ``delta`` touches."""
+        snapshot = cls.__new__(cls)
+        if delta:
+            snapshot.graph = previous.graph.apply(delta.added, delta.removed)
+            snapshot.reachability = previous.reachability.patched(
+                snapshot.graph, delta.changed()
+            )
+            snapshot.fragments = previous.fragments.patched(
+                delta.added, delta.removed
+            )
+        else:
+            snapshot.graph = previous.graph
+            snapshot.reachability = previous.reachability
+            snapshot.fragments = previous.fragments
+        snapshot.version = version
+        snapshot.loaded_at = time.monotonic() if loaded_at is None else loaded_at
+        snapshot.delta = delta
+        snapshot.event_index = event_index
+        return snapshot
+
+    @property
+    def events(self) -> List[FlightEventDTO]:
+        return self.graph.events
+
+    def age(self) -> float:
+        return time.monotonic() - self.loaded_at
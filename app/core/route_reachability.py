@@ -0,0 +1,79 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, FrozenSet, Iterable, Set, Tuple
+
+from app.core.flight_graph import FlightGraph
+from app.dtos.flight_event_dto import FlightEventDTO
+
+_NO_CITIES: FrozenSet[str] = frozenset()
+
+
+class RouteReachability:
+    """Which city pairs can have a direct or one-stop journey on a date.
+
+    Built once per snapshot from the route buckets of a FlightGraph. For each
+    (date, origin) it keeps the cities reached by a first leg departing that
+    day, and for each city the cities with a route into it. The answer is a
+    superset: layover and duration limits are left to the strategies, so a
+    False is always safe to return as "no journeys".
+    """
+
+    def __init__(self, graph: FlightGraph):
+        hubs: Dict[Tuple[date, str], Set[str]] = defaultdict(set)
+        sources: Dict[str, Set[str]] = defaultdict(set)
+        for (origin, destination), bucket in graph.by_route.items():
+            sources[destination].add(origin)
+            for day in set(bucket.dates):
+                hubs[(day, origin)].add(destination)
+
+        self.hubs: Dict[Tuple[date, str], FrozenSet[str]] = {
+            k: frozenset(v) for k, v in hubs.items()
+        }
+        self.sources: Dict[str, FrozenSet[str]] = {
+            k: frozenset(v) for k, v in sources.items()
+        }
+
+    def patched(
+        self, graph: FlightGraph, changed: Iterable[FlightEventDTO]
+    ) -> "RouteReachability":
+        """Reachability of ``graph``, an updated version of this one's graph.
+
+        Only the (date, origin) and route entries touched by the ``changed``
+        events are recomputed; the rest is shared with this instance.
+        """
+        days: Set[Tuple[date, str]] = set()
+        routes: Set[Tuple[str, str]] = set()
+        for event in changed:
+            days.add((event.departure_date, event.departure_city))
+            routes.add((event.departure_city, event.arrival_city))
+
+        reachability = RouteReachability.__new__(RouteReachability)
+        reachability.hubs = dict(self.hubs)
+        for day, origin in days:
+            hubs = frozenset(
+                e.arrival_city
+                for e in graph.departures_from(origin).departing_on(day)
+            )
+            if hubs:
+                reachability.hubs[(day, origin)] = hubs
+            else:
+                reachability.hubs.pop((day, origin), None)
+
+        reachability.sources = dict(self.sources)
+        for origin, destination in routes:
+            sources = set(reachability.sources.get(destination, _NO_CITIES))
+            if graph.route(origin, destination):
+                sources.add(origin)
+            else:
+                sources.discard(origin)
+            if sources:
+                reachability.sources[destination] = frozenset(sources)
+            else:
+                reachability.sources.pop(destination, None)
+        return reachability
+
+    def may_connect(self, day: date, origin: str, destination: str) -> bool:
+        hubs = self.hubs.get((day, origin), _NO_CITIES)
+        return destination in hubs or not hubs.isdisjoint(
+            self.sources.get(destination, _NO_CITIES)
+        )
@@ -0,0 +1,159 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Set, Tuple
+
+from app.dtos.flight_event_dto import FlightEventDTO, parse_timestamp
+
+# (flight number, departure epoch seconds, occurrence of that pair in the feed)
+EventKey = Tuple[str, int, int]
+
+# Seconds behind and ahead of UTC of the westmost (UTC-12) and eastmost
+# (UTC+14) time zones.
+MAX_WEST_OFFSET = 12 * 3600
+MAX_EAST_OFFSET = 14 * 3600
+
+
+def utc_date(ts: int) -> date:
+    return datetime.fromtimestamp(ts, timezone.utc).date()
+
+
+def same_time(a: datetime, b: datetime) -> bool:
+    """Same instant shown the same way (equal datetimes may differ in offset)."""
+    return a is b or (a == b and a.utcoffset() == b.utcoffset())
+
+
+def event_index(events: Iterable[FlightEventDTO]) -> Dict[EventKey, FlightEventDTO]:
+    """Keys every event by flight number and departure time."""
+    index = {}
+    occurrences: Dict[Tuple[str, int], int] = defaultdict(int)
+    for event in events:
+        pair = (event.flight_number, event.departure_ts)
+        index[pair + (occurrences[pair],)] = event
+        occurrences[pair] += 1
+    return index
+
+
+class SnapshotDelta:
+    """Events added and removed between a snapshot and its successor.
+
+    A changed event shows up as the old version removed and the new one
+    added. ``affects`` tells whether a search could see a different result
+    after the change.
+    """
+
+    def __init__(
+        self,
+        base_version: int,
+        added: List[FlightEventDTO],
+        removed: List[FlightEventDTO],
+        max_journey_hours: int,
+        max_connections: int,
+    ):
+        self.base_version = base_version
+        self.added = added
+        self.removed = removed
+        self.max_connections = max_connections
+
+        # A journey lasts at most max_journey_hours, so an event can only be
+        # part of journeys whose first leg departs that many hours earlier.
+        # Search dates are local to the first leg, whose offset may differ
+        # from this event's in either direction, so the window is taken in
+        # UTC and widened by the westmost and eastmost offsets.
+        self.origins: Dict[date, Set[str]] = defaultdict(set)
+        self.destinations: Dict[date, Set[str]] = defaultdict(set)
+        for event in self.changed():
+            first = utc_date(
+                event.departure_ts - max_journey_hours * 3600 - MAX_WEST_OFFSET
+            )
+            last = utc_date(event.departure_ts + MAX_EAST_OFFSET)
+            for days in range((last - first).days + 1):
+                day = first + timedelta(days=days)
+                self.origins[day].add(event.departure_city)
+                self.destinations[day].add(event.arrival_city)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.removed)
+
+    def changed(self) -> Iterable[FlightEventDTO]:
+        yield from self.added
+        yield from self.removed
+
+    def affects(self, day: date, origin: str, destination: str) -> bool:
+        if day not in self.origins:
+            return False
+        # Middle legs of multi-stop journeys touch neither end of the search.
+        if self.max_connections > 1:
+            return True
+        return origin in self.origins[day] or destination in self.destinations[day]
+
+
+class FeedDiffer:
+    """Diffs a streamed feed against the events of the current snapshot.
+
+    Unchanged events are reused as they are, so only new or modified events
+    go through FlightEventDTO.from_dict.
+    """
+
+    def __init__(self, previous: Dict[EventKey, FlightEventDTO]):
+        self.previous = previous
+        self.index: Dict[EventKey, FlightEventDTO] = {}
+        self.added: List[FlightEventDTO] = []
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _key(self, flight_number: str, departure_ts: int) -> EventKey:
+        key = (flight_number, departure_ts, 0)
+        if key in self.index:
+            occurrence = 1
+            while (flight_number, departure_ts, occurrence) in self.index:
+                occurrence += 1
+            key = (flight_number, departure_ts, occurrence)
+        return key
+
+    def add(self, raw_event: dict):
+        departure_datetime, _, departure_ts = parse_timestamp(
+            raw_event.get("departure_datetime")
+        )
+        key = self._key(raw_event.get("flight_number"), departure_ts)
+
+        event = self.previous.get(key)
+        if (
+            event is None
+            or event.departure_city != raw_event.get("departure_city")
+            or event.arrival_city != raw_event.get("arrival_city")
+            or not same_time(event.departure_datetime, departure_datetime)
+            or not same_time(
+                event.arrival_datetime,
+                parse_timestamp(raw_event.get("arrival_datetime"))[0],
+            )
+        ):
+            event = FlightEventDTO.from_dict(raw_event)
+            self.added.append(event)
+        self.index[key] = event
+
+    def add_event(self, new_event: FlightEventDTO):
+        """Like add(), for an already parsed event (e.g. from a snapshot file)."""
+        key = self._key(new_event.flight_number, new_event.departure_ts)
+        event = self.previous.get(key)
+        if (
+            event is None
+            or event.departure_city != new_event.departure_city
+            or event.arrival_city != new_event.arrival_city
+            or not same_time(event.departure_datetime, new_event.departure_datetime)
+            or not same_time(event.arrival_datetime, new_event.arrival_datetime)
+        ):
+            event = new_event
+            self.added.append(event)
+        self.index[key] = event
+
+    def removed(self) -> List[FlightEventDTO]:
+        index = self.index
+        return [
+            event
+            for key, event in self.previous.items()
+            if index.get(key) is not event
+        ]
@@ -0,0 +1,342 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+import zlib
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.dtos.flight_event_dto import FlightEventDTO
+
+MAGIC = b"FLTSNAP\0"
+# Bump whenever the layout changes; files of another version are rejected.
+FORMAT_VERSION = 1
+
+# magic, format version, event count, string count, string bytes,
+# body crc32, written_at (epoch seconds)
+HEADER = struct.Struct("<8sIIIIId")
+# UTC offset stored for datetimes that had no tzinfo in the feed.
+NAIVE = -(1 << 31)
+_EPOCH = datetime(1970, 1, 1)
+
+
+class SnapshotFileError(Exception):
+    """The file is not a usable snapshot (wrong format, truncated, corrupt)."""
+
+
+def _column(typecode: str, values: Iterable[int]) -> bytes:
+    column = array(typecode, values)
+    if sys.byteorder != "little":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def _utc_offset(moment: datetime) -> int:
+    offset = moment.utcoffset()
+    return NAIVE if offset is None else int(offset.total_seconds())
+
+
+def encode_snapshot(
+    events: Iterable[FlightEventDTO], written_at: Optional[float] = None
+) -> bytes:
+    """Serializes events into the snapshot file format.
+
+    Strings (city codes and flight numbers) are stored once in a string
+    table and referenced by index. Each event takes 36 bytes in fixed-width
+    little-endian columns:
+
+        departure_ts, arrival_ts          int64 epoch seconds
+        flight_number, departure_city,
+        arrival_city                      uint32 string index
+        departure_offset, arrival_offset  int32 UTC offset in seconds
+
+    Sub-second precision is dropped, like everywhere else in the index.
+    """
+    events = list(events)
+    string_ids: Dict[str, int] = {}
+
+    def string_id(value: str) -> int:
+        string_id = string_ids.get(value)
+        if string_id is None:
+            string_id = string_ids[value] = len(string_ids)
+        return string_id
+
+    zones: Dict[object, int] = {}
+
+    def utc_offset(moment: datetime) -> int:
+        offset = zones.get(moment.tzinfo)
+        if offset is None:
+            offset = zones[moment.tzinfo] = _utc_offset(moment)
+        return offset
+
+    columns = (
+        [e.departure_ts for e in events],
+        [e.arrival_ts for e in events],
+        [string_id(e.flight_number) for e in events],
+        [string_id(e.departure_city) for e in events],
+        [string_id(e.arrival_city) for e in events],
+        [utc_offset(e.departure_datetime) for e in events],
+        [utc_offset(e.arrival_datetime) for e in events],
+    )
+
+    encoded = [s.encode() for s in string_ids]
+    offsets = [0]
+    for s in encoded:
+        offsets.append(offsets[-1] + len(s))
+    strings = _column("I", offsets) + b"".join(encoded)
+
+    body = b"".join(
+        (
+            strings,
+            b"\0" * _pad(len(strings)),
+            _column("q", columns[0]),
+            _column("q", columns[1]),
+            _column("I", columns[2]),
+            _column("I", columns[3]),
+            _column("I", columns[4]),
+            _column("i", columns[5]),
+            _column("i", columns[6]),
+        )
+    )
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        len(columns[0]),
+        len(encoded),
+        offsets[-1],
+        zlib.crc32(body),
+        time.time() if written_at is None else written_at,
+    )
+    return header + body
+
+
+def write_snapshot_file(
+    path: str,
+    events: Iterable[FlightEventDTO],
+    written_at: Optional[float] = None,
+    mtime_ns: Optional[int] = None,
+) -> int:
+    """Atomically replaces ``path`` with a snapshot of ``events``.
+
+    The data is written to a temporary file in the same directory, fsynced
+    and renamed over ``path``, so readers see either the old file or the new
+    one, never a partial write. Readers that already mapped the old file keep
+    reading it. The file's mtime is set to ``mtime_ns`` (default:
+    ``written_at``). Returns the size of the file.
+    """
+    data = encode_snapshot(events, written_at)
+    if mtime_ns is None and written_at is not None:
+        mtime_ns = int(written_at * 1e9)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory
+    )
+    try:
+        with open(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mtime_ns is not None:
+            os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename itself; not every platform can open a directory.
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return len(data)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return len(data)
+
+
+def _check_header(path: str, magic: bytes, format_version: int):
+    if magic != MAGIC:
+        raise SnapshotFileError(f"{path} is not a snapshot file")
+    if format_version != FORMAT_VERSION:
+        raise SnapshotFileError(
+            f"{path} has format version {format_version}, "
+            f"expected {FORMAT_VERSION}"
+        )
+
+
+def read_written_at(path: str) -> float:
+    """The ``written_at`` of a snapshot file, reading only its header."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise SnapshotFileError(f"{path} is too short for a snapshot file")
+    magic, format_version, *_, written_at = HEADER.unpack(header)
+    _check_header(path, magic, format_version)
+    return written_at
+
+
+class SnapshotFile:
+    """Read-only memory map of a snapshot file.
+
+    Columns are exposed as memoryviews over the mapping, so opening a file
+    costs nothing until events are read, and every process mapping the same
+    file shares its pages through the OS page cache.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise SnapshotFileError(f"{path} is too short for a snapshot file")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: List[memoryview] = []
+        try:
+            self._map(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _map(self, path: str):
+        (
+            magic,
+            format_version,
+            count,
+            string_count,
+            string_bytes,
+            crc,
+            self.written_at,
+        ) = HEADER.unpack_from(self._mmap)
+        _check_header(path, magic, format_version)
+
+        strings_size = 4 * (string_count + 1) + string_bytes
+        expected = HEADER.size + strings_size + _pad(strings_size) + 36 * count
+        if len(self._mmap) != expected:
+            raise SnapshotFileError(
+                f"{path} is {len(self._mmap)} bytes, expected {expected}"
+            )
+        view = self._view(HEADER.size, len(self._mmap))
+        if zlib.crc32(view) != crc:
+            raise SnapshotFileError(f"{path} failed its checksum")
+
+        offsets = self._view(HEADER.size, HEADER.size + 4 * (string_count + 1), "I")
+        blob = HEADER.size + 4 * (string_count + 1)
+        self.strings: List[str] = [
+            bytes(self._mmap[blob + offsets[i] : blob + offsets[i + 1]]).decode()
+            for i in range(string_count)
+        ]
+
+        start = HEADER.size + strings_size + _pad(strings_size)
+        columns = []
+        for typecode, width in (
+            ("q", 8),
+            ("q", 8),
+            ("I", 4),
+            ("I", 4),
+            ("I", 4),
+            ("i", 4),
+            ("i", 4),
+        ):
+            columns.append(self._view(start, start + width * count, typecode))
+            start += width * count
+        (
+            self.departure_ts,
+            self.arrival_ts,
+            self.flight_number,
+            self.departure_city,
+            self.arrival_city,
+            self.departure_offset,
+            self.arrival_offset,
+        ) = columns
+
+    def _view(self, start: int, end: int, typecode: Optional[str] = None):
+        view = memoryview(self._mmap)[start:end]
+        self._views.append(view)
+        if typecode is not None:
+            if sys.byteorder != "little":
+                # Only little-endian hosts can read the columns in place.
+                column = array(typecode, bytes(view))
+                column.byteswap()
+                return column
+            view = view.cast(typecode)
+            self._views.append(view)
+        return view
+
+    def __len__(self) -> int:
+        return len(self.departure_ts)
+
+    def __enter__(self) -> "SnapshotFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+    def events(self) -> Iterator[FlightEventDTO]:
+        """Decodes every event, in the order they were written."""
+        strings = self.strings
+        departure_ts = self.departure_ts.tolist()
+        arrival_ts = self.arrival_ts.tolist()
+        departure_offset = self.departure_offset.tolist()
+        arrival_offset = self.arrival_offset.tolist()
+
+        # Feed timestamps repeat a lot; build each distinct datetime once.
+        zones: Dict[int, timezone] = {}
+        times: Dict[Tuple[int, int], datetime] = {}
+        for ts, offset in set(zip(departure_ts, departure_offset)) | set(
+            zip(arrival_ts, arrival_offset)
+        ):
+            if offset == NAIVE:
+                times[(ts, offset)] = _EPOCH + timedelta(seconds=ts)
+                continue
+            zone = zones.get(offset)
+            if zone is None:
+                zone = zones[offset] = timezone(timedelta(seconds=offset))
+            times[(ts, offset)] = datetime.fromtimestamp(ts, zone)
+
+        for (
+            departure,
+            arrival,
+            flight_number,
+            departure_city,
+            arrival_city,
+            departure_zone,
+            arrival_zone,
+        ) in zip(
+            departure_ts,
+            arrival_ts,
+            self.flight_number.tolist(),
+            self.departure_city.tolist(),
+            self.arrival_city.tolist(),
+            departure_offset,
+            arrival_offset,
+        ):
+            departure_datetime = times[(departure, departure_zone)]
+            event = FlightEventDTO.__new__(FlightEventDTO)
+            event._init(
+                strings[flight_number],
+                strings[departure_city],
+                strings[arrival_city],
+                departure_datetime,
+                times[(arrival, arrival_zone)],
+                departure_datetime.date(),
+                departure,
+                arrival,
+            )
+            yield event
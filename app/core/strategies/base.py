@@ -1,13 +1,31 @@
 from abc import ABC, abstractmethod
-from typing import List
-from app.dtos.flight_event_dto import FlightEventDTO
+from typing import Iterable, List
+from app.core.flight_graph import FlightEvents, FlightGraph
 from app.dtos.flight_filter_dto import FlightFilterDTO
 
 
 class JourneyBuilderStrategy(ABC):
-    @abstractmethod
+    # CPU-heavy strategies may be run in a worker pool by JourneyService so
+    # they do not block the event loop.
+    cpu_bound: bool = False
+
     async def execute(
-        self, flight_events: List[FlightEventDTO], flight_filter: FlightFilterDTO
+        self, flight_events: FlightEvents, flight_filter: FlightFilterDTO
+    ) -> List[dict]:
+        return self.find_journeys(FlightGraph.of(flight_events), flight_filter)
+
+    def find_journeys(
+        self, graph: FlightGraph, flight_filter: FlightFilterDTO
     ) -> List[dict]:
-        pass
+        return list(self.iter_journeys(graph, flight_filter))
+
+    @abstractmethod
+    def iter_journeys(
+        self, graph: FlightGraph, flight_filter: FlightFilterDTO
+    ) -> Iterable[dict]:
+        """Journeys ordered by the departure of their first leg.
+
+        Graph strategies yield lazily, so a caller that only needs the first
+        few journeys can stop early.
+        """
 
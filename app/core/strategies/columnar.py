@@ -0,0 +1,46 @@
+from typing import List
+from app.core.columnar import ColumnarFlightTable
+from app.core.flight_graph import FlightGraph
+from app.core.strategies.base import JourneyBuilderStrategy
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.utils.config_vars import ConfigVars
+from app.utils.flight_commons import SECONDS_PER_HOUR
+
+
+class ColumnarDirectFlights(JourneyBuilderStrategy):
+    """Vectorized equivalent of JourneyDirectFlights."""
+
+    def iter_journeys(
+        self, graph: FlightGraph, flight_filter: FlightFilterDTO
+    ) -> List[dict]:
+        table = ColumnarFlightTable.of(graph)
+        rows = table.direct(
+            flight_filter.origin,
+            flight_filter.destination,
+            flight_filter.date.toordinal(),
+            ConfigVars.MAX_JOURNEY_HOURS * SECONDS_PER_HOUR,
+        )
+        events = table.events
+        return [{"connections": 0, "path": [events[i]]} for i in rows.tolist()]
+
+
+class ColumnarOneStopJourneyStrategy(JourneyBuilderStrategy):
+    """Vectorized equivalent of OneStopJourneyStrategy."""
+
+    cpu_bound = True
+
+    def iter_journeys(
+        self, graph: FlightGraph, flight_filter: FlightFilterDTO
+    ) -> List[dict]:
+        table = ColumnarFlightTable.of(graph)
+        first, second = table.one_stop(
+            table.departures_on(flight_filter.origin, flight_filter.date.toordinal()),
+            flight_filter.destination,
+            ConfigVars.MAX_LAYOVER_HOURS * SECONDS_PER_HOUR,
+            ConfigVars.MAX_JOURNEY_HOURS * SECONDS_PER_HOUR,
+        )
+        events = table.events
+        return [
+            {"connections": 1, "path": [events[i], events[j]]}
+            for i, j in zip(first.tolist(), second.tolist())
+        ]
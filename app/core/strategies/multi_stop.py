@@ -0,0 +1,87 @@
+from typing import Iterator, List, Optional, Set
+from app.core.flight_graph import FlightGraph
+from app.core.strategies.base import JourneyBuilderStrategy
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.utils.config_vars import ConfigVars
+from app.utils.flight_commons import SECONDS_PER_HOUR
+
+
+class MultiStopJourneyStrategy(JourneyBuilderStrategy):
+    """Journeys with between ``min_connections`` and ``max_connections`` stops.
+
+    Paths are grown forward in time from the first legs leaving the origin
+    on the requested date. Each extension only looks at departures inside the
+    layover window of the current hub, and a branch is dropped as soon as it
+    cannot arrive within MAX_JOURNEY_HOURS of the first departure, so the work
+    done is proportional to the connections actually explored. Cities are
+    never revisited within a journey.
+    """
+
+    cpu_bound = True
+
+    def __init__(
+        self, max_connections: Optional[int] = None, min_connections: int = 0
+    ):
+        self.max_connections = (
+            ConfigVars.MAX_CONNECTIONS if max_connections is None else max_connections
+        )
+        self.min_connections = min_connections
+
+    def iter_journeys(
+        self, graph: FlightGraph, flight_filter: FlightFilterDTO
+    ) -> Iterator[dict]:
+        max_journey = ConfigVars.MAX_JOURNEY_HOURS * SECONDS_PER_HOUR
+
+        first_legs = graph.departures_from(flight_filter.origin).departing_on(
+            flight_filter.date
+        )
+        for first_leg in first_legs:
+            deadline = first_leg.departure_ts + max_journey
+            if first_leg.arrival_ts > deadline:
+                continue
+            yield from self._extend(
+                graph,
+                [first_leg],
+                {flight_filter.origin, first_leg.arrival_city},
+                flight_filter.destination,
+                deadline,
+            )
+
+    def _extend(
+        self,
+        graph: FlightGraph,
+        path: List[FlightEventDTO],
+        visited: Set[str],
+        destination: str,
+        deadline: int,
+    ) -> Iterator[dict]:
+        last_leg = path[-1]
+        connections = len(path) - 1
+        if last_leg.arrival_city == destination:
+            if connections >= self.min_connections:
+                yield {"connections": connections, "path": list(path)}
+            return
+        if connections >= self.max_connections:
+            return
+
+        hub = last_leg.arrival_city
+        # On the last allowed hop only legs into the destination can help.
+        bucket = (
+            graph.route(hub, destination)
+            if connections + 1 == self.max_connections
+            else graph.departures_from(hub)
+        )
+        window_start = last_leg.arrival_ts
+        candidates = bucket.departing_between(
+            window_start,
+            min(window_start + ConfigVars.MAX_LAYOVER_HOURS * SECONDS_PER_HOUR, deadline),
+        )
+        for next_leg in candidates:
+            if next_leg.arrival_ts > deadline or next_leg.arrival_city in visited:
+                continue
+            path.append(next_leg)
+            visited.add(next_leg.arrival_city)
+            yield from self._extend(graph, path, visited, destination, deadline)
+            visited.discard(next_leg.arrival_city)
+            path.pop()
@@ -1,51 +1,43 @@
-from typing import List
+from typing import Iterator, List
+from app.core.flight_graph import FlightEvents, FlightGraph
 from app.core.strategies.base import JourneyBuilderStrategy
 from app.dtos.flight_event_dto import FlightEventDTO
 from app.dtos.flight_filter_dto import FlightFilterDTO
 from app.utils.config_vars import ConfigVars
-from app.utils.flight_commons import is_within_max_duration
+from app.utils.flight_commons import SECONDS_PER_HOUR, is_within_max_duration
 
 
 class OneStopJourneyStrategy(JourneyBuilderStrategy):
+    cpu_bound = True
 
-    async def execute(
-        self, flight_events: List[FlightEventDTO], flight_filter: FlightFilterDTO
-    ) -> List[List[FlightEventDTO]]:
-        connections = []
-        for first_leg in flight_events:
+    def iter_journeys(
+        self, graph: FlightGraph, flight_filter: FlightFilterDTO
+    ) -> Iterator[dict]:
+        first_legs = graph.departures_from(flight_filter.origin).departing_on(
+            flight_filter.date
+        )
+        for first_leg in first_legs:
 
-            second_leg_list = await self.find_next_stopovers(
-                first_leg, flight_events, flight_filter.destination
+            second_leg_list = self.find_next_stopovers(
+                first_leg, graph, flight_filter.destination
             )
 
             if second_leg_list:
                 for second_leg in second_leg_list:
                     journey = [first_leg, second_leg]
-                    if await is_within_max_duration(
+                    if is_within_max_duration(
                         journey, ConfigVars.MAX_JOURNEY_HOURS
                     ):
-                        connections.append(
-                            {"connections": len(journey) - 1, "path": journey}
-                        )
-        return connections
+                        yield {"connections": len(journey) - 1, "path": journey}
 
-    async def find_next_stopovers(
+    def find_next_stopovers(
         self,
         first_leg: FlightEventDTO,
-        flight_events: List[FlightEventDTO],
+        flight_events: FlightEvents,
         destination: str,
     ) -> List[FlightEventDTO]:
-        valid_connections = []
-        for next_stop in flight_events:
-            if (
-                next_stop.departure_city == first_leg.arrival_city
-                and next_stop.arrival_city == destination
-                and next_stop.departure_datetime > first_leg.arrival_datetime
-            ):
-                layover_duration = (
-                    next_stop.departure_datetime - first_leg.arrival_datetime
-                ).total_seconds() / 3600
-
-                if 0 < layover_duration <= ConfigVars.MAX_LAYOVER_HOURS:
-                    valid_connections.append(next_stop)
-        return valid_connections
+        graph = FlightGraph.of(flight_events)
+        arrival = first_leg.arrival_ts
+        return graph.route(first_leg.arrival_city, destination).departing_between(
+            arrival, arrival + ConfigVars.MAX_LAYOVER_HOURS * SECONDS_PER_HOUR
+        )
@@ -1,7 +1,46 @@
-from datetime import datetime
+import sys
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Optional, Tuple
+
+
+def intern_code(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def to_epoch_seconds(value: datetime) -> int:
+    """Epoch seconds of ``value``; naive datetimes are read as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_timestamp(value: str) -> Tuple[datetime, date, int]:
+    """Parses a feed timestamp once; equal strings share the same objects."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed, parsed.date(), to_epoch_seconds(parsed)
 
 
 class FlightEventDTO:
+    """Immutable flight event.
+
+    IATA codes and flight numbers are interned so the feed shares one string
+    per distinct value, and the departure date and epoch-second timestamps
+    are computed once so hot loops compare plain values.
+    """
+
+    __slots__ = (
+        "flight_number",
+        "departure_city",
+        "arrival_city",
+        "departure_datetime",
+        "arrival_datetime",
+        "departure_date",
+        "departure_ts",
+        "arrival_ts",
+    )
+
     def __init__(
         self,
         flight_number: str,
@@ -10,30 +49,70 @@ class FlightEventDTO:
         departure_datetime: datetime,
         arrival_datetime: datetime,
     ):
-        self.flight_number = flight_number
-        self.departure_city = departure_city
-        self.arrival_city = arrival_city
-        self.departure_datetime = departure_datetime
-        self.arrival_datetime = arrival_datetime
+        self._init(
+            flight_number,
+            departure_city,
+            arrival_city,
+            departure_datetime,
+            arrival_datetime,
+            departure_datetime.date(),
+            to_epoch_seconds(departure_datetime),
+            to_epoch_seconds(arrival_datetime),
+        )
 
-    @property
-    def departure_date(self):
-        return self.departure_datetime.date()
+    def _init(
+        self,
+        flight_number: str,
+        departure_city: str,
+        arrival_city: str,
+        departure_datetime: datetime,
+        arrival_datetime: datetime,
+        departure_date: date,
+        departure_ts: int,
+        arrival_ts: int,
+    ):
+        init = object.__setattr__
+        init(self, "flight_number", intern_code(flight_number))
+        init(self, "departure_city", intern_code(departure_city))
+        init(self, "arrival_city", intern_code(arrival_city))
+        init(self, "departure_datetime", departure_datetime)
+        init(self, "arrival_datetime", arrival_datetime)
+        init(self, "departure_date", departure_date)
+        init(self, "departure_ts", departure_ts)
+        init(self, "arrival_ts", arrival_ts)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({self.flight_number}, {self.departure_city}"
+            f"->{self.arrival_city}, {self.departure_datetime.isoformat()})"
+        )
 
     @property
-    def arrival_date(self):
+    def arrival_date(self) -> date:
         return self.arrival_datetime.date()
 
     @classmethod
     def from_dict(cls, data: dict) -> "FlightEventDTO":
-        return cls(
-            flight_number=data.get("flight_number"),
-            departure_city=data.get("departure_city"),
-            arrival_city=data.get("arrival_city"),
-            departure_datetime=datetime.fromisoformat(
-                data.get("departure_datetime").replace("Z", "+00:00")
-            ),
-            arrival_datetime=datetime.fromisoformat(
-                data.get("arrival_datetime").replace("Z", "+00:00")
-            ),
+        departure_datetime, departure_date, departure_ts = parse_timestamp(
+            data.get("departure_datetime")
+        )
+        arrival_datetime, _, arrival_ts = parse_timestamp(data.get("arrival_datetime"))
+
+        event = cls.__new__(cls)
+        event._init(
+            data.get("flight_number"),
+            data.get("departure_city"),
+            data.get("arrival_city"),
+            departure_datetime,
+            arrival_datetime,
+            departure_date,
+            departure_ts,
+            arrival_ts,
         )
+        return event
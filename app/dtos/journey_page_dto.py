@@ -0,0 +1,13 @@
+from typing import List, Optional
+
+
+class JourneyPageDTO:
+    def __init__(
+        self,
+        journeys: List[dict],
+        snapshot_version: Optional[int],
+        next_offset: Optional[int],
+    ):
+        self.journeys = journeys
+        self.snapshot_version = snapshot_version
+        self.next_offset = next_offset
@@ -0,0 +1,318 @@
+import asyncio
+import itertools
+import os
+import time
+
+from typing import Callable, List, Optional, Tuple
+from app.adapters.flight_event_adapter import FlightEventAdapter
+from app.core.flight_graph import FlightGraph, FlightGraphBuilder
+from app.core.flight_snapshot import FlightSnapshot
+from app.core.snapshot_delta import FeedDiffer, SnapshotDelta, event_index
+from app.core.snapshot_file import (
+    SnapshotFile,
+    SnapshotFileError,
+    read_written_at,
+    write_snapshot_file,
+)
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.utils.config_vars import ConfigVars
+from app.utils.logger import report_error
+from app.utils.metrics import STAGE_SECONDS
+
+# Versions are unique across every cache in the process, so they can key
+# derived data (e.g. search results) without colliding.
+_snapshot_versions = itertools.count(1)
+
+
+class FlightSnapshotCache:
+    """Process-wide cache of the flight-events feed.
+
+    A fresh snapshot is served as is. A stale one is still served while a
+    single background task fetches its replacement (stale-while-revalidate);
+    after that task fails, the next one waits FLIGHT_EVENTS_RETRY_SECONDS
+    (at most the TTL). Concurrent callers that find no snapshot at all share
+    one upstream fetch.
+
+    A refresh is diffed against the snapshot being served and only the events
+    that changed are re-indexed. When nothing changed the snapshot keeps its
+    version, so results derived from it stay valid.
+
+    With a ``snapshot_path``, every fetched feed is also written to that file
+    (an unchanged one only bumps its mtime), and a load first looks for a
+    file another worker confirmed fresh, so workers start warm and do not all
+    hit the upstream. A file holding the feed already served just renews the
+    snapshot; any other is diffed against it off the event loop.
+    """
+
+    def __init__(
+        self,
+        adapter: Optional[FlightEventAdapter] = None,
+        ttl_seconds: Optional[float] = None,
+        snapshot_path: Optional[str] = None,
+    ):
+        self.adapter = adapter or FlightEventAdapter()
+        self.ttl_seconds = (
+            ConfigVars.FLIGHT_EVENTS_CACHE_TTL_SECONDS
+            if ttl_seconds is None
+            else ttl_seconds
+        )
+        self.snapshot_path = (
+            ConfigVars.SNAPSHOT_FILE_PATH if snapshot_path is None else snapshot_path
+        )
+        self._snapshot: Optional[FlightSnapshot] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._write_task: Optional[asyncio.Future] = None
+        # Wall-clock time (ns) the served feed was last fetched from, or
+        # confirmed against, the upstream; also the snapshot file's mtime.
+        self._fetched_at_ns = 0
+        # written_at of the snapshot file holding the served feed, if any.
+        self._written_at: Optional[float] = None
+        self._listeners: List[Callable[[FlightSnapshot], None]] = []
+        # Monotonic time the last background refresh failed, if it did.
+        self._failed_at: Optional[float] = None
+
+    @property
+    def snapshot(self) -> Optional[FlightSnapshot]:
+        return self._snapshot
+
+    def is_stale(self, snapshot: FlightSnapshot) -> bool:
+        return snapshot.age() >= self.ttl_seconds
+
+    def add_listener(self, listener: Callable[[FlightSnapshot], None]):
+        """Calls ``listener`` with every new snapshot once it is being served."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[FlightSnapshot], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def clear(self):
+        self._snapshot = None
+        self._refresh_task = None
+        self._failed_at = None
+
+    def is_backing_off(self) -> bool:
+        """True shortly after a failed refresh, so stale reads do not retry."""
+        if self._failed_at is None:
+            return False
+        retry_seconds = min(self.ttl_seconds, ConfigVars.FLIGHT_EVENTS_RETRY_SECONDS)
+        return time.monotonic() - self._failed_at < retry_seconds
+
+    async def get_snapshot(self) -> FlightSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return await asyncio.shield(self.refresh())
+        if self.is_stale(snapshot) and not self.is_backing_off():
+            self.refresh()
+        return snapshot
+
+    def refresh(self) -> asyncio.Task:
+        task = self._refresh_task
+        if (
+            task is None
+            or task.done()
+            or task.get_loop() is not asyncio.get_running_loop()
+        ):
+            task = asyncio.ensure_future(self._load())
+            task.add_done_callback(self._on_refresh_done)
+            self._refresh_task = task
+        return task
+
+    async def load_full(self) -> FlightSnapshot:
+        builder = FlightGraphBuilder()
+        streamed = await self.adapter.stream_flight_events(
+            lambda raw_event: builder.add(FlightEventDTO.from_dict(raw_event))
+        )
+        if not streamed:
+            raise Exception("There are no flight events available at the moment.")
+        with STAGE_SECONDS.labels("index").time():
+            return FlightSnapshot(builder.build(), version=next(_snapshot_versions))
+
+    async def load_delta(self, previous: FlightSnapshot) -> FlightSnapshot:
+        differ = FeedDiffer(previous.event_index or event_index(previous.events))
+        streamed = await self.adapter.stream_flight_events(differ.add)
+        if not streamed:
+            raise Exception("There are no flight events available at the moment.")
+        with STAGE_SECONDS.labels("index").time():
+            return self.apply_diff(
+                previous, differ.added, differ.removed(), differ.index
+            )
+
+    @staticmethod
+    def apply_diff(
+        previous: FlightSnapshot,
+        added: List[FlightEventDTO],
+        removed: List[FlightEventDTO],
+        index: Optional[dict],
+        loaded_at: Optional[float] = None,
+    ) -> FlightSnapshot:
+        """The successor of ``previous``; it keeps the version when nothing changed."""
+        delta = SnapshotDelta(
+            previous.version,
+            added,
+            removed,
+            ConfigVars.MAX_JOURNEY_HOURS,
+            ConfigVars.MAX_CONNECTIONS,
+        )
+        version = next(_snapshot_versions) if delta else previous.version
+        return FlightSnapshot.from_delta(previous, delta, version, index, loaded_at)
+
+    def read_snapshot_file(
+        self, previous: Optional[FlightSnapshot]
+    ) -> Optional[Tuple[FlightSnapshot, float, int]]:
+        """Snapshot, ``written_at`` and mtime of the snapshot file, if another
+        worker confirmed it fresh after the feed being served was fetched.
+
+        The file's mtime is when its content was last confirmed against the
+        upstream and ``written_at`` identifies the content. Content already
+        being served is reused as is; other content is diffed against
+        ``previous``. Runs off the event loop.
+        """
+        try:
+            confirmed_ns = os.stat(self.snapshot_path).st_mtime_ns
+            age = time.time() - confirmed_ns / 1e9
+            if confirmed_ns <= self._fetched_at_ns or age >= self.ttl_seconds:
+                return None
+            written_at = read_written_at(self.snapshot_path)
+            # Age the snapshot from the upstream fetch, not from this read.
+            loaded_at = time.monotonic() - max(0.0, age)
+            if previous is not None and written_at == self._written_at:
+                # Same feed, confirmed again upstream: no decode, no CRC.
+                renewed = self.apply_diff(
+                    previous, [], [], previous.event_index, loaded_at
+                )
+                return renewed, written_at, confirmed_ns
+            with SnapshotFile(self.snapshot_path) as snapshot_file:
+                with STAGE_SECONDS.labels("file_load").time():
+                    if previous is not None and ConfigVars.SNAPSHOT_DELTA_ENABLED:
+                        differ = FeedDiffer(
+                            previous.event_index or event_index(previous.events)
+                        )
+                        for event in snapshot_file.events():
+                            differ.add_event(event)
+                        snapshot = self.apply_diff(
+                            previous,
+                            differ.added,
+                            differ.removed(),
+                            differ.index,
+                            loaded_at,
+                        )
+                    else:
+                        snapshot = FlightSnapshot(
+                            FlightGraph(snapshot_file.events()),
+                            next(_snapshot_versions),
+                            loaded_at,
+                        )
+            return snapshot, written_at, confirmed_ns
+        except FileNotFoundError:
+            return None
+        except (OSError, SnapshotFileError) as e:
+            report_error(f"Could not read the flight snapshot file: {e}")
+            return None
+
+    async def load_snapshot_file(
+        self, previous: Optional[FlightSnapshot] = None
+    ) -> Optional[FlightSnapshot]:
+        if not self.snapshot_path:
+            return None
+        loaded = await asyncio.get_running_loop().run_in_executor(
+            None, self.read_snapshot_file, previous
+        )
+        if loaded is None:
+            return None
+        snapshot, self._written_at, self._fetched_at_ns = loaded
+        return snapshot
+
+    def save_snapshot_file(
+        self, snapshot: FlightSnapshot, unchanged: bool = False
+    ) -> asyncio.Future:
+        """Writes ``snapshot`` to the snapshot file in the background.
+
+        When the feed was fetched ``unchanged`` and the file still holds it,
+        only the file's mtime is bumped, so other workers see it confirmed.
+        """
+        fetched_at_ns = self._fetched_at_ns
+        previous_written_at = self._written_at if unchanged else None
+        task = asyncio.get_running_loop().run_in_executor(
+            None,
+            self.store_snapshot_file,
+            snapshot,
+            fetched_at_ns,
+            previous_written_at,
+        )
+        task.add_done_callback(self._on_write_done)
+        self._write_task = task
+        return task
+
+    def store_snapshot_file(
+        self,
+        snapshot: FlightSnapshot,
+        fetched_at_ns: int,
+        previous_written_at: Optional[float] = None,
+    ) -> float:
+        """Writes or confirms the snapshot file; returns its ``written_at``."""
+        if previous_written_at is not None:
+            try:
+                current = read_written_at(self.snapshot_path)
+            except (OSError, SnapshotFileError):
+                current = None
+            if current == previous_written_at:
+                os.utime(self.snapshot_path, ns=(fetched_at_ns, fetched_at_ns))
+                return previous_written_at
+        # A changed feed, or another worker replaced the file since.
+        written_at = fetched_at_ns / 1e9
+        write_snapshot_file(
+            self.snapshot_path, snapshot.events, written_at, fetched_at_ns
+        )
+        return written_at
+
+    async def fetch_snapshot(self) -> FlightSnapshot:
+        previous = self._snapshot
+        if previous is not None and ConfigVars.SNAPSHOT_DELTA_ENABLED:
+            snapshot = await self.load_delta(previous)
+        else:
+            snapshot = await self.load_full()
+        self._fetched_at_ns = time.time_ns()
+        return snapshot
+
+    async def _load(self) -> FlightSnapshot:
+        previous = self._snapshot
+        snapshot = await self.load_snapshot_file(previous)
+        fetched = snapshot is None
+        if fetched:
+            snapshot = await self.fetch_snapshot()
+        self._snapshot = snapshot
+        for listener in list(self._listeners):
+            try:
+                listener(snapshot)
+            except Exception as e:
+                report_error(f"Flight snapshot listener failed: {e}")
+        if fetched and self.snapshot_path:
+            self.save_snapshot_file(
+                snapshot,
+                unchanged=previous is not None
+                and snapshot.version == previous.version,
+            )
+        return snapshot
+
+    def _on_refresh_done(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is None:
+            self._failed_at = None
+            return
+        self._failed_at = time.monotonic()
+        if self._snapshot is not None:
+            report_error(f"Background refresh of flight events failed: {exc}")
+
+    def _on_write_done(self, task: asyncio.Future):
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            report_error(f"Could not write the flight snapshot file: {task.exception()}")
+        else:
+            self._written_at = task.result()
+
+
+flight_snapshot_cache = FlightSnapshotCache()
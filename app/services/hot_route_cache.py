@@ -0,0 +1,171 @@
+import asyncio
+import sys
+import time
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from app.core.flight_snapshot import FlightSnapshot
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.utils.config_vars import ConfigVars
+from app.utils.logger import report_error, report_info
+
+Route = Tuple[str, str]
+Compute = Callable[[FlightSnapshot, FlightFilterDTO], Awaitable[List[dict]]]
+
+
+def parse_routes(routes: str) -> List[Route]:
+    """Parses "BUE-MAD,MAD-BUE" into [("BUE", "MAD"), ("MAD", "BUE")]."""
+    parsed = []
+    for route in routes.split(","):
+        route = route.strip().upper()
+        if not route:
+            continue
+        origin, _, destination = route.partition("-")
+        if not origin or not destination:
+            raise ValueError(f"invalid hot route {route!r}, expected ORIGIN-DESTINATION")
+        parsed.append((origin, destination))
+    return parsed
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+class MaterializedJourneys:
+    """Immutable table of journeys for one snapshot."""
+
+    def __init__(
+        self,
+        snapshot_version: int,
+        journeys: Dict[Tuple, List[dict]],
+        build_seconds: float,
+    ):
+        self.snapshot_version = snapshot_version
+        self.journeys = journeys
+        self.build_seconds = build_seconds
+
+    def nbytes(self) -> int:
+        """Size of the table's own containers; events belong to the snapshot."""
+        size = sys.getsizeof(self.journeys)
+        for journeys in self.journeys.values():
+            size += sys.getsizeof(journeys)
+            for journey in journeys:
+                size += sys.getsizeof(journey) + sys.getsizeof(journey["path"])
+        return size
+
+
+class HotRouteCache:
+    """Journeys precomputed for the configured hot routes.
+
+    Each new snapshot triggers a background build for every hot route over
+    the next ``days`` days, using the same strategies as a live search. The
+    finished table replaces the previous one in a single assignment, and a
+    lookup only hits when the table was built from the snapshot being served.
+    A snapshot derived from the table's one only recomputes the searches its
+    delta affects.
+    """
+
+    def __init__(
+        self, routes: Optional[List[Route]] = None, days: Optional[int] = None
+    ):
+        self.routes = parse_routes(ConfigVars.HOT_ROUTES) if routes is None else routes
+        self.days = ConfigVars.HOT_ROUTE_DAYS if days is None else days
+        self._table: Optional[MaterializedJourneys] = None
+        self._build_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.routes) and self.days > 0
+
+    @staticmethod
+    def key(flight_filter: FlightFilterDTO) -> Tuple:
+        return (flight_filter.date, flight_filter.origin, flight_filter.destination)
+
+    def filters_from(self, start: date) -> List[FlightFilterDTO]:
+        return [
+            FlightFilterDTO(start + timedelta(days=day), origin, destination)
+            for origin, destination in self.routes
+            for day in range(self.days)
+        ]
+
+    def lookup(
+        self, flight_filter: FlightFilterDTO, snapshot_version: int
+    ) -> Optional[List[dict]]:
+        table = self._table
+        if table is None or table.snapshot_version != snapshot_version:
+            return None
+        return table.journeys.get(self.key(flight_filter))
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        table = self._table
+        return {
+            "routes": len(self.routes),
+            "snapshot_version": None if table is None else table.snapshot_version,
+            "entries": 0 if table is None else len(table.journeys),
+            "build_seconds": None if table is None else table.build_seconds,
+        }
+
+    def clear(self):
+        if self._build_task is not None:
+            self._build_task.cancel()
+        self._build_task = None
+        self._table = None
+
+    def schedule(
+        self, snapshot: FlightSnapshot, compute: Compute
+    ) -> Optional[asyncio.Task]:
+        """Starts a build for ``snapshot``, superseding any build in progress."""
+        if not self.enabled:
+            return None
+        table = self._table
+        if table is not None and table.snapshot_version == snapshot.version:
+            return None
+        if self._build_task is not None and not self._build_task.done():
+            self._build_task.cancel()
+        self._build_task = asyncio.ensure_future(self.build(snapshot, compute))
+        self._build_task.add_done_callback(self._on_build_done)
+        return self._build_task
+
+    async def build(
+        self,
+        snapshot: FlightSnapshot,
+        compute: Compute,
+        start: Optional[date] = None,
+    ) -> MaterializedJourneys:
+        started = time.perf_counter()
+        delta = snapshot.delta
+        previous = self._table
+        reusable = (
+            previous.journeys
+            if delta is not None
+            and previous is not None
+            and previous.snapshot_version == delta.base_version
+            else {}
+        )
+        journeys = {}
+        for flight_filter in self.filters_from(utc_today() if start is None else start):
+            key = self.key(flight_filter)
+            if key in reusable and not delta.affects(*key):
+                journeys[key] = reusable[key]
+            else:
+                journeys[key] = await compute(snapshot, flight_filter)
+        table = MaterializedJourneys(
+            snapshot.version, journeys, time.perf_counter() - started
+        )
+        current = self._table
+        if current is None or current.snapshot_version <= table.snapshot_version:
+            self._table = table
+        report_info(
+            f"Hot routes materialized for snapshot {table.snapshot_version}: "
+            f"{len(journeys)} searches, "
+            f"{sum(map(len, journeys.values()))} journeys, "
+            f"{table.nbytes() / 1024:.1f} KiB, {table.build_seconds:.3f}s"
+        )
+        return table
+
+    def _on_build_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            report_error(f"Hot route materialization failed: {task.exception()}")
+
+
+hot_route_cache = HotRouteCache()
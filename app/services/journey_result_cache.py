@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from app.core.snapshot_delta import SnapshotDelta
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.utils.config_vars import ConfigVars
+
+
+class JourneyResultCache:
+    """LRU cache of search results with a TTL.
+
+    Keys include the feed snapshot version, so results computed on an older
+    snapshot are never served after a refresh. Identical searches that arrive
+    while one is being computed wait for that computation instead of
+    starting their own. After an incremental refresh, results the change
+    cannot affect are carried over to the new version.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.max_entries = (
+            ConfigVars.JOURNEY_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self.ttl_seconds = (
+            ConfigVars.JOURNEY_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self._entries: "OrderedDict[Hashable, Tuple[float, List[dict]]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key_for(flight_filter: FlightFilterDTO, snapshot_version: int) -> Tuple:
+        return (
+            flight_filter.date,
+            flight_filter.origin,
+            flight_filter.destination,
+            snapshot_version,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self._inflight.clear()
+
+    def carry_over(self, delta: SnapshotDelta, snapshot_version: int) -> int:
+        """Re-keys results of ``delta.base_version`` that ``delta`` does not
+        affect to ``snapshot_version`` and drops the rest of that version.
+
+        Returns the number of results carried over.
+        """
+        now = time.monotonic()
+        carried = 0
+        for key in [k for k in self._entries if k[3] == delta.base_version]:
+            expires_at, journeys = self._entries.pop(key)
+            day, origin, destination, _ = key
+            if expires_at > now and not delta.affects(day, origin, destination):
+                self._entries[(day, origin, destination, snapshot_version)] = (
+                    expires_at,
+                    journeys,
+                )
+                carried += 1
+        return carried
+
+    def get(self, key: Hashable) -> Optional[List[dict]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, journeys = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return journeys
+
+    def lookup(self, key: Hashable) -> Optional[List[dict]]:
+        """Like get(), but counted in the hit/miss stats."""
+        journeys = self.get(key)
+        if journeys is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return journeys
+
+    def put(self, key: Hashable, journeys: List[dict]):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, journeys)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[List[dict]]]
+    ) -> List[dict]:
+        journeys = self.get(key)
+        if journeys is not None:
+            self.hits += 1
+            return journeys
+
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(compute())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._on_computed(key, done))
+        return await asyncio.shield(task)
+
+    def _on_computed(self, key: Hashable, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self.put(key, task.result())
+
+
+journey_result_cache = JourneyResultCache()
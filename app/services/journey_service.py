@@ -1,38 +1,372 @@
-from typing import List
+import asyncio
+import time
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import chain, islice
+from typing import AsyncIterator, List, Optional
+from app.core.columnar import columnar_available
+from app.core.strategies.base import JourneyBuilderStrategy
+from app.core.strategies.columnar import (
+    ColumnarDirectFlights,
+    ColumnarOneStopJourneyStrategy,
+)
 from app.core.strategies.direct_flights import JourneyDirectFlights
+from app.core.strategies.multi_stop import MultiStopJourneyStrategy
 from app.core.strategies.one_stop import OneStopJourneyStrategy
-from app.adapters.flight_event_adapter import FlightEventAdapter
+from app.core.flight_snapshot import FlightSnapshot
 from app.dtos.flight_event_dto import FlightEventDTO
 from app.dtos.flight_filter_dto import FlightFilterDTO
-from app.utils.logger import report_error
+from app.dtos.journey_page_dto import JourneyPageDTO
+from app.services.flight_snapshot_cache import (
+    FlightSnapshotCache,
+    flight_snapshot_cache,
+)
+from app.services.hot_route_cache import HotRouteCache, hot_route_cache
+from app.services.journey_result_cache import (
+    JourneyResultCache,
+    journey_result_cache,
+)
+from app.utils.config_vars import ConfigVars
+from app.utils.cursor import CursorExpiredError
+from app.utils.logger import report_error, report_info
+from app.utils.metrics import (
+    COUNT_BUCKETS,
+    STAGE_SECONDS,
+    STRATEGY_SECONDS,
+    counter,
+    histogram,
+)
+
+SEARCHES = counter(
+    "flights_api_searches_total",
+    "Searches by how they were answered: unreachable, hot_route, "
+    "result_cache (including computations it coalesced), computed or error.",
+    ("source",),
+)
+SEARCH_JOURNEYS = histogram(
+    "flights_api_search_journeys",
+    "Journeys returned per complete search.",
+    buckets=COUNT_BUCKETS,
+)
+
+
+_strategy_executor: Optional[Executor] = None
+
+
+def strategy_executor() -> Optional[Executor]:
+    """Shared worker pool for CPU-bound strategies, or None to run inline.
+
+    Off by default: strategies are mostly pure Python, so the threads keep
+    the event loop free but do not lower search latency under the GIL.
+    """
+    global _strategy_executor
+    if _strategy_executor is None and ConfigVars.STRATEGY_WORKERS > 0:
+        _strategy_executor = ThreadPoolExecutor(
+            max_workers=ConfigVars.STRATEGY_WORKERS,
+            thread_name_prefix="journey-strategy",
+        )
+    return _strategy_executor
+
+
+def journey_departure(journey: dict):
+    return journey["path"][0].departure_datetime
+
+
+def sort_journeys(journeys: List[dict]) -> List[dict]:
+    with STAGE_SECONDS.labels("sort").time():
+        return sorted(journeys, key=journey_departure)
 
 
 class JourneyService:
-    def __init__(self):
-        self.adapter = FlightEventAdapter()
-        self.strategies = [
+    def __init__(
+        self,
+        snapshot_cache: Optional[FlightSnapshotCache] = None,
+        result_cache: Optional[JourneyResultCache] = None,
+        executor: Optional[Executor] = None,
+        hot_routes: Optional[HotRouteCache] = None,
+    ):
+        self.snapshot_cache = (
+            flight_snapshot_cache if snapshot_cache is None else snapshot_cache
+        )
+        self.result_cache = (
+            journey_result_cache if result_cache is None else result_cache
+        )
+        self.executor = strategy_executor() if executor is None else executor
+        self.hot_routes = hot_route_cache if hot_routes is None else hot_routes
+        self.adapter = self.snapshot_cache.adapter
+        self.strategies = self.default_strategies()
+        # The reachability table only covers direct and one-stop journeys.
+        self.check_reachability = ConfigVars.MAX_CONNECTIONS <= 1
+        # The snapshot the last search was answered from; its fragments
+        # encode the journeys (app/api/v1/endpoints/journeys.py).
+        self.served_snapshot: Optional[FlightSnapshot] = None
+
+    @staticmethod
+    def default_strategies() -> List[JourneyBuilderStrategy]:
+        strategies: List[JourneyBuilderStrategy] = [
             JourneyDirectFlights(),
             OneStopJourneyStrategy(),
         ]
+        if ConfigVars.COLUMNAR_SEARCH_ENABLED:
+            if columnar_available():
+                strategies = [ColumnarDirectFlights(), ColumnarOneStopJourneyStrategy()]
+            else:
+                report_info("COLUMNAR_SEARCH_ENABLED is set but numpy is missing")
+        if ConfigVars.MAX_CONNECTIONS > 1:
+            strategies.append(MultiStopJourneyStrategy(min_connections=2))
+        return strategies
+
+    def on_snapshot(self, snapshot: FlightSnapshot):
+        """Snapshot listener that carries cached results over an incremental
+        refresh and rebuilds the hot-route journeys."""
+        if snapshot.delta:
+            self.result_cache.carry_over(snapshot.delta, snapshot.version)
+        self.hot_routes.schedule(snapshot, self.run_strategies)
+
+    async def get_snapshot(self) -> FlightSnapshot:
+        self.served_snapshot = await self.snapshot_cache.get_snapshot()
+        return self.served_snapshot
 
     async def get_flight_events(self) -> List[FlightEventDTO]:
-        raw_events = await self.adapter.fetch_flight_events()
-        if not raw_events:
-            raise Exception("There are no flight events available at the moment.")
-        return list(map(FlightEventDTO.from_dict, raw_events))
+        return (await self.get_snapshot()).events
 
     async def build_journeys(
         self, flight_filter: FlightFilterDTO
     ) -> List[List[FlightEventDTO]]:
+        return (await self.build_journeys_batch([flight_filter]))[0]
+
+    async def build_journeys_batch(
+        self, flight_filters: List[FlightFilterDTO]
+    ) -> List[List[dict]]:
+        """Answers every filter from the same snapshot, in the given order."""
+        try:
+            snapshot = await self.get_snapshot()
+        except Exception as e:
+            queries = ", ".join(str(f.__dict__) for f in flight_filters)
+            report_error(f"{e} : {queries}")
+            return [[] for _ in flight_filters]
+        return list(
+            await asyncio.gather(
+                *(self.search(snapshot, f) for f in flight_filters)
+            )
+        )
+
+    async def search(
+        self, snapshot: FlightSnapshot, flight_filter: FlightFilterDTO
+    ) -> List[dict]:
         journeys = []
         try:
-            flight_events = await self.get_flight_events()
-            for strategy in self.strategies:
-                result = await strategy.execute(flight_events, flight_filter)
-                journeys.extend(
-                    sorted(result, key=lambda x: x["path"][0].departure_datetime)
-                )
-            return journeys
+            started = time.perf_counter()
+            if self.check_reachability and not snapshot.reachability.may_connect(
+                flight_filter.date, flight_filter.origin, flight_filter.destination
+            ):
+                STAGE_SECONDS.labels("lookup").observe(time.perf_counter() - started)
+                return self.answered("unreachable", journeys)
+            materialized = self.hot_routes.lookup(flight_filter, snapshot.version)
+            STAGE_SECONDS.labels("lookup").observe(time.perf_counter() - started)
+            if materialized is not None:
+                return self.answered("hot_route", list(materialized))
+            computed = False
+
+            def compute():
+                nonlocal computed
+                computed = True
+                return self.run_strategies(snapshot, flight_filter)
+
+            journeys = await self.result_cache.get_or_compute(
+                JourneyResultCache.key_for(flight_filter, snapshot.version), compute
+            )
+            source = "computed" if computed else "result_cache"
+            return self.answered(source, list(journeys))
         except Exception as e:
+            SEARCHES.labels("error").inc()
             report_error(f"{e} : {flight_filter.__dict__}")
             return journeys
+
+    @staticmethod
+    def answered(source: str, journeys: List[dict]) -> List[dict]:
+        SEARCHES.labels(source).inc()
+        SEARCH_JOURNEYS.observe(len(journeys))
+        return journeys
+
+    async def search_page(
+        self,
+        flight_filter: FlightFilterDTO,
+        limit: int,
+        offset: int = 0,
+        snapshot_version: Optional[int] = None,
+    ) -> JourneyPageDTO:
+        """Journeys ``offset`` to ``offset + limit`` in build_journeys order.
+
+        Strategies are consumed lazily, so later strategies only run when the
+        earlier ones cannot fill the page. ``snapshot_version`` pins the page
+        to the snapshot that served the previous one; CursorExpiredError is
+        raised once that snapshot has been replaced.
+        """
+        try:
+            snapshot = await self.get_snapshot()
+        except Exception as e:
+            report_error(f"{e} : {flight_filter.__dict__}")
+            return JourneyPageDTO([], None, None)
+        if snapshot_version is not None and snapshot_version != snapshot.version:
+            raise CursorExpiredError("the flight events changed, restart the search")
+        started = time.perf_counter()
+        if self.check_reachability and not snapshot.reachability.may_connect(
+            flight_filter.date, flight_filter.origin, flight_filter.destination
+        ):
+            STAGE_SECONDS.labels("lookup").observe(time.perf_counter() - started)
+            SEARCHES.labels("unreachable").inc()
+            return JourneyPageDTO([], snapshot.version, None)
+
+        # One extra journey tells whether there is a next page.
+        source = "hot_route"
+        cached = self.hot_routes.lookup(flight_filter, snapshot.version)
+        if cached is None:
+            source = "result_cache"
+            cached = self.result_cache.lookup(
+                JourneyResultCache.key_for(flight_filter, snapshot.version)
+            )
+        STAGE_SECONDS.labels("lookup").observe(time.perf_counter() - started)
+        if cached is None:
+            source = "computed"
+        try:
+            if cached is not None:
+                journeys = cached[offset : offset + limit + 1]
+            elif self.executor is not None and any(
+                s.cpu_bound for s in self.strategies
+            ):
+                journeys = await asyncio.get_running_loop().run_in_executor(
+                    self.executor,
+                    self.first_journeys,
+                    snapshot,
+                    flight_filter,
+                    offset,
+                    limit + 1,
+                )
+            else:
+                journeys = self.first_journeys(
+                    snapshot, flight_filter, offset, limit + 1
+                )
+        except Exception as e:
+            SEARCHES.labels("error").inc()
+            report_error(f"{e} : {flight_filter.__dict__}")
+            return JourneyPageDTO([], snapshot.version, None)
+
+        SEARCHES.labels(source).inc()
+        next_offset = offset + limit if len(journeys) > limit else None
+        return JourneyPageDTO(journeys[:limit], snapshot.version, next_offset)
+
+    def first_journeys(
+        self,
+        snapshot: FlightSnapshot,
+        flight_filter: FlightFilterDTO,
+        offset: int,
+        count: int,
+    ) -> List[dict]:
+        journeys = chain.from_iterable(
+            strategy.iter_journeys(snapshot.graph, flight_filter)
+            for strategy in self.strategies
+        )
+        with STAGE_SECONDS.labels("page_strategies").time():
+            return list(islice(journeys, offset, offset + count))
+
+    async def stream_journeys(
+        self, flight_filter: FlightFilterDTO
+    ) -> AsyncIterator[dict]:
+        """Yields journeys strategy by strategy, as soon as each one finishes.
+
+        The order matches build_journeys. A complete stream is stored in the
+        result cache; a stream closed early is not.
+        """
+        try:
+            snapshot = await self.get_snapshot()
+        except Exception as e:
+            report_error(f"{e} : {flight_filter.__dict__}")
+            return
+        started = time.perf_counter()
+        if self.check_reachability and not snapshot.reachability.may_connect(
+            flight_filter.date, flight_filter.origin, flight_filter.destination
+        ):
+            STAGE_SECONDS.labels("lookup").observe(time.perf_counter() - started)
+            self.answered("unreachable", [])
+            return
+
+        key = JourneyResultCache.key_for(flight_filter, snapshot.version)
+        source = "hot_route"
+        cached = self.hot_routes.lookup(flight_filter, snapshot.version)
+        if cached is None:
+            source = "result_cache"
+            cached = self.result_cache.lookup(key)
+        STAGE_SECONDS.labels("lookup").observe(time.perf_counter() - started)
+        if cached is not None:
+            self.answered(source, cached)
+            for journey in cached:
+                yield journey
+            return
+
+        journeys = []
+        tasks = [
+            asyncio.ensure_future(self.run_strategy(strategy, snapshot, flight_filter))
+            for strategy in self.strategies
+        ]
+        try:
+            for task in tasks:
+                result = await task
+                journeys.extend(result)
+                for journey in result:
+                    yield journey
+        except Exception as e:
+            SEARCHES.labels("error").inc()
+            report_error(f"{e} : {flight_filter.__dict__}")
+            return
+        finally:
+            for task in tasks:
+                task.cancel()
+        self.answered("computed", journeys)
+        self.result_cache.put(key, journeys)
+
+    async def run_strategies(
+        self, snapshot: FlightSnapshot, flight_filter: FlightFilterDTO
+    ) -> List[dict]:
+        results = await asyncio.gather(
+            *(
+                self.run_strategy(strategy, snapshot, flight_filter)
+                for strategy in self.strategies
+            )
+        )
+        # Concatenated in strategy order so responses keep their layout.
+        journeys = []
+        for result in results:
+            journeys.extend(result)
+        return journeys
+
+    async def run_strategy(
+        self,
+        strategy: JourneyBuilderStrategy,
+        snapshot: FlightSnapshot,
+        flight_filter: FlightFilterDTO,
+    ) -> List[dict]:
+        if strategy.cpu_bound and self.executor is not None:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                self.find_sorted_journeys,
+                strategy,
+                snapshot,
+                flight_filter,
+            )
+        started = time.perf_counter()
+        result = await strategy.execute(snapshot.graph, flight_filter)
+        STRATEGY_SECONDS.labels(type(strategy).__name__).observe(
+            time.perf_counter() - started
+        )
+        return sort_journeys(result)
+
+    @staticmethod
+    def find_sorted_journeys(
+        strategy: JourneyBuilderStrategy,
+        snapshot: FlightSnapshot,
+        flight_filter: FlightFilterDTO,
+    ) -> List[dict]:
+        with STRATEGY_SECONDS.labels(type(strategy).__name__).time():
+            result = strategy.find_journeys(snapshot.graph, flight_filter)
+        return sort_journeys(result)
@@ -9,3 +9,43 @@ class ConfigVars:
     MAX_JOURNEY_HOURS: int = int(getenv("MAX_JOURNEY_HOURS", "24"))
     MAX_LAYOVER_HOURS: int = int(getenv("MAX_LAYOVER_HOURS", "4"))
     DEFAULT_API_TIMEOUT: int = int(getenv("DEFAULT_API_TIMEOUT", "10"))
+    FLIGHT_EVENTS_CACHE_TTL_SECONDS: int = int(
+        getenv("FLIGHT_EVENTS_CACHE_TTL_SECONDS", "60")
+    )
+    FLIGHT_EVENTS_RETRY_SECONDS: float = float(
+        getenv("FLIGHT_EVENTS_RETRY_SECONDS", "5")
+    )
+    HTTP_MAX_CONNECTIONS: int = int(getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(
+        getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10")
+    )
+    HTTP_KEEPALIVE_EXPIRY: float = float(getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP2_ENABLED: bool = getenv("HTTP2_ENABLED", "true").lower() == "true"
+    COLUMNAR_SEARCH_ENABLED: bool = (
+        getenv("COLUMNAR_SEARCH_ENABLED", "false").lower() == "true"
+    )
+    JOURNEY_CACHE_MAX_ENTRIES: int = int(getenv("JOURNEY_CACHE_MAX_ENTRIES", "1024"))
+    JOURNEY_CACHE_TTL_SECONDS: int = int(getenv("JOURNEY_CACHE_TTL_SECONDS", "300"))
+    MAX_CONNECTIONS: int = int(getenv("MAX_CONNECTIONS", "1"))
+    STRATEGY_WORKERS: int = int(getenv("STRATEGY_WORKERS", "0"))
+    BATCH_MAX_QUERIES: int = int(getenv("BATCH_MAX_QUERIES", "100"))
+    STREAM_MAX_JOURNEYS: int = int(getenv("STREAM_MAX_JOURNEYS", "10000"))
+    PRERENDER_EVENT_FRAGMENTS: bool = (
+        getenv("PRERENDER_EVENT_FRAGMENTS", "true").lower() == "true"
+    )
+    SEARCH_DEFAULT_LIMIT: int = int(getenv("SEARCH_DEFAULT_LIMIT", "20"))
+    SEARCH_MAX_LIMIT: int = int(getenv("SEARCH_MAX_LIMIT", "1000"))
+    HOT_ROUTES: str = getenv("HOT_ROUTES", "")
+    HOT_ROUTE_DAYS: int = int(getenv("HOT_ROUTE_DAYS", "7"))
+    SNAPSHOT_DELTA_ENABLED: bool = (
+        getenv("SNAPSHOT_DELTA_ENABLED", "true").lower() == "true"
+    )
+    SNAPSHOT_FILE_PATH: str = getenv("SNAPSHOT_FILE_PATH", "")
+    PROFILING_TOKENS: str = getenv("PROFILING_TOKENS", "")
+    PROFILE_OUTPUT_DIR: str = getenv("PROFILE_OUTPUT_DIR", "")
+    LOG_FORMAT: str = getenv("LOG_FORMAT", "json").lower()
+    LOG_QUEUE_SIZE: int = int(getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_REPEAT_LIMIT: int = int(getenv("LOG_REPEAT_LIMIT", "10"))
+    LOG_REPEAT_WINDOW_SECONDS: float = float(
+        getenv("LOG_REPEAT_WINDOW_SECONDS", "60")
+    )
@@ -0,0 +1,26 @@
+import base64
+
+from typing import Tuple
+
+
+class CursorExpiredError(Exception):
+    """The cursor points into a feed snapshot that has been replaced."""
+
+
+def encode_cursor(snapshot_version: int, offset: int) -> str:
+    raw = f"{snapshot_version}:{offset}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """Returns (snapshot_version, offset); raises ValueError if malformed."""
+    try:
+        raw = base64.b64decode(
+            cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True
+        ).decode()
+        version, offset = map(int, raw.split(":"))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("invalid cursor") from e
+    if version < 0 or offset < 0:
+        raise ValueError("invalid cursor")
+    return version, offset
@@ -0,0 +1,15 @@
+import json
+
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    orjson = None
+
+
+def dumps(payload: Any) -> bytes:
+    """Compact JSON, the same bytes FastAPI's JSONResponse would send."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
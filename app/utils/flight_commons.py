@@ -1,33 +1,25 @@
 from typing import List
-from datetime import datetime
 from app.dtos.flight_event_dto import FlightEventDTO
 
-
-async def validate_time(
-    arrival: datetime, departure: datetime, max_hours_travel: int
-) -> bool:
-    total_duration = (arrival - departure).total_seconds() / 3600
-
-    return total_duration <= max_hours_travel
+SECONDS_PER_HOUR = 3600
 
 
-async def is_within_max_duration_1_event(
+def is_within_max_duration_1_event(
     event: FlightEventDTO, max_hours_travel: int
 ) -> bool:
     if not event:
         return False
-    departure = event.departure_datetime
-    arrival = event.arrival_datetime
 
-    return await validate_time(arrival, departure, max_hours_travel)
+    return event.arrival_ts - event.departure_ts <= max_hours_travel * SECONDS_PER_HOUR
 
 
-async def is_within_max_duration(
+def is_within_max_duration(
     events: List[FlightEventDTO], max_hours_travel: int
 ) -> bool:
     if not events:
         return False
-    departure = events[0].departure_datetime
-    arrival = events[-1].arrival_datetime
 
-    return await validate_time(arrival, departure, max_hours_travel)
+    return (
+        events[-1].arrival_ts - events[0].departure_ts
+        <= max_hours_travel * SECONDS_PER_HOUR
+    )
@@ -0,0 +1,92 @@
+import codecs
+import json
+
+from typing import Any, List
+
+
+class JSONArrayStreamParser:
+    """Incrementally decodes the elements of a top-level JSON array.
+
+    Chunks of bytes are fed as they arrive from the network and every element
+    that is complete so far is returned, so callers never hold the whole
+    document in memory.
+    """
+
+    _WHITESPACE = " \t\n\r"
+
+    def __init__(self, encoding: str = "utf-8"):
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder(encoding)()
+        self._buffer = ""
+        self._started = False
+        self._expect_value = True
+        self._first = True
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buffer += self._text_decoder.decode(chunk)
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        items = self._drain(final=True)
+        if not self._finished:
+            raise ValueError("Incomplete JSON array in stream")
+        return items
+
+    def _skip_whitespace(self, pos: int) -> int:
+        buffer = self._buffer
+        while pos < len(buffer) and buffer[pos] in self._WHITESPACE:
+            pos += 1
+        return pos
+
+    def _drain(self, final: bool) -> List[Any]:
+        items = []
+        buffer = self._buffer
+        pos = self._skip_whitespace(0)
+
+        if not self._started:
+            if pos >= len(buffer):
+                self._buffer = ""
+                return items
+            if buffer[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            self._started = True
+            pos = self._skip_whitespace(pos + 1)
+
+        while not self._finished and pos < len(buffer):
+            if self._expect_value:
+                if self._first and buffer[pos] == "]":
+                    self._finished = True
+                    pos += 1
+                    break
+                try:
+                    item, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                # A scalar ending exactly at the buffer edge may continue in
+                # the next chunk (e.g. a number split across two reads).
+                if end == len(buffer) and not final and not isinstance(
+                    item, (dict, list, str)
+                ):
+                    break
+                items.append(item)
+                self._expect_value = False
+                self._first = False
+                pos = end
+            else:
+                if buffer[pos] == ",":
+                    self._expect_value = True
+                elif buffer[pos] == "]":
+                    self._finished = True
+                else:
+                    raise ValueError(f"Unexpected character {buffer[pos]!r} in JSON array")
+                pos += 1
+            pos = self._skip_whitespace(pos)
+
+        self._buffer = buffer[pos:]
+        if self._finished and self._buffer.strip():
+            raise ValueError("Unexpected data after JSON array")
+        return items
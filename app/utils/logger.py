@@ -1,19 +1,159 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+import threading
+import time
+
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from app.utils.config_vars import ConfigVars
+from app.utils.metrics import counter
+
+LOG_RECORDS_DROPPED = counter(
+    "flights_api_log_records_dropped_total",
+    "Log records not written, by reason: repeated or queue_full.",
+    ("reason",),
+)
+
+# Attributes every LogRecord has; anything else came in through ``extra``.
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "suppressed"}
+# Distinct messages RepeatFilter tracks before it forgets them all.
+MAX_TRACKED_MESSAGES = 10_000
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, the ``extra``
+    fields and, for rate-limited records, how many were suppressed before."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__(
+            "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        if getattr(record, "suppressed", 0):
+            line += f" ({record.suppressed} similar messages suppressed)"
+        return line
+
+
+class RepeatFilter(logging.Filter):
+    """Lets through at most ``limit`` records with the same level and message
+    per ``window_seconds``. The first record let through after a suppression
+    carries the number suppressed in its ``suppressed`` attribute."""
+
+    def __init__(self, limit: int, window_seconds: float):
+        super().__init__()
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        # (level, message) -> [window start, records let through, suppressed]
+        self._windows: Dict[Tuple[int, str], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0:
+            return True
+        key = (record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                if len(self._windows) >= MAX_TRACKED_MESSAGES:
+                    # A flood of distinct messages; start counting afresh.
+                    self._windows.clear()
+                suppressed = 0 if window is None else window[2]
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.limit:
+                window[1] += 1
+                suppressed = 0
+            else:
+                window[2] += 1
+                LOG_RECORDS_DROPPED.labels("repeated").inc()
+                return False
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the listener thread without formatting them or ever
+    waiting; records that do not fit in the queue are dropped and counted."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue stays in this process, so the record needs no pickling
+        # and is formatted on the listener thread instead.
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels("queue_full").inc()
+
+
+class LogListener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room so stopping with a full queue still flushes it.
+        self.queue.put(self._sentinel)
+
+
+_listener: Optional[QueueListener] = None
+
+
+def stop_logging():
+    """Writes the records still queued and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def setup_logger():
+    global _listener
     logger = logging.getLogger("flights_api")
     logger.setLevel(logging.INFO)
 
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(
+        TextFormatter() if ConfigVars.LOG_FORMAT == "text" else JSONFormatter()
     )
 
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    queue_handler = NonBlockingQueueHandler(queue.Queue(ConfigVars.LOG_QUEUE_SIZE))
+    queue_handler.addFilter(
+        RepeatFilter(ConfigVars.LOG_REPEAT_LIMIT, ConfigVars.LOG_REPEAT_WINDOW_SECONDS)
+    )
+    logger.addHandler(queue_handler)
+
+    _listener = LogListener(queue_handler.queue, console_handler)
+    _listener.start()
+    atexit.register(stop_logging)
 
     logger.propagate = False
 
@@ -0,0 +1,293 @@
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; from sub-millisecond lookups to multi-second feed loads.
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+COUNT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# name, labels, value
+Sample = Tuple[str, Dict[str, str], float]
+Collector = Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]
+
+# Called with the labels and value of every histogram observation made in
+# the current context; set while a request is profiled (app.utils.profiling).
+observation_recorder: ContextVar[
+    Optional[Callable[[Dict[str, str], float], None]]
+] = ContextVar("observation_recorder", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return (
+        "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+    )
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Timer:
+    __slots__ = ("_observe", "_started")
+
+    def __init__(self, observe: Callable[[float], None]):
+        self._observe = observe
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._observe(time.perf_counter() - self._started)
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self, lock: threading.Lock):
+        self._lock = lock
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "labels", "buckets", "counts", "sum", "count")
+
+    def __init__(
+        self, lock: threading.Lock, labels: Dict[str, str], buckets: Sequence[float]
+    ):
+        self._lock = lock
+        self.labels = labels
+        self.buckets = buckets
+        # The last slot counts observations above every bucket (+Inf).
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+        recorder = observation_recorder.get()
+        if recorder is not None:
+            recorder(self.labels, value)
+
+    def time(self) -> _Timer:
+        """Observes the seconds spent in a ``with`` block."""
+        return _Timer(self.observe)
+
+
+class Metric(ABC):
+    """A metric family; ``labels(...)`` returns the series for label values.
+
+    Series are created on first use and kept for the life of the process,
+    so label values must come from a small fixed set (stage and strategy
+    names, outcomes), never from request data.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._default = self.labels()
+
+    @abstractmethod
+    def _new_child(self, labels: Dict[str, str]):
+        """A new series for ``labels``."""
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            with self._lock:
+                child = self._children.setdefault(
+                    values, self._new_child(dict(zip(self.labelnames, values)))
+                )
+        return child
+
+    def samples(self) -> List[Sample]:
+        samples = []
+        for values, child in list(self._children.items()):
+            samples.extend(
+                self._child_samples(dict(zip(self.labelnames, values)), child)
+            )
+        return samples
+
+    def _child_samples(self, labels: Dict[str, str], child) -> List[Sample]:
+        return [(self.name, labels, child.value)]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self, labels: Dict[str, str]):
+        return _CounterChild(self._lock)
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _new_child(self, labels: Dict[str, str]):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default.set(value)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self, labels: Dict[str, str]):
+        return _HistogramChild(threading.Lock(), labels, self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def _child_samples(self, labels: Dict[str, str], child) -> List[Sample]:
+        with child._lock:
+            counts, total, count = list(child.counts), child.sum, child.count
+        samples = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            samples.append(
+                (
+                    f"{self.name}_bucket",
+                    {**labels, "le": _format_value(bound)},
+                    cumulative,
+                )
+            )
+        samples.append((f"{self.name}_sum", labels, total))
+        samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+class Registry:
+    """Metrics and scrape-time collectors rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Collector] = []
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Collector):
+        """``collector()`` returns (name, type, help, samples) families read
+        when the metrics are scraped, for values owned by other objects."""
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector: Collector):
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def families(self) -> Iterable[Tuple[str, str, str, List[Sample]]]:
+        for metric in list(self._metrics.values()):
+            yield metric.name, metric.kind, metric.documentation, metric.samples()
+        for collector in list(self._collectors):
+            yield from collector()
+
+    def render(self) -> str:
+        lines = []
+        for name, kind, documentation, samples in self.families():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(
+                    f"{sample_name}{_format_labels(labels)} {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return registry.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return registry.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Optional[Sequence[float]] = None,
+) -> Histogram:
+    return registry.register(
+        Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS)
+    )
+
+
+# Shared by every layer so one histogram shows where a request spends time.
+STAGE_SECONDS = histogram(
+    "flights_api_stage_seconds",
+    "Time spent per pipeline stage (fetch, parse, index, lookup, sort, serialize).",
+    ("stage",),
+)
+STRATEGY_SECONDS = histogram(
+    "flights_api_strategy_seconds",
+    "Time spent finding journeys, per search strategy.",
+    ("strategy",),
+)
@@ -0,0 +1,124 @@
+import cProfile
+import json
+import os
+import pstats
+import secrets
+import time
+
+from collections import defaultdict
+from concurrent.futures import Executor, Future
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from app.utils.config_vars import ConfigVars
+from app.utils.metrics import observation_recorder
+
+TOP_FUNCTIONS = 30
+
+
+class ProfilerBusyError(Exception):
+    pass
+
+
+def profiling_allowed(token: str) -> bool:
+    """True when ``token`` is in PROFILING_TOKENS (empty disables profiling)."""
+    allowed = [t.strip() for t in ConfigVars.PROFILING_TOKENS.split(",") if t.strip()]
+    return any(secrets.compare_digest(token, t) for t in allowed)
+
+
+class InlineExecutor(Executor):
+    """Runs submitted calls immediately on the calling thread, so a profiled
+    request's CPU-bound strategies are seen by its profiler."""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def _function_name(key) -> str:
+    filename, line, name = key
+    if filename == "~":
+        return name
+    for prefix in (os.getcwd() + os.sep, os.path.dirname(os.__file__) + os.sep):
+        if filename.startswith(prefix):
+            filename = filename[len(prefix) :]
+            break
+    return f"{filename}:{line}({name})"
+
+
+class RequestProfiler:
+    """Profiles the code run inside a ``with`` block of one request.
+
+    Records the stage and strategy timings observed in the block's context
+    (see app.utils.metrics.observation_recorder) and a cProfile of the thread.
+    cProfile sees every coroutine the event loop runs meanwhile, so profiles
+    are clearest on a quiet worker. One request is profiled at a time.
+    """
+
+    _active = False
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.breakdown: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self.seconds = 0.0
+
+    def record(self, labels: Dict[str, str], value: float):
+        for name, label in labels.items():
+            self.breakdown[name][label] += value
+
+    def __enter__(self) -> "RequestProfiler":
+        if RequestProfiler._active:
+            raise ProfilerBusyError("another request is being profiled")
+        RequestProfiler._active = True
+        self._token = observation_recorder.set(self.record)
+        self._started = time.perf_counter()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        self.seconds = time.perf_counter() - self._started
+        observation_recorder.reset(self._token)
+        RequestProfiler._active = False
+
+    def top_functions(self, limit: int = TOP_FUNCTIONS) -> List[Dict[str, Any]]:
+        stats = pstats.Stats(self.profile).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+        return [
+            {
+                "function": _function_name(key),
+                "calls": calls,
+                "own_seconds": round(own, 6),
+                "cumulative_seconds": round(cumulative, 6),
+            }
+            for key, (_, calls, own, cumulative, _) in rows[:limit]
+        ]
+
+    def report(self, **extra) -> Dict[str, Any]:
+        return {
+            **extra,
+            "total_seconds": round(self.seconds, 6),
+            # e.g. {"stage": {"lookup": ...}, "strategy": {"OneStop...": ...}}
+            "breakdown": {
+                name: {label: round(v, 6) for label, v in values.items()}
+                for name, values in self.breakdown.items()
+            },
+            "top_functions": self.top_functions(),
+        }
+
+    def save(self, directory: str, report: Dict[str, Any]) -> str:
+        """Writes the report as JSON and the raw stats next to it (for
+        pstats or snakeviz); returns the JSON file's path."""
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        path = os.path.join(directory, f"search-{stamp}")
+        self.profile.dump_stats(f"{path}.prof")
+        with open(f"{path}.json", "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        return f"{path}.json"
@@ -0,0 +1,94 @@
+"""
+Pure-Python strategies against their NumPy columnar equivalents.
+
+For each feed size the busiest route of the first day is searched with both
+implementations; the columnar table build is reported separately because it
+happens once per snapshot. Run with:
+
+    python -m benchmarks.bench_columnar --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import time
+
+from collections import Counter
+
+from app.core.columnar import ColumnarFlightTable, columnar_available
+from app.core.flight_graph import FlightGraph
+from app.core.strategies.columnar import (
+    ColumnarDirectFlights,
+    ColumnarOneStopJourneyStrategy,
+)
+from app.core.strategies.direct_flights import JourneyDirectFlights
+from app.core.strategies.one_stop import OneStopJourneyStrategy
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from benchmarks.synthetic_feed import generate_raw_events
+
+
+def best_of(repeat: int, func):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def busiest_filter(graph: FlightGraph) -> FlightFilterDTO:
+    first_day = graph.events[0].departure_date
+    routes = Counter(
+        (e.departure_city, e.arrival_city) for e in graph.departures_on(first_day)
+    )
+    (origin, destination), _ = routes.most_common(1)[0]
+    return FlightFilterDTO(first_day, origin, destination)
+
+
+def bench_size(loop, size: int, cities: int, days: int, repeat: int):
+    graph = FlightGraph(
+        map(
+            FlightEventDTO.from_dict,
+            generate_raw_events(
+                num_cities=cities, events_per_day=size // days, days=days
+            ),
+        )
+    )
+    flight_filter = busiest_filter(graph)
+    build, _ = best_of(1, lambda: ColumnarFlightTable(graph))
+    ColumnarFlightTable.of(graph)
+
+    print(f"\n{len(graph)} events, {flight_filter.origin}->{flight_filter.destination}")
+    print(f"  columnar table build      {build * 1000:10.2f} ms")
+    for name, python_strategy, columnar_strategy in (
+        ("direct", JourneyDirectFlights(), ColumnarDirectFlights()),
+        ("one-stop", OneStopJourneyStrategy(), ColumnarOneStopJourneyStrategy()),
+    ):
+        for label, strategy in (("python", python_strategy), ("columnar", columnar_strategy)):
+            elapsed, result = best_of(
+                repeat, lambda: loop.run_until_complete(strategy.execute(graph, flight_filter))
+            )
+            print(
+                f"  {name:<9} {label:<9} {elapsed * 1000:10.2f} ms  "
+                f"{len(result)} journeys"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--cities", type=int, default=200)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not columnar_available():
+        raise SystemExit("numpy is required: pip install numpy")
+    loop = asyncio.new_event_loop()
+    for size in args.sizes:
+        bench_size(loop, size, args.cities, args.days, args.repeat)
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
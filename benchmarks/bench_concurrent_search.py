@@ -0,0 +1,111 @@
+"""
+Search latency under concurrent traffic, inline strategies vs a worker pool.
+
+A batch of searches over random routes of the first day is fired at once
+against a prepared snapshot with the result cache disabled, after one
+untimed batch that builds the snapshot's lazy indexes. Per-request latency
+percentiles are reported for strategies run inline on the event loop and
+for CPU-bound strategies offloaded to a thread pool; ``--columnar`` uses the
+NumPy strategies, which release the GIL inside NumPy. Run with:
+
+    python -m benchmarks.bench_concurrent_search --events 200000 --requests 64
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from app.core.flight_graph import FlightGraph
+from app.core.strategies.columnar import (
+    ColumnarDirectFlights,
+    ColumnarOneStopJourneyStrategy,
+)
+from app.core.flight_snapshot import FlightSnapshot
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.services.journey_result_cache import JourneyResultCache
+from app.services.journey_service import JourneyService
+from benchmarks.synthetic_feed import city_codes, generate_raw_events
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def timed_search(service: JourneyService, snapshot, flight_filter) -> float:
+    started = time.perf_counter()
+    await service.run_strategies(snapshot, flight_filter)
+    return time.perf_counter() - started
+
+
+async def run_batch(service: JourneyService, snapshot, filters) -> List[float]:
+    return await asyncio.gather(
+        *(timed_search(service, snapshot, f) for f in filters)
+    )
+
+
+def bench(
+    label: str,
+    snapshot,
+    filters,
+    executor: Optional[ThreadPoolExecutor],
+    columnar: bool = False,
+):
+    service = JourneyService(
+        result_cache=JourneyResultCache(max_entries=0), executor=executor
+    )
+    if columnar:
+        service.strategies = [ColumnarDirectFlights(), ColumnarOneStopJourneyStrategy()]
+    started = time.perf_counter()
+    latencies = asyncio.run(run_batch(service, snapshot, filters))
+    wall = time.perf_counter() - started
+    print(
+        f"  {label:<12} p50 {statistics.median(latencies) * 1000:9.1f} ms  "
+        f"p99 {percentile(latencies, 0.99) * 1000:9.1f} ms  "
+        f"wall {wall * 1000:9.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--cities", type=int, default=100)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--columnar", action="store_true")
+    args = parser.parse_args()
+
+    graph = FlightGraph(
+        map(
+            FlightEventDTO.from_dict,
+            generate_raw_events(
+                num_cities=args.cities,
+                events_per_day=args.events // args.days,
+                days=args.days,
+            ),
+        )
+    )
+    snapshot = FlightSnapshot(graph, version=1)
+    day = graph.events[0].departure_date
+    rng = random.Random(7)
+    cities = city_codes(args.cities)
+    filters = [
+        FlightFilterDTO(day, *rng.sample(cities, 2)) for _ in range(args.requests)
+    ]
+
+    print(f"{len(graph)} events, {args.requests} concurrent searches")
+    bench("warm-up", snapshot, filters, None, args.columnar)
+    bench("inline", snapshot, filters, None, args.columnar)
+    for workers in args.workers:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            bench(f"{workers} threads", snapshot, filters, executor, args.columnar)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Per-element cost of the journey duration predicates.
+
+Compares the previous coroutine-based checks (datetime subtraction and
+total_seconds, awaited once per element) with the synchronous
+epoch-timestamp predicates in app.utils.flight_commons. Run with:
+
+    python -m benchmarks.bench_duration_checks --events 100000
+"""
+import argparse
+import asyncio
+import time
+
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.utils.flight_commons import (
+    is_within_max_duration,
+    is_within_max_duration_1_event,
+)
+from benchmarks.synthetic_feed import generate_raw_events
+
+
+async def legacy_validate_time(arrival, departure, max_hours_travel) -> bool:
+    total_duration = (arrival - departure).total_seconds() / 3600
+    return total_duration <= max_hours_travel
+
+
+async def legacy_is_within_max_duration_1_event(event, max_hours_travel) -> bool:
+    if not event:
+        return False
+    return await legacy_validate_time(
+        event.arrival_datetime, event.departure_datetime, max_hours_travel
+    )
+
+
+async def legacy_is_within_max_duration(events, max_hours_travel) -> bool:
+    if not events:
+        return False
+    return await legacy_validate_time(
+        events[-1].arrival_datetime, events[0].departure_datetime, max_hours_travel
+    )
+
+
+async def legacy_single(events):
+    return [e for e in events if await legacy_is_within_max_duration_1_event(e, 24)]
+
+
+async def legacy_pairs(pairs):
+    return [p for p in pairs if await legacy_is_within_max_duration(p, 24)]
+
+
+def sync_single(events):
+    return [e for e in events if is_within_max_duration_1_event(e, 24)]
+
+
+def sync_pairs(pairs):
+    return [p for p in pairs if is_within_max_duration(p, 24)]
+
+
+def best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    events = list(
+        map(
+            FlightEventDTO.from_dict,
+            generate_raw_events(events_per_day=args.events // 7, days=7),
+        )
+    )
+    pairs = [[a, b] for a, b in zip(events, events[1:])]
+    loop = asyncio.new_event_loop()
+
+    for name, legacy, current, items in (
+        (
+            "single event",
+            lambda: loop.run_until_complete(legacy_single(events)),
+            lambda: sync_single(events),
+            events,
+        ),
+        (
+            "journey pair",
+            lambda: loop.run_until_complete(legacy_pairs(pairs)),
+            lambda: sync_pairs(pairs),
+            pairs,
+        ),
+    ):
+        before = best_of(args.repeat, legacy)
+        after = best_of(args.repeat, current)
+        print(
+            f"{name:<13} async/datetime {before / len(items) * 1e9:7.1f} ns/item  "
+            f"sync/epoch {after / len(items) * 1e9:7.1f} ns/item  "
+            f"speedup x{before / after:.1f}"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
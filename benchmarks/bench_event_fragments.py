@@ -0,0 +1,72 @@
+"""
+Cost of pre-rendering every event's FlightItem JSON fragment on load.
+
+Builds a FlightSnapshot from a synthetic feed with and without
+PRERENDER_EVENT_FRAGMENTS, each in its own process, and reports the resident
+memory and load time the fragments add (Linux only). Run with:
+
+    python -m benchmarks.bench_event_fragments --events 1000000
+"""
+import argparse
+import gc
+import multiprocessing
+import time
+
+from datetime import datetime
+
+from app.core.flight_graph import FlightGraph
+from app.core.flight_snapshot import FlightSnapshot
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.utils.config_vars import ConfigVars
+from benchmarks.bench_event_memory import resident_bytes
+from benchmarks.synthetic_feed import generate_raw_events
+
+
+def measure(prerender: bool, num_events: int, num_cities: int, days: int, queue):
+    ConfigVars.PRERENDER_EVENT_FRAGMENTS = prerender
+    graph = FlightGraph(
+        map(
+            FlightEventDTO.from_dict,
+            generate_raw_events(
+                num_cities=num_cities, events_per_day=num_events // days, days=days
+            ),
+        )
+    )
+    gc.collect()
+    before = resident_bytes()
+    started = time.perf_counter()
+    snapshot = FlightSnapshot(graph, version=1)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    queue.put((len(snapshot.graph), resident_bytes() - before, elapsed))
+
+
+def run(prerender: bool, num_events: int, num_cities: int, days: int):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=measure, args=(prerender, num_events, num_cities, days, queue)
+    )
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--cities", type=int, default=200)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{datetime.now():%Y-%m-%d %H:%M:%S} | {args.events} events")
+    for prerender in (False, True):
+        count, retained, elapsed = run(prerender, args.events, args.cities, args.days)
+        print(
+            f"prerender={str(prerender):<5} snapshot retained={retained / 2**20:8.1f} MiB "
+            f"per_event={retained / count:6.1f} B  build={elapsed:6.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
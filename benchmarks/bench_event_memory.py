@@ -0,0 +1,127 @@
+"""
+Memory footprint of FlightEventDTO on a synthetic feed.
+
+The feed is encoded to JSON and parsed back with JSONArrayStreamParser, so
+every event carries freshly decoded strings exactly like the upstream
+response. Each layout is measured in its own process as the growth of the
+resident set size (Linux only). Run with:
+
+    python -m benchmarks.bench_event_memory --events 1000000
+"""
+import argparse
+import gc
+import multiprocessing
+import os
+import time
+
+from datetime import datetime
+
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.utils.json_stream import JSONArrayStreamParser
+from benchmarks.synthetic_feed import encode_feed, generate_raw_events
+
+
+class DictFlightEventDTO:
+    """The previous FlightEventDTO layout: a plain class with a __dict__."""
+
+    def __init__(
+        self,
+        flight_number,
+        departure_city,
+        arrival_city,
+        departure_datetime,
+        arrival_datetime,
+    ):
+        self.flight_number = flight_number
+        self.departure_city = departure_city
+        self.arrival_city = arrival_city
+        self.departure_datetime = departure_datetime
+        self.arrival_datetime = arrival_datetime
+
+    @property
+    def departure_date(self):
+        return self.departure_datetime.date()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DictFlightEventDTO":
+        return cls(
+            flight_number=data.get("flight_number"),
+            departure_city=data.get("departure_city"),
+            arrival_city=data.get("arrival_city"),
+            departure_datetime=datetime.fromisoformat(
+                data.get("departure_datetime").replace("Z", "+00:00")
+            ),
+            arrival_datetime=datetime.fromisoformat(
+                data.get("arrival_datetime").replace("Z", "+00:00")
+            ),
+        )
+
+
+LAYOUTS = {cls.__name__: cls for cls in (DictFlightEventDTO, FlightEventDTO)}
+
+
+def resident_bytes() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(layout: str, num_events: int, num_cities: int, days: int, queue):
+    dto_cls = LAYOUTS[layout]
+    chunks = list(
+        encode_feed(
+            generate_raw_events(
+                num_cities=num_cities, events_per_day=num_events // days, days=days
+            )
+        )
+    )
+    gc.collect()
+    before = resident_bytes()
+    started = time.perf_counter()
+
+    parser = JSONArrayStreamParser()
+    events = []
+    for chunk in chunks:
+        events.extend(map(dto_cls.from_dict, parser.feed(chunk)))
+    events.extend(map(dto_cls.from_dict, parser.close()))
+
+    elapsed = time.perf_counter() - started
+    del chunks
+    gc.collect()
+    queue.put((len(events), resident_bytes() - before, elapsed))
+
+
+def run(layout: str, num_events: int, num_cities: int, days: int):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=measure, args=(layout, num_events, num_cities, days, queue)
+    )
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--cities", type=int, default=200)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{datetime.now():%Y-%m-%d %H:%M:%S} | {args.events} events")
+    retained = {}
+    for layout in LAYOUTS:
+        count, retained[layout], elapsed = run(
+            layout, args.events, args.cities, args.days
+        )
+        print(
+            f"{layout:<20} retained={retained[layout] / 2**20:8.1f} MiB "
+            f"per_event={retained[layout] / count:6.1f} B  build={elapsed:6.2f}s"
+        )
+
+    saved = 1 - retained["FlightEventDTO"] / retained["DictFlightEventDTO"]
+    print(f"FlightEventDTO saves {saved:.0%} of retained memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+One-stop search time as unrelated routes are added to the feed.
+
+A fixed feed around the searched origin is padded with growing amounts of
+traffic that neither leaves the origin nor reaches the destination. With the
+origin/date push-down the search only touches the first-leg slice and the
+hub-to-destination routes, so its time should stay roughly flat. Run with:
+
+    python -m benchmarks.bench_one_stop_pushdown --padding 0 100000 1000000
+"""
+import argparse
+import asyncio
+import time
+
+from itertools import chain
+
+from app.core.columnar import ColumnarFlightTable, columnar_available
+from app.core.flight_graph import FlightGraph
+from app.core.strategies.columnar import ColumnarOneStopJourneyStrategy
+from app.core.strategies.one_stop import OneStopJourneyStrategy
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from benchmarks.synthetic_feed import city_codes, generate_raw_events
+
+ORIGIN, DESTINATION = city_codes(2)
+
+
+def unrelated_events(count: int, days: int):
+    for raw_event in generate_raw_events(
+        num_cities=400, events_per_day=count // days + 1, days=days, seed=11
+    ):
+        if ORIGIN not in (raw_event["departure_city"], raw_event["arrival_city"]) and (
+            DESTINATION not in (raw_event["departure_city"], raw_event["arrival_city"])
+        ):
+            yield raw_event
+
+
+def best_of(repeat: int, func):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--padding", type=int, nargs="+", default=[0, 100_000, 1_000_000])
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    strategies = [("python", OneStopJourneyStrategy())]
+    if columnar_available():
+        strategies.append(("columnar", ColumnarOneStopJourneyStrategy()))
+
+    loop = asyncio.new_event_loop()
+    for padding in args.padding:
+        core = generate_raw_events(
+            num_cities=20, events_per_day=args.events // args.days, days=args.days
+        )
+        graph = FlightGraph(
+            map(
+                FlightEventDTO.from_dict,
+                chain(core, unrelated_events(padding, args.days)),
+            )
+        )
+        flight_filter = FlightFilterDTO(
+            graph.events[0].departure_date, ORIGIN, DESTINATION
+        )
+        if columnar_available():
+            ColumnarFlightTable.of(graph)
+
+        print(f"\n{len(graph)} events, {ORIGIN}->{DESTINATION}")
+        for label, strategy in strategies:
+            elapsed, result = best_of(
+                args.repeat,
+                lambda: loop.run_until_complete(strategy.execute(graph, flight_filter)),
+            )
+            print(f"  {label:<9} {elapsed * 1000:10.3f} ms  {len(result)} journeys")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
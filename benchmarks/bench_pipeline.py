@@ -0,0 +1,264 @@
+"""
+Stage-by-stage timings of the journey search pipeline, as JSON.
+
+Generates a seeded synthetic feed and times every stage of a search on its
+own: parsing raw events with FlightEventDTO.from_dict, indexing them into a
+FlightSnapshot, JourneyDirectFlights, OneStopJourneyStrategy, the departure
+sort JourneyService applies to each strategy's result, the whole
+JourneyService.build_journeys call and response serialization (JourneyResponse
+models and the JourneyEncoder). Each stage is run ``--repeat`` times and its
+min and median are reported.
+
+Results are written as JSON (``--output``). Passing the JSON of a previous
+run as ``--baseline`` compares the medians and exits with status 1 when a
+stage got slower than ``--tolerance``. Run with:
+
+    python -m benchmarks.bench_pipeline --cities 100 --events-per-day 20000 \\
+        --days 7 --hub-concentration 0.5 --output pipeline.json
+    python -m benchmarks.bench_pipeline ... --baseline pipeline.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.routing import serialize_response
+
+from app.api.v1.responses.journey_encoder import JourneyEncoder
+from app.api.v1.responses.journey_response import JourneyResponse
+from app.core.flight_snapshot import FlightSnapshot
+from app.core.strategies.direct_flights import JourneyDirectFlights
+from app.core.strategies.one_stop import OneStopJourneyStrategy
+from app.dtos.flight_event_dto import FlightEventDTO, parse_timestamp
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.services.flight_snapshot_cache import FlightSnapshotCache
+from app.services.hot_route_cache import HotRouteCache
+from app.services.journey_result_cache import JourneyResultCache
+from app.services.journey_service import JourneyService, journey_departure
+from benchmarks.bench_serialization import RESPONSE_FIELD
+from benchmarks.bench_snapshot_refresh import InMemoryFeed
+from benchmarks.synthetic_feed import city_codes, generate_raw_events
+
+FORMAT_VERSION = 1
+
+
+def measure(repeat: int, items: int, func: Callable[[], Any]) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    median = statistics.median(samples)
+    return {
+        "items": items,
+        "min_seconds": min(samples),
+        "median_seconds": median,
+        "median_us_per_item": median / items * 1e6 if items else 0.0,
+    }
+
+
+def search_filters(args, cities: List[str]) -> List[FlightFilterDTO]:
+    rng = random.Random(args.seed + 1)
+    return [
+        FlightFilterDTO(
+            datetime(2024, 9, 1 + rng.randrange(args.days)).date(),
+            *rng.sample(cities, 2),
+        )
+        for _ in range(args.searches)
+    ]
+
+
+def parse(raw_events: List[dict]) -> List[FlightEventDTO]:
+    # Cold timestamp cache, as on a process's first load.
+    parse_timestamp.cache_clear()
+    return list(map(FlightEventDTO.from_dict, raw_events))
+
+
+async def serialize_models(results: List[List[dict]]):
+    for journeys in results:
+        content = await serialize_response(
+            field=RESPONSE_FIELD,
+            response_content=list(map(JourneyResponse.from_dto, journeys)),
+        )
+        json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+async def build_all(service: JourneyService, filters: List[FlightFilterDTO]):
+    for flight_filter in filters:
+        await service.build_journeys(flight_filter)
+
+
+def run(args) -> Dict[str, Any]:
+    cities = city_codes(args.cities)
+    raw_events = list(
+        generate_raw_events(
+            num_cities=args.cities,
+            events_per_day=args.events_per_day,
+            days=args.days,
+            seed=args.seed,
+            start=datetime(2024, 9, 1),
+            hub_concentration=args.hub_concentration,
+            num_hubs=args.hubs,
+        )
+    )
+    filters = search_filters(args, cities)
+    events = parse(raw_events)
+    snapshot = FlightSnapshot(events, version=1)
+    graph = snapshot.graph
+    direct, one_stop = JourneyDirectFlights(), OneStopJourneyStrategy()
+    unsorted = [
+        result
+        for f in filters
+        for result in (direct.find_journeys(graph, f), one_stop.find_journeys(graph, f))
+    ]
+    journey_count = sum(map(len, unsorted))
+
+    snapshot_cache = FlightSnapshotCache(
+        adapter=InMemoryFeed(raw_events), ttl_seconds=float("inf")
+    )
+    service = JourneyService(
+        snapshot_cache=snapshot_cache,
+        result_cache=JourneyResultCache(max_entries=0),
+        hot_routes=HotRouteCache(routes=[]),
+    )
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(snapshot_cache.get_snapshot())
+    results = [
+        loop.run_until_complete(service.build_journeys(f)) for f in filters
+    ]
+    encoder = JourneyEncoder.of(snapshot_cache.snapshot)
+
+    repeat = args.repeat
+    stages = {
+        "parse": measure(repeat, len(raw_events), lambda: parse(raw_events)),
+        "index": measure(
+            repeat, len(events), lambda: FlightSnapshot(events, version=1)
+        ),
+        "direct": measure(
+            repeat, len(filters), lambda: [direct.find_journeys(graph, f) for f in filters]
+        ),
+        "one_stop": measure(
+            repeat,
+            len(filters),
+            lambda: [one_stop.find_journeys(graph, f) for f in filters],
+        ),
+        "sort": measure(
+            repeat,
+            journey_count,
+            lambda: [sorted(r, key=journey_departure) for r in unsorted],
+        ),
+        "build_journeys": measure(
+            repeat,
+            len(filters),
+            lambda: loop.run_until_complete(build_all(service, filters)),
+        ),
+        "serialize_models": measure(
+            repeat,
+            journey_count,
+            lambda: loop.run_until_complete(serialize_models(results)),
+        ),
+        "serialize_encoder": measure(
+            repeat, journey_count, lambda: [encoder.encode(r) for r in results]
+        ),
+    }
+    loop.close()
+
+    return {
+        "benchmark": "pipeline",
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "cities": args.cities,
+            "events_per_day": args.events_per_day,
+            "days": args.days,
+            "hub_concentration": args.hub_concentration,
+            "hubs": args.hubs,
+            "seed": args.seed,
+            "searches": args.searches,
+            "repeat": args.repeat,
+        },
+        "events": len(raw_events),
+        "journeys": journey_count,
+        "stages": stages,
+    }
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Stages whose median got slower than the baseline by more than
+    ``tolerance``, printing every ratio along the way."""
+    if baseline.get("params") != report["params"]:
+        print("warning: baseline was run with different parameters", file=sys.stderr)
+    regressions = []
+    for name, stage in report["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if before is None or not before["median_seconds"]:
+            continue
+        ratio = stage["median_seconds"] / before["median_seconds"]
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:<18} {ratio:6.2f}x baseline{flag}")
+    return regressions
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"{report['events']} events, {report['journeys']} journeys per pass")
+    for name, stage in report["stages"].items():
+        print(
+            f"  {name:<18} median {stage['median_seconds'] * 1000:10.2f} ms  "
+            f"min {stage['min_seconds'] * 1000:10.2f} ms  "
+            f"{stage['median_us_per_item']:10.2f} us/item"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cities", type=int, default=100)
+    parser.add_argument("--events-per-day", type=int, default=20_000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument(
+        "--hub-concentration",
+        type=float,
+        default=0.0,
+        help="fraction of flights touching a hub city",
+    )
+    parser.add_argument("--hubs", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Response serialization: Pydantic models against the direct JourneyEncoder.
+
+The "models" path is what search_flights used to do: build a JourneyResponse
+per journey with from_dto, let FastAPI validate it against response_model and
+dump it with json. The encoder joins per-event fragments; it is measured with
+fragments rendered on demand (lazy) and pre-rendered by the snapshot loader.
+Run with:
+
+    python -m benchmarks.bench_serialization --journeys 100 1000 10000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from typing import List
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.v1.responses.journey_encoder import JourneyEncoder
+from app.api.v1.responses.journey_response import JourneyResponse
+from app.core.event_fragments import EventFragments
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.utils import fast_json
+from benchmarks.synthetic_feed import generate_raw_events
+
+RESPONSE_FIELD = create_model_field("response", List[JourneyResponse])
+
+
+def model_response(journeys) -> bytes:
+    content = asyncio.run(
+        serialize_response(
+            field=RESPONSE_FIELD,
+            response_content=list(map(JourneyResponse.from_dto, journeys)),
+        )
+    )
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def best_of(repeat: int, func):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--journeys", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    events = list(
+        map(
+            FlightEventDTO.from_dict,
+            generate_raw_events(events_per_day=max(args.journeys) * 2, days=1),
+        )
+    )
+    encoder_name = "orjson" if fast_json.orjson is not None else "json"
+    prerendered = JourneyEncoder(EventFragments(events))
+    for count in args.journeys:
+        journeys = [
+            {"connections": 1, "path": [events[2 * i], events[2 * i + 1]]}
+            for i in range(count)
+        ]
+        models = best_of(args.repeat, lambda: model_response(journeys))
+        lazy = best_of(args.repeat, lambda: JourneyEncoder().encode(journeys))
+        warm = best_of(args.repeat, lambda: prerendered.encode(journeys))
+        print(
+            f"{count:>6} journeys  models {models * 1000:9.2f} ms  "
+            f"lazy {lazy * 1000:8.2f} ms  pre-rendered {warm * 1000:8.2f} ms "
+            f"({encoder_name})"
+        )
+
+
+if __name__ == "__main__":
+    main()
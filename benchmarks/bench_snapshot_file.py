@@ -0,0 +1,85 @@
+"""
+Warm start from the on-disk snapshot file vs parsing the JSON feed.
+
+Encodes a synthetic feed both as the upstream JSON array and as a snapshot
+file, then times getting a FlightGraph from each: streaming JSON parse plus
+FlightEventDTO.from_dict, and memory-mapping the file plus decoding its
+columns. Network time is not included. Run with:
+
+    python -m benchmarks.bench_snapshot_file --events 1000000
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+
+from app.core.flight_graph import FlightGraph
+from app.core.snapshot_file import SnapshotFile, write_snapshot_file
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.utils.json_stream import JSONArrayStreamParser
+from benchmarks.synthetic_feed import encode_feed, generate_raw_events
+
+
+def parse_feed(chunks) -> FlightGraph:
+    parser = JSONArrayStreamParser()
+    events = []
+    for chunk in chunks:
+        events.extend(map(FlightEventDTO.from_dict, parser.feed(chunk)))
+    events.extend(map(FlightEventDTO.from_dict, parser.close()))
+    return FlightGraph(events)
+
+
+def read_file(path: str) -> FlightGraph:
+    with SnapshotFile(path) as snapshot_file:
+        return FlightGraph(snapshot_file.events())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--cities", type=int, default=100)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    raw_events = list(
+        generate_raw_events(
+            num_cities=args.cities,
+            events_per_day=args.events // args.days,
+            days=args.days,
+        )
+    )
+    chunks = list(encode_feed(raw_events))
+    feed_bytes = sum(map(len, chunks))
+
+    started = time.perf_counter()
+    graph = parse_feed(chunks)
+    parse_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "flights.snapshot")
+        started = time.perf_counter()
+        write_snapshot_file(path, graph.events)
+        write_seconds = time.perf_counter() - started
+        file_bytes = os.path.getsize(path)
+        size = len(graph)
+        del graph
+        gc.collect()
+
+        started = time.perf_counter()
+        read_file(path)
+        read_seconds = time.perf_counter() - started
+
+    print(f"{size} events")
+    print(
+        f"  json feed      {feed_bytes / 2**20:8.1f} MiB  "
+        f"parse {parse_seconds * 1000:9.1f} ms"
+    )
+    print(
+        f"  snapshot file  {file_bytes / 2**20:8.1f} MiB  "
+        f"read  {read_seconds * 1000:9.1f} ms  write {write_seconds * 1000:9.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
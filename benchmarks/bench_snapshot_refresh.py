@@ -0,0 +1,90 @@
+"""
+Snapshot refresh time, full rebuild vs delta, at different churn rates.
+
+The feed is streamed from memory through the same path as a live refresh
+(FlightSnapshotCache._load), so parsing is included but network is not. For
+each churn rate a fraction of the events is changed (new arrival city) and
+the refresh is timed with SNAPSHOT_DELTA_ENABLED off and on. Run with:
+
+    python -m benchmarks.bench_snapshot_refresh --events 1000000 --churn 0 0.01 0.1
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from typing import List
+from unittest.mock import patch
+
+from app.services.flight_snapshot_cache import FlightSnapshotCache
+from benchmarks.synthetic_feed import city_codes, generate_raw_events
+
+
+class InMemoryFeed:
+    """Stands in for FlightEventAdapter, streaming a list of raw events."""
+
+    def __init__(self, raw_events: List[dict]):
+        self.raw_events = raw_events
+
+    async def stream_flight_events(self, on_event) -> int:
+        for raw_event in self.raw_events:
+            on_event(raw_event)
+        return len(self.raw_events)
+
+
+def churned(raw_events: List[dict], churn: float, cities: List[str]) -> List[dict]:
+    rng = random.Random(3)
+    feed = list(raw_events)
+    for i in rng.sample(range(len(feed)), int(len(feed) * churn)):
+        feed[i] = dict(feed[i], arrival_city=rng.choice(cities))
+    return feed
+
+
+def timed_refresh(raw_events: List[dict], feed: List[dict], delta: bool) -> float:
+    cache = FlightSnapshotCache(adapter=InMemoryFeed(raw_events))
+
+    async def refresh():
+        await cache.refresh()
+        cache.adapter.raw_events = feed
+        started = time.perf_counter()
+        await cache.refresh()
+        return time.perf_counter() - started
+
+    with patch(
+        "app.services.flight_snapshot_cache.ConfigVars.SNAPSHOT_DELTA_ENABLED", delta
+    ):
+        return asyncio.run(refresh())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--cities", type=int, default=100)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument(
+        "--churn", type=float, nargs="+", default=[0.0, 0.001, 0.01, 0.1]
+    )
+    args = parser.parse_args()
+
+    raw_events = list(
+        generate_raw_events(
+            num_cities=args.cities,
+            events_per_day=args.events // args.days,
+            days=args.days,
+        )
+    )
+    cities = city_codes(args.cities)
+
+    print(f"{len(raw_events)} events")
+    for churn in args.churn:
+        feed = churned(raw_events, churn, cities)
+        full = timed_refresh(raw_events, feed, delta=False)
+        delta = timed_refresh(raw_events, feed, delta=True)
+        print(
+            f"  churn {churn:6.1%}  full {full * 1000:9.1f} ms  "
+            f"delta {delta * 1000:9.1f} ms  ({full / delta:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+First page of a search against building the full result.
+
+Compares JourneyService.run_strategies, which builds and sorts every
+journey, with search_page for the first ``--limit`` journeys on the busiest
+route of a synthetic feed, with and without multi-stop search. The result
+cache is disabled so both paths do the search work. Run with:
+
+    python -m benchmarks.bench_top_k --events 200000 --limit 20
+"""
+import argparse
+import asyncio
+import time
+
+from collections import Counter
+from unittest.mock import patch
+
+from app.core.flight_graph import FlightGraph
+from app.core.flight_snapshot import FlightSnapshot
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.services.journey_result_cache import JourneyResultCache
+from app.services.journey_service import JourneyService
+from benchmarks.synthetic_feed import generate_raw_events
+
+
+def best_of(repeat: int, func):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--cities", type=int, default=30)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    graph = FlightGraph(
+        map(
+            FlightEventDTO.from_dict,
+            generate_raw_events(
+                num_cities=args.cities,
+                events_per_day=args.events // args.days,
+                days=args.days,
+            ),
+        )
+    )
+    snapshot = FlightSnapshot(graph, version=1)
+    day = graph.events[0].departure_date
+    routes = Counter((e.departure_city, e.arrival_city) for e in graph.departures_on(day))
+    (origin, destination), _ = routes.most_common(1)[0]
+    flight_filter = FlightFilterDTO(day, origin, destination)
+
+    loop = asyncio.new_event_loop()
+    print(f"{len(graph)} events, {origin}->{destination}, limit {args.limit}")
+    for max_connections in (1, 2):
+        with patch("app.services.journey_service.ConfigVars.MAX_CONNECTIONS", max_connections):
+            service = JourneyService(result_cache=JourneyResultCache(max_entries=0))
+        service.get_snapshot = lambda: asyncio.sleep(0, snapshot)
+        full, journeys = best_of(
+            args.repeat,
+            lambda: loop.run_until_complete(service.run_strategies(snapshot, flight_filter)),
+        )
+        page, _ = best_of(
+            args.repeat,
+            lambda: loop.run_until_complete(service.search_page(flight_filter, args.limit)),
+        )
+        print(
+            f"  max_connections={max_connections}  full {full * 1000:9.2f} ms "
+            f"({len(journeys)} journeys)  first page {page * 1000:8.2f} ms"
+        )
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
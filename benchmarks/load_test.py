@@ -0,0 +1,333 @@
+"""
+End-to-end load test of the API against a local mock upstream.
+
+Starts benchmarks.mock_upstream and the app (uvicorn main:app) as
+subprocesses on free local ports, points the app at the mock through
+FLIGHT_EVENTS_API_URL, then fires a weighted mix of searches at it from
+``--concurrency`` clients for ``--duration`` seconds per level. Throughput,
+error counts and p50/p95/p99 latency are reported per request kind and
+overall, plus the latency of the first (cold) search. Needs nothing but the
+local machine. Run with:
+
+    python -m benchmarks.load_test --concurrency 1 16 64 --duration 20 \\
+        --mix search=6,page=2,ndjson=1,batch=1 --latency-ms 200 \\
+        --app-env STRATEGY_WORKERS=4 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.bench_concurrent_search import percentile
+from benchmarks.mock_upstream import add_feed_arguments
+from benchmarks.synthetic_feed import city_codes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FEED_START = date(2024, 9, 1)
+KINDS = ("search", "page", "ndjson", "batch")
+
+# (kind, HTTP status or 0 for a client error, seconds)
+Sample = Tuple[str, int, float]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """Parses "search=6,batch=1" into request-kind weights."""
+    weights = {}
+    for item in mix.split(","):
+        kind, _, weight = item.strip().partition("=")
+        if kind not in KINDS:
+            raise ValueError(f"unknown request kind {kind!r}, expected one of {KINDS}")
+        weights[kind] = int(weight or 1)
+    return weights
+
+
+def start_process(name: str, command: List[str], env: Dict[str, str], log_dir: str):
+    log = open(os.path.join(log_dir, f"{name}.log"), "wb")
+    return subprocess.Popen(
+        command, cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+def stop_process(process: subprocess.Popen):
+    if process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+async def wait_ready(
+    client: httpx.AsyncClient, url: str, process: subprocess.Popen, timeout: float
+):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with status {process.returncode}")
+        try:
+            if (await client.get(url)).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+class SearchMix:
+    """Random requests of the configured kinds over the feed's routes."""
+
+    def __init__(self, weights: Dict[str, int], cities: List[str], days: int, seed: int):
+        self.kinds = list(weights)
+        self.weights = list(weights.values())
+        self.cities = cities
+        self.days = days
+        self.rng = random.Random(seed)
+
+    def route(self) -> Dict[str, str]:
+        origin, destination = self.rng.sample(self.cities, 2)
+        day = FEED_START + timedelta(days=self.rng.randrange(self.days))
+        return {"date": day.isoformat(), "from": origin, "to": destination}
+
+    async def send(self, client: httpx.AsyncClient) -> Sample:
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        params = self.route()
+        started = time.perf_counter()
+        try:
+            if kind == "batch":
+                start = date.fromisoformat(params["date"])
+                response = await client.post(
+                    "/v1/journeys/search/batch",
+                    json={
+                        "date_range": {
+                            "start": params["date"],
+                            "end": (start + timedelta(days=2)).isoformat(),
+                            "from": params["from"],
+                            "to": params["to"],
+                        }
+                    },
+                )
+            elif kind == "page":
+                response = await client.get(
+                    "/v1/journeys/search", params={**params, "limit": 20}
+                )
+            elif kind == "ndjson":
+                response = await client.get(
+                    "/v1/journeys/search",
+                    params=params,
+                    headers={"Accept": "application/x-ndjson"},
+                )
+            else:
+                response = await client.get("/v1/journeys/search", params=params)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 0
+        return kind, status, time.perf_counter() - started
+
+
+async def run_clients(
+    client: httpx.AsyncClient, mix: SearchMix, concurrency: int, duration: float
+) -> Tuple[List[Sample], float]:
+    samples: List[Sample] = []
+    deadline = time.monotonic() + duration
+
+    async def run_client():
+        while time.monotonic() < deadline:
+            samples.append(await mix.send(client))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_client() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples: List[Sample], wall_seconds: float) -> Dict[str, Dict]:
+    groups: Dict[str, List[Sample]] = {"all": samples}
+    groups.update((kind, []) for kind in KINDS)
+    for sample in samples:
+        groups[sample[0]].append(sample)
+
+    summary = {}
+    for kind, group in groups.items():
+        latencies = [seconds for _, _, seconds in group]
+        errors = sum(1 for _, status, _ in group if not 200 <= status < 300)
+        summary[kind] = {
+            "requests": len(group),
+            "errors": errors,
+            "throughput_rps": len(group) / wall_seconds if wall_seconds else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1000 if latencies else None,
+            "p95_ms": percentile(latencies, 0.95) * 1000 if latencies else None,
+            "p99_ms": percentile(latencies, 0.99) * 1000 if latencies else None,
+        }
+    return summary
+
+
+def print_level(concurrency: int, summary: Dict[str, Dict]):
+    print(f"\nconcurrency {concurrency}")
+    for kind, stats in summary.items():
+        if not stats["requests"]:
+            continue
+        print(
+            f"  {kind:<7} {stats['requests']:7d} req  {stats['errors']:5d} err  "
+            f"{stats['throughput_rps']:8.1f} req/s  "
+            f"p50 {stats['p50_ms']:8.1f}  p95 {stats['p95_ms']:8.1f}  "
+            f"p99 {stats['p99_ms']:8.1f} ms"
+        )
+
+
+async def run(args, app_url: str, upstream_url: str, processes) -> Dict:
+    mix = SearchMix(
+        parse_mix(args.mix), city_codes(args.cities), args.days, args.seed + 1
+    )
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 10)
+    async with httpx.AsyncClient(
+        base_url=app_url, timeout=args.timeout, limits=limits
+    ) as client:
+        await wait_ready(client, f"{upstream_url}/health", processes[0], 60)
+        await wait_ready(client, f"{app_url}/openapi.json", processes[1], 60)
+
+        _, status, cold_seconds = await SearchMix(
+            {"search": 1}, mix.cities, args.days, args.seed
+        ).send(client)
+        print(f"cold search: HTTP {status} in {cold_seconds * 1000:.1f} ms")
+        if args.warmup:
+            await run_clients(client, mix, max(args.concurrency), args.warmup)
+
+        levels = []
+        for concurrency in args.concurrency:
+            samples, wall = await run_clients(client, mix, concurrency, args.duration)
+            summary = summarize(samples, wall)
+            print_level(concurrency, summary)
+            levels.append({"concurrency": concurrency, "kinds": summary})
+
+        try:
+            upstream = (await client.get(f"{upstream_url}/stats")).json()
+        except httpx.HTTPError:
+            upstream = None
+
+    return {
+        "benchmark": "load_test",
+        "params": {
+            key: getattr(args, key)
+            for key in (
+                "cities",
+                "events_per_day",
+                "days",
+                "hub_concentration",
+                "seed",
+                "latency_ms",
+                "jitter_ms",
+                "error_rate",
+                "workers",
+                "mix",
+                "duration",
+                "app_env",
+            )
+        },
+        "cold_search": {"status": status, "ms": cold_seconds * 1000},
+        "upstream": upstream,
+        "levels": levels,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    add_feed_arguments(parser)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--mix", default="search=6,page=2,ndjson=1,batch=1")
+    parser.add_argument(
+        "--app-env",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="extra environment for the app, e.g. STRATEGY_WORKERS=4",
+    )
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+    parse_mix(args.mix)
+
+    upstream_port, app_port = free_port(), free_port()
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+
+    upstream_command = [
+        sys.executable,
+        "-m",
+        "benchmarks.mock_upstream",
+        "--port",
+        str(upstream_port),
+    ]
+    for name in (
+        "cities",
+        "events_per_day",
+        "days",
+        "hub_concentration",
+        "seed",
+        "latency_ms",
+        "jitter_ms",
+        "error_rate",
+    ):
+        upstream_command += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+
+    app_env = dict(os.environ, FLIGHT_EVENTS_API_URL=f"{upstream_url}/flight-events")
+    app_env.update(item.split("=", 1) for item in args.app_env)
+    app_command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(app_port),
+        "--workers",
+        str(args.workers),
+        "--log-level",
+        "warning",
+    ]
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        processes = [
+            start_process("upstream", upstream_command, dict(os.environ), log_dir),
+            start_process("app", app_command, app_env, log_dir),
+        ]
+        try:
+            report = asyncio.run(run(args, app_url, upstream_url, processes))
+        except RuntimeError:
+            for name in ("upstream", "app"):
+                with open(os.path.join(log_dir, f"{name}.log"), "rb") as log:
+                    sys.stderr.write(log.read().decode(errors="replace")[-2000:])
+            raise
+        finally:
+            for process in reversed(processes):
+                stop_process(process)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Local stand-in for the flight-events API, for load tests.
+
+Serves a seeded synthetic feed at ``/flight-events`` as a streamed JSON
+array, after a configurable latency and failing a configurable fraction of
+requests with HTTP 503. ``/health`` answers as soon as the server is up and
+``/stats`` reports how many feed requests were served and failed. Run with:
+
+    python -m benchmarks.mock_upstream --port 8001 --events-per-day 20000 \\
+        --latency-ms 200 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+
+from typing import List
+
+import uvicorn
+
+from benchmarks.synthetic_feed import encode_feed, generate_raw_events
+
+
+class MockUpstream:
+    """Minimal ASGI app; the feed is encoded once at startup."""
+
+    def __init__(
+        self,
+        chunks: List[bytes],
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.chunks = chunks
+        self.size = sum(map(len, chunks))
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.served = 0
+        self.failed = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        path = scope["path"]
+        if path == "/health":
+            await self.respond(send, 200, b'{"status":"ok"}')
+        elif path == "/stats":
+            await self.respond(
+                send,
+                200,
+                json.dumps(
+                    {"served": self.served, "failed": self.failed, "bytes": self.size}
+                ).encode(),
+            )
+        elif path == "/flight-events":
+            await self.feed(send)
+        else:
+            await self.respond(send, 404, b'{"detail":"Not Found"}')
+
+    async def feed(self, send):
+        delay = self.latency_seconds + self.rng.uniform(0, self.jitter_seconds)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.rng.random() < self.error_rate:
+            self.failed += 1
+            await self.respond(send, 503, b'{"detail":"Service Unavailable"}')
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(self.size).encode()),
+                ],
+            }
+        )
+        for chunk in self.chunks:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+        self.served += 1
+
+    @staticmethod
+    async def respond(send, status: int, body: bytes):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def add_feed_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--cities", type=int, default=50)
+    parser.add_argument("--events-per-day", type=int, default=5_000)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--hub-concentration", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    add_feed_arguments(parser)
+    args = parser.parse_args()
+
+    chunks = list(
+        encode_feed(
+            generate_raw_events(
+                num_cities=args.cities,
+                events_per_day=args.events_per_day,
+                days=args.days,
+                seed=args.seed,
+                hub_concentration=args.hub_concentration,
+            )
+        )
+    )
+    app = MockUpstream(
+        chunks,
+        latency_seconds=args.latency_ms / 1000,
+        jitter_seconds=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
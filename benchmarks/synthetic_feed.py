@@ -0,0 +1,79 @@
+import json
+import random
+
+from datetime import datetime, timedelta
+from string import ascii_uppercase
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+def city_codes(num_cities: int) -> List[str]:
+    codes = []
+    for a in ascii_uppercase:
+        for b in ascii_uppercase:
+            for c in ascii_uppercase:
+                codes.append(a + b + c)
+                if len(codes) == num_cities:
+                    return codes
+    raise ValueError("num_cities must be at most 17576")
+
+
+def generate_raw_events(
+    num_cities: int = 50,
+    events_per_day: int = 1000,
+    days: int = 7,
+    seed: int = 42,
+    start: datetime = datetime(2024, 9, 1),
+    hub_concentration: float = 0.0,
+    num_hubs: int = 3,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields flight events shaped like the upstream feed, deterministically for
+    a given seed.
+
+    With ``hub_concentration`` set, that fraction of the flights leaves from
+    or lands at one of the first ``num_hubs`` cities, like a hub-and-spoke
+    network; the rest connect two random cities.
+    """
+    rng = random.Random(seed)
+    cities = city_codes(num_cities)
+    hubs = cities[: min(num_hubs, num_cities - 1)]
+    for day in range(days):
+        day_start = start + timedelta(days=day)
+        for i in range(events_per_day):
+            if hub_concentration and rng.random() < hub_concentration:
+                hub = rng.choice(hubs)
+                spoke = rng.choice(cities)
+                while spoke == hub:
+                    spoke = rng.choice(cities)
+                origin, destination = (
+                    (hub, spoke) if rng.random() < 0.5 else (spoke, hub)
+                )
+            else:
+                origin, destination = rng.sample(cities, 2)
+            departure = day_start + timedelta(minutes=rng.randrange(0, 24 * 60, 5))
+            arrival = departure + timedelta(minutes=rng.randrange(45, 14 * 60, 5))
+            yield {
+                "flight_number": f"{origin[:2]}{(day * events_per_day + i) % 10000}",
+                "departure_city": origin,
+                "arrival_city": destination,
+                "departure_datetime": departure.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "arrival_datetime": arrival.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            }
+
+
+def encode_feed(
+    raw_events: Iterable[Dict[str, Any]], events_per_chunk: int = 500
+) -> Iterator[bytes]:
+    """Encodes events as one JSON array, split into chunks like a network body."""
+    yield b"["
+    batch = []
+    first = True
+    for raw_event in raw_events:
+        batch.append(json.dumps(raw_event))
+        if len(batch) == events_per_chunk:
+            yield (("" if first else ",") + ",".join(batch)).encode()
+            batch = []
+            first = False
+    if batch:
+        yield (("" if first else ",") + ",".join(batch)).encode()
+    yield b"]"
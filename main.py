@@ -1,6 +1,23 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from app.api import metrics
 from app.api.v1.endpoints import journeys
+from app.services.flight_snapshot_cache import flight_snapshot_cache
+from app.services.journey_service import JourneyService
 
-app = FastAPI(title="Flight API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    flight_snapshot_cache.adapter.get_client()
+    service = JourneyService()
+    flight_snapshot_cache.add_listener(service.on_snapshot)
+    yield
+    flight_snapshot_cache.remove_listener(service.on_snapshot)
+    service.hot_routes.clear()
+    await flight_snapshot_cache.adapter.aclose()
+
+
+app = FastAPI(title="Flight API", version="1.0.0", lifespan=lifespan)
 
 app.include_router(journeys.router, prefix="/v1")
+app.include_router(metrics.router)
@@ -1,8 +1,10 @@
 import unittest
 import asyncio
+import json
 import httpx
 
 from tests.commons.test_helper import vcr
+from tests.commons.factorie import create_flight_event_dict, generate_flight_event_json
 from unittest.mock import patch, Mock
 from app.adapters.flight_event_adapter import FlightEventAdapter
 
@@ -41,10 +43,9 @@ class TestFlightEventAdapter(unittest.TestCase):
         )
 
     @patch("app.adapters.flight_event_adapter.report_error")
-    @patch("app.adapters.flight_event_adapter.httpx.AsyncClient")
-    def test_request_error(self, mock_async_client_cls, mock_report_error):
-        mock_client = mock_async_client_cls.return_value.__aenter__.return_value
-        mock_client.get.side_effect = httpx.RequestError("Connection failed")
+    @patch("app.adapters.flight_event_adapter.httpx.AsyncClient.get")
+    def test_request_error(self, mock_get, mock_report_error):
+        mock_get.side_effect = httpx.RequestError("Connection failed")
 
         result = self.loop.run_until_complete(self.adapter.fetch_flight_events())
 
@@ -54,12 +55,11 @@ class TestFlightEventAdapter(unittest.TestCase):
         )
 
     @patch("app.adapters.flight_event_adapter.report_error")
-    @patch("app.adapters.flight_event_adapter.httpx.AsyncClient")
-    def test_http_status_error(self, mock_async_client_cls, mock_report_error):
-        mock_client = mock_async_client_cls.return_value.__aenter__.return_value
+    @patch("app.adapters.flight_event_adapter.httpx.AsyncClient.get")
+    def test_http_status_error(self, mock_get, mock_report_error):
         response_mock = Mock()
         response_mock.status_code = 500
-        mock_client.get.side_effect = httpx.HTTPStatusError(
+        mock_get.side_effect = httpx.HTTPStatusError(
             "Internal Server Error", request=None, response=response_mock
         )
 
@@ -71,10 +71,9 @@ class TestFlightEventAdapter(unittest.TestCase):
         )
 
     @patch("app.adapters.flight_event_adapter.report_error")
-    @patch("app.adapters.flight_event_adapter.httpx.AsyncClient")
-    def test_unexpected_exception(self, mock_async_client_cls, mock_report_error):
-        mock_client = mock_async_client_cls.return_value.__aenter__.return_value
-        mock_client.get.side_effect = Exception("Something went wrong")
+    @patch("app.adapters.flight_event_adapter.httpx.AsyncClient.get")
+    def test_unexpected_exception(self, mock_get, mock_report_error):
+        mock_get.side_effect = Exception("Something went wrong")
 
         result = self.loop.run_until_complete(self.adapter.fetch_flight_events())
 
@@ -84,5 +83,182 @@ class TestFlightEventAdapter(unittest.TestCase):
         )
 
 
+class CountingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, payload):
+        self.payload = payload
+        self.requests = 0
+        self.closed = False
+
+    async def handle_async_request(self, request):
+        self.requests += 1
+        return httpx.Response(200, json=self.payload, request=request)
+
+    async def aclose(self):
+        self.closed = True
+
+
+class LocalFeedServer:
+    """HTTP/1.1 keep-alive server on localhost serving ``payload`` as JSON
+    and counting the TCP connections opened to it."""
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload).encode()
+        self.connections = 0
+        self.requests = 0
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self.serve, "127.0.0.1", 0)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/flight-events"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def serve(self, reader, writer):
+        self.connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                self.requests += 1
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(self.body), self.body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+class TestFlightEventAdapterClientPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.transport = CountingTransport([create_flight_event_dict()])
+        self.adapter = FlightEventAdapter(transport=self.transport)
+
+    async def asyncTearDown(self):
+        await self.adapter.aclose()
+
+    async def test_client_is_reused_across_fetches(self):
+        client = self.adapter.get_client()
+
+        first = await self.adapter.fetch_flight_events()
+        second = await self.adapter.fetch_flight_events()
+
+        self.assertEqual(first, second)
+        self.assertIs(self.adapter.get_client(), client)
+        self.assertEqual(self.transport.requests, 2)
+        self.assertFalse(self.transport.closed)
+
+    async def test_fetches_reuse_one_connection(self):
+        server = LocalFeedServer([create_flight_event_dict()])
+        url = await server.start()
+        self.addAsyncCleanup(server.stop)
+        adapter = FlightEventAdapter(base_url=url)
+        self.addAsyncCleanup(adapter.aclose)
+
+        for _ in range(3):
+            self.assertEqual(len(await adapter.fetch_flight_events()), 1)
+        streamed = await adapter.stream_flight_events(lambda raw_event: None)
+
+        self.assertEqual(streamed, 1)
+        self.assertEqual(server.requests, 4)
+        self.assertEqual(server.connections, 1)
+
+    async def test_aclose_closes_client_and_transport(self):
+        client = self.adapter.get_client()
+        await self.adapter.fetch_flight_events()
+
+        await self.adapter.aclose()
+
+        self.assertTrue(client.is_closed)
+        self.assertTrue(self.transport.closed)
+
+    async def test_client_is_recreated_after_close(self):
+        client = self.adapter.get_client()
+        await self.adapter.aclose()
+
+        self.assertIsNot(self.adapter.get_client(), client)
+
+    @patch("app.adapters.flight_event_adapter.ConfigVars.HTTP2_ENABLED", False)
+    async def test_http2_can_be_disabled(self):
+        self.assertFalse(self.adapter.http2_enabled())
+
+    @patch("app.adapters.flight_event_adapter.find_spec", return_value=None)
+    @patch("app.adapters.flight_event_adapter.report_info")
+    async def test_http2_falls_back_without_h2(self, mock_report_info, _):
+        self.assertFalse(self.adapter.http2_enabled())
+        mock_report_info.assert_called_once()
+
+
+class TestFlightEventAdapterStreaming(unittest.IsolatedAsyncioTestCase):
+    def build_adapter(self, handler):
+        return FlightEventAdapter(transport=httpx.MockTransport(handler))
+
+    async def asyncTearDown(self):
+        await self.adapter.aclose()
+
+    async def test_stream_hands_every_event_to_callback(self):
+        raw_events = generate_flight_event_json()
+        payload = json.dumps(raw_events).encode()
+
+        async def chunks():
+            for i in range(0, len(payload), 64):
+                yield payload[i : i + 64]
+
+        self.adapter = self.build_adapter(
+            lambda request: httpx.Response(200, content=chunks())
+        )
+        received = []
+
+        count = await self.adapter.stream_flight_events(received.append)
+
+        self.assertEqual(count, len(raw_events))
+        self.assertEqual(received, raw_events)
+
+    async def test_base_url_overrides_config(self):
+        requested = []
+
+        def handler(request):
+            requested.append(str(request.url))
+            return httpx.Response(200, json=[])
+
+        self.adapter = FlightEventAdapter(
+            transport=httpx.MockTransport(handler),
+            base_url="http://127.0.0.1:8001/flight-events",
+        )
+
+        await self.adapter.stream_flight_events(lambda raw_event: None)
+
+        self.assertEqual(requested, ["http://127.0.0.1:8001/flight-events"])
+
+    @patch("app.adapters.flight_event_adapter.report_error")
+    async def test_stream_http_status_error(self, mock_report_error):
+        self.adapter = self.build_adapter(lambda request: httpx.Response(503))
+
+        count = await self.adapter.stream_flight_events(lambda raw_event: None)
+
+        self.assertIsNone(count)
+        self.assertTrue(
+            mock_report_error.call_args[0][0].startswith(
+                "HTTP 503 error received from flight events API"
+            )
+        )
+
+    @patch("app.adapters.flight_event_adapter.report_error")
+    async def test_stream_malformed_payload(self, mock_report_error):
+        self.adapter = self.build_adapter(
+            lambda request: httpx.Response(200, content=b'[{"flight_number": ')
+        )
+
+        count = await self.adapter.stream_flight_events(lambda raw_event: None)
+
+        self.assertIsNone(count)
+        self.assertTrue(
+            mock_report_error.call_args[0][0].startswith(
+                "Unexpected error when fetching flight events"
+            )
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
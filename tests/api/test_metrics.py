@@ -0,0 +1,48 @@
+import unittest
+from fastapi.testclient import TestClient
+from tests.commons.factorie import generate_flight_event_json, stream_flight_events
+from unittest.mock import patch, AsyncMock
+from app.services.flight_snapshot_cache import flight_snapshot_cache
+
+from main import app
+
+
+class TestMetricsAPI(unittest.TestCase):
+    def setUp(self):
+        flight_snapshot_cache.clear()
+        self.client = TestClient(app)
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    def test_metrics_report_search_pipeline(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        self.client.get(
+            "/v1/journeys/search",
+            params={"date": "2024-09-13", "from": "BUE", "to": "MAD"},
+        )
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        text = response.text
+        for line in (
+            "# TYPE flights_api_stage_seconds histogram",
+            'flights_api_stage_seconds_count{stage="index"}',
+            'flights_api_stage_seconds_count{stage="lookup"}',
+            'flights_api_stage_seconds_count{stage="serialize"}',
+            'flights_api_strategy_seconds_count{strategy="JourneyDirectFlights"}',
+            'flights_api_searches_total{source="computed"}',
+            "flights_api_snapshot_events ",
+            "flights_api_result_cache_entries ",
+        ):
+            self.assertIn(line, text)
+
+    def test_metrics_are_not_in_the_openapi_schema(self):
+        paths = self.client.get("/openapi.json").json()["paths"]
+        self.assertNotIn("/metrics", paths)
+
+
+if __name__ == "__main__":
+    unittest.main()
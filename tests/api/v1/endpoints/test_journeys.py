@@ -1,14 +1,24 @@
+import json
+import os
+import tempfile
 import unittest
+from datetime import date
 from fastapi.testclient import TestClient
-from tests.commons.factorie import generate_flight_event_json
+from tests.commons.factorie import generate_flight_event_json, stream_flight_events
 from unittest.mock import patch, AsyncMock
 from tests.commons.test_helper import vcr
+from app.api.v1.endpoints.journeys import journey_encoder
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.services.flight_snapshot_cache import FlightSnapshotCache, flight_snapshot_cache
+from app.services.journey_result_cache import JourneyResultCache
+from app.services.journey_service import JourneyService
 
 from main import app
 
 
 class TestJourneySearchAPI(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
+        flight_snapshot_cache.clear()
         self.client = TestClient(app)
         self.base_url = "/v1/journeys/search"
 
@@ -41,11 +51,11 @@ class TestJourneySearchAPI(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(response.json()), 0)
 
     @patch(
-        "app.adapters.flight_event_adapter.FlightEventAdapter.fetch_flight_events",
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
         new_callable=AsyncMock,
     )
-    async def test_valid_request_should_return_results_with_mock_data(self, mock_fetch):
-        mock_fetch.return_value = generate_flight_event_json()
+    async def test_valid_request_should_return_results_with_mock_data(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
 
         response = self.client.get(
             self.base_url, params={"date": "2024-09-13", "from": "BUE", "to": "MAD"}
@@ -67,7 +77,7 @@ class TestJourneySearchAPI(unittest.IsolatedAsyncioTestCase):
 
         self.assertTrue(all(j["path"][0]["from"] == "BUE" for j in results))
         self.assertTrue(all(j["path"][-1]["to"] == "MAD" for j in results))
-        mock_fetch.assert_awaited_once()
+        mock_stream.assert_awaited_once()
 
     def test_invalid_date_format_should_fail(self):
         response = self.client.get(
@@ -97,3 +107,353 @@ class TestJourneySearchAPI(unittest.IsolatedAsyncioTestCase):
     def test_missing_params_should_fail(self):
         response = self.client.get(self.base_url)
         self.assertEqual(response.status_code, 422)
+
+    async def test_journeys_are_encoded_with_the_serving_snapshot(self):
+        cache = FlightSnapshotCache(ttl_seconds=60)
+        cache.adapter.stream_flight_events = AsyncMock(
+            side_effect=stream_flight_events(generate_flight_event_json())
+        )
+        service = JourneyService(
+            snapshot_cache=cache, result_cache=JourneyResultCache(max_entries=0)
+        )
+        journeys = await service.build_journeys(
+            FlightFilterDTO(date(2024, 9, 13), "BUE", "MAD")
+        )
+        served = cache.snapshot
+        cache.clear()
+        await cache.get_snapshot()
+
+        encoder = journey_encoder(service)
+        encoded = encoder.encode(journeys)
+
+        self.assertIs(encoder.fragments, served.fragments)
+        self.assertEqual(len(served.fragments), len(served.events))
+        self.assertEqual(len(json.loads(encoded)), len(journeys))
+
+
+class TestJourneySearchNDJSON(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        flight_snapshot_cache.clear()
+        self.client = TestClient(app)
+        self.base_url = "/v1/journeys/search"
+        self.params = {"date": "2024-09-13", "from": "BUE", "to": "MAD"}
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_ndjson_lines_match_json_response(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+
+        expected = self.client.get(self.base_url, params=self.params).json()
+        response = self.client.get(
+            self.base_url,
+            params=self.params,
+            headers={"Accept": "application/x-ndjson"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        lines = response.text.splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual([json.loads(line) for line in lines], expected)
+
+    @patch("app.api.v1.endpoints.journeys.ConfigVars.STREAM_MAX_JOURNEYS", 3)
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_ndjson_stream_stops_at_server_limit(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+
+        response = self.client.get(
+            self.base_url,
+            params=self.params,
+            headers={"Accept": "application/x-ndjson"},
+        )
+
+        self.assertEqual(len(response.text.splitlines()), 3)
+
+
+class TestJourneySearchPagination(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        flight_snapshot_cache.clear()
+        self.client = TestClient(app)
+        self.base_url = "/v1/journeys/search"
+        self.params = {"date": "2024-09-13", "from": "BUE", "to": "MAD"}
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_cursor_walks_through_all_results(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        expected = self.client.get(self.base_url, params=self.params).json()
+
+        first = self.client.get(self.base_url, params={**self.params, "limit": 3})
+        cursor = first.headers["X-Next-Cursor"]
+        second = self.client.get(
+            self.base_url, params={**self.params, "limit": 3, "cursor": cursor}
+        )
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(first.json()), 3)
+        self.assertNotIn("X-Next-Cursor", second.headers)
+        self.assertEqual(first.json() + second.json(), expected)
+
+    def test_malformed_cursor_should_fail(self):
+        response = self.client.get(
+            self.base_url, params={**self.params, "cursor": "not-a-cursor"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_limit_out_of_range_should_fail(self):
+        response = self.client.get(self.base_url, params={**self.params, "limit": 0})
+        self.assertEqual(response.status_code, 422)
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_cursor_from_old_snapshot_is_gone(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        first = self.client.get(self.base_url, params={**self.params, "limit": 1})
+        flight_snapshot_cache.clear()
+
+        response = self.client.get(
+            self.base_url,
+            params={**self.params, "limit": 1, "cursor": first.headers["X-Next-Cursor"]},
+        )
+        self.assertEqual(response.status_code, 410)
+
+
+class TestProfiledJourneySearchAPI(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        flight_snapshot_cache.clear()
+        self.client = TestClient(app)
+        self.base_url = "/v1/journeys/search"
+        self.params = {"date": "2024-09-13", "from": "BUE", "to": "MAD"}
+
+    def test_profiling_is_forbidden_without_allowlist(self):
+        response = self.client.get(
+            self.base_url, params=self.params, headers={"X-Profile-Token": "secret"}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    @patch("app.utils.profiling.ConfigVars.PROFILING_TOKENS", "secret")
+    def test_unknown_token_is_forbidden(self):
+        response = self.client.get(self.base_url, params={**self.params, "profile": "x"})
+        self.assertEqual(response.status_code, 403)
+
+    @patch("app.utils.profiling.ConfigVars.PROFILING_TOKENS", "other, secret")
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_allowed_token_returns_breakdown(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+
+        response = self.client.get(
+            self.base_url, params=self.params, headers={"X-Profile-Token": "secret"}
+        )
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual(report["journeys"], 4)
+        self.assertIn("serialize", report["breakdown"]["stage"])
+        self.assertIn("OneStopJourneyStrategy", report["breakdown"]["strategy"])
+        self.assertGreater(len(report["top_functions"]), 0)
+
+    @patch("app.utils.profiling.ConfigVars.PROFILING_TOKENS", "secret")
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_report_is_written_to_output_dir(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+
+        with tempfile.TemporaryDirectory() as directory, patch(
+            "app.api.v1.endpoints.journeys.ConfigVars.PROFILE_OUTPUT_DIR", directory
+        ):
+            response = self.client.get(
+                self.base_url, params={**self.params, "profile": "secret"}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()), 4)
+            path = response.headers["X-Profile-File"]
+            with open(path) as f:
+                self.assertEqual(json.load(f)["journeys"], 4)
+            self.assertTrue(os.path.exists(path[: -len(".json")] + ".prof"))
+
+
+    @patch("app.utils.profiling.ConfigVars.PROFILING_TOKENS", "secret")
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_profile_bypasses_result_cache(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        self.client.get(self.base_url, params=self.params)
+
+        response = self.client.get(
+            self.base_url, params={**self.params, "profile": "secret"}
+        )
+
+        report = response.json()
+        self.assertEqual(report["mode"], "json")
+        self.assertIn("OneStopJourneyStrategy", report["breakdown"]["strategy"])
+
+    @patch("app.utils.profiling.ConfigVars.PROFILING_TOKENS", "secret")
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_profile_keeps_the_requested_page(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+
+        response = self.client.get(
+            self.base_url, params={**self.params, "limit": 1, "profile": "secret"}
+        )
+
+        report = response.json()
+        self.assertEqual(report["mode"], "page")
+        self.assertEqual(report["journeys"], 1)
+        self.assertIn("X-Next-Cursor", response.headers)
+
+    @patch("app.utils.profiling.ConfigVars.PROFILING_TOKENS", "secret")
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_profiled_ndjson_is_written_as_ndjson(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+
+        with tempfile.TemporaryDirectory() as directory, patch(
+            "app.api.v1.endpoints.journeys.ConfigVars.PROFILE_OUTPUT_DIR", directory
+        ):
+            response = self.client.get(
+                self.base_url,
+                params={**self.params, "profile": "secret"},
+                headers={"Accept": "application/x-ndjson"},
+            )
+            self.assertTrue(
+                response.headers["content-type"].startswith("application/x-ndjson")
+            )
+            self.assertEqual(len(response.text.splitlines()), 4)
+            with open(response.headers["X-Profile-File"]) as f:
+                self.assertEqual(json.load(f)["mode"], "ndjson")
+
+class TestBatchJourneySearchAPI(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        flight_snapshot_cache.clear()
+        self.client = TestClient(app)
+        self.base_url = "/v1/journeys/search/batch"
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_queries_are_answered_in_order(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+
+        response = self.client.post(
+            self.base_url,
+            json={
+                "queries": [
+                    {"date": "2024-09-13", "from": "BUE", "to": "MAD"},
+                    {"date": "2024-09-13", "from": "MAD", "to": "BUE"},
+                ]
+            },
+        )
+        results = response.json()["results"]
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            [(r["date"], r["from"], r["to"]) for r in results],
+            [("2024-09-13", "BUE", "MAD"), ("2024-09-13", "MAD", "BUE")],
+        )
+        self.assertEqual(len(results[0]["journeys"]), 4)
+        self.assertEqual(results[1]["journeys"], [])
+        self.assertEqual(results[0]["journeys"][0]["path"][0]["from"], "BUE")
+        mock_stream.assert_awaited_once()
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_date_range_expands_to_one_result_per_day(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+
+        response = self.client.post(
+            self.base_url,
+            json={
+                "date_range": {
+                    "start": "2024-09-12",
+                    "end": "2024-09-14",
+                    "from": "BUE",
+                    "to": "MAD",
+                }
+            },
+        )
+        results = response.json()["results"]
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            [r["date"] for r in results], ["2024-09-12", "2024-09-13", "2024-09-14"]
+        )
+        self.assertEqual(len(results[1]["journeys"]), 4)
+        mock_stream.assert_awaited_once()
+
+    def test_queries_and_date_range_are_exclusive(self):
+        query = {"date": "2024-09-13", "from": "BUE", "to": "MAD"}
+        date_range = {"start": "2024-09-12", "end": "2024-09-14", "from": "BUE", "to": "MAD"}
+
+        both = self.client.post(
+            self.base_url, json={"queries": [query], "date_range": date_range}
+        )
+        neither = self.client.post(self.base_url, json={})
+
+        self.assertEqual(both.status_code, 422)
+        self.assertEqual(neither.status_code, 422)
+
+    def test_invalid_city_code_should_fail(self):
+        response = self.client.post(
+            self.base_url,
+            json={"queries": [{"date": "2024-09-13", "from": "bue", "to": "MAD"}]},
+        )
+        self.assertEqual(response.status_code, 422)
+
+    def test_reversed_date_range_should_fail(self):
+        response = self.client.post(
+            self.base_url,
+            json={
+                "date_range": {
+                    "start": "2024-09-14",
+                    "end": "2024-09-12",
+                    "from": "BUE",
+                    "to": "MAD",
+                }
+            },
+        )
+        self.assertEqual(response.status_code, 422)
+
+    @patch("app.api.v1.requests.journey_search.DateRangeSearchRequest.to_dtos")
+    def test_huge_date_range_is_rejected_before_expanding(self, mock_to_dtos):
+        response = self.client.post(
+            self.base_url,
+            json={
+                "date_range": {
+                    "start": "0001-01-01",
+                    "end": "9999-12-31",
+                    "from": "BUE",
+                    "to": "MAD",
+                }
+            },
+        )
+        self.assertEqual(response.status_code, 422)
+        mock_to_dtos.assert_not_called()
+
+    @patch("app.api.v1.requests.journey_search.ConfigVars.BATCH_MAX_QUERIES", 2)
+    def test_too_many_queries_should_fail(self):
+        query = {"date": "2024-09-13", "from": "BUE", "to": "MAD"}
+        response = self.client.post(self.base_url, json={"queries": [query] * 3})
+        self.assertEqual(response.status_code, 422)
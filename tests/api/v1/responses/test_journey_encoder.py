@@ -0,0 +1,93 @@
+import json
+import unittest
+from datetime import datetime
+from typing import List
+from unittest.mock import patch
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.v1.responses.batch_journey_response import (
+    BatchJourneyResult,
+    BatchJourneySearchResponse,
+)
+from app.api.v1.responses.journey_encoder import JourneyEncoder
+from app.api.v1.responses.journey_response import JourneyResponse
+from app.core.flight_graph import FlightGraph
+from app.core.flight_snapshot import FlightSnapshot
+from app.core.strategies.direct_flights import JourneyDirectFlights
+from app.core.strategies.one_stop import OneStopJourneyStrategy
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from tests.commons.factorie import generate_flight_event_json
+
+
+async def model_response_bytes(journeys) -> bytes:
+    """The bytes FastAPI sends for List[JourneyResponse] built with from_dto."""
+    field = create_model_field("response", List[JourneyResponse])
+    content = await serialize_response(
+        field=field, response_content=list(map(JourneyResponse.from_dto, journeys))
+    )
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class TestJourneyEncoder(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.graph = FlightGraph(
+            map(FlightEventDTO.from_dict, generate_flight_event_json())
+        )
+        flight_filter = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
+        )
+        self.journeys = JourneyDirectFlights().find_journeys(
+            self.graph, flight_filter
+        ) + OneStopJourneyStrategy().find_journeys(self.graph, flight_filter)
+
+    async def test_matches_model_response_bytes(self):
+        expected = await model_response_bytes(self.journeys)
+        self.assertEqual(JourneyEncoder().encode(self.journeys), expected)
+
+    async def test_matches_model_response_bytes_without_orjson(self):
+        expected = await model_response_bytes(self.journeys)
+        with patch("app.utils.fast_json.orjson", None):
+            self.assertEqual(JourneyEncoder().encode(self.journeys), expected)
+
+    async def test_encode_line_is_one_journey_per_line(self):
+        line = JourneyEncoder().encode_line(self.journeys[0])
+        self.assertTrue(line.endswith(b"\n"))
+        self.assertEqual(
+            json.loads(line),
+            JourneyResponse.from_dto(self.journeys[0]).model_dump(by_alias=True),
+        )
+
+    async def test_uses_the_fragments_of_the_snapshot(self):
+        snapshot = FlightSnapshot(self.graph, version=1)
+        event = self.journeys[0]["path"][0]
+
+        encoder = JourneyEncoder.of(snapshot)
+
+        self.assertIs(encoder.fragments, snapshot.fragments)
+        self.assertEqual(len(snapshot.fragments), len(self.graph))
+        self.assertIs(encoder.fragments.fragment(event), snapshot.fragments.fragment(event))
+
+    async def test_encode_batch_matches_response_model(self):
+        flight_filter = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
+        )
+        expected = BatchJourneySearchResponse(
+            results=[
+                BatchJourneyResult(
+                    date=flight_filter.date,
+                    from_="BUE",
+                    to="MAD",
+                    journeys=list(map(JourneyResponse.from_dto, self.journeys)),
+                )
+            ]
+        ).model_dump(mode="json", by_alias=True)
+
+        encoded = JourneyEncoder().encode_batch([flight_filter], [self.journeys])
+
+        self.assertEqual(json.loads(encoded), expected)
+
+if __name__ == "__main__":
+    unittest.main()
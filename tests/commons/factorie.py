@@ -108,3 +108,19 @@ def generate_flight_event_json():
             str(datetime(2024, 9, 13, 17, 40).isoformat()),
         ),
     ]
+
+
+def stream_flight_events(raw_events):
+    """
+    Builds a side effect for a mocked FlightEventAdapter.stream_flight_events
+    that hands every raw event to the callback, like the real adapter does.
+    """
+
+    async def stream(on_event):
+        if raw_events is None:
+            return None
+        for raw_event in raw_events:
+            on_event(raw_event)
+        return len(raw_events)
+
+    return stream
@@ -0,0 +1,99 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from app.core.columnar import ColumnarFlightTable, columnar_available
+from app.core.flight_graph import FlightGraph
+from app.core.strategies.columnar import (
+    ColumnarDirectFlights,
+    ColumnarOneStopJourneyStrategy,
+)
+from app.core.strategies.direct_flights import JourneyDirectFlights
+from app.core.strategies.one_stop import OneStopJourneyStrategy
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from tests.commons.factorie import generate_flight_event_json
+
+
+def random_events(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    cities = ["BUE", "MAD", "GRU", "SCL", "JFK", "ATL"]
+    events = []
+    for i in range(count):
+        origin, destination = rng.sample(cities, 2)
+        departure = datetime(2024, 9, 12) + timedelta(minutes=rng.randrange(0, 2 * 24 * 60, 15))
+        arrival = departure + timedelta(minutes=rng.randrange(60, 20 * 60, 15))
+        events.append(FlightEventDTO(f"R{i}", origin, destination, departure, arrival))
+    return events
+
+
+def as_keys(journeys):
+    return [
+        (j["connections"], [e.flight_number for e in j["path"]]) for j in journeys
+    ]
+
+
+@unittest.skipUnless(columnar_available(), "numpy is not installed")
+class TestColumnarStrategies(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.filter = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
+        )
+
+    async def assert_same_results(self, graph, flight_filter):
+        for python_strategy, columnar_strategy in (
+            (JourneyDirectFlights(), ColumnarDirectFlights()),
+            (OneStopJourneyStrategy(), ColumnarOneStopJourneyStrategy()),
+        ):
+            expected = await python_strategy.execute(graph, flight_filter)
+            result = await columnar_strategy.execute(graph, flight_filter)
+            self.assertEqual(as_keys(result), as_keys(expected))
+
+    async def test_matches_python_strategies_on_fixture(self):
+        graph = FlightGraph(map(FlightEventDTO.from_dict, generate_flight_event_json()))
+        await self.assert_same_results(graph, self.filter)
+
+    async def test_matches_python_strategies_on_random_feed(self):
+        graph = FlightGraph(random_events(600))
+        for origin, destination in (("BUE", "MAD"), ("GRU", "JFK"), ("ATL", "SCL")):
+            flight_filter = FlightFilterDTO(
+                date=datetime(2024, 9, 12).date(), origin=origin, destination=destination
+            )
+            await self.assert_same_results(graph, flight_filter)
+
+    async def test_unknown_cities_return_no_journeys(self):
+        graph = FlightGraph(random_events(50))
+        flight_filter = FlightFilterDTO(
+            date=datetime(2024, 9, 12).date(), origin="XXX", destination="YYY"
+        )
+        self.assertEqual(await ColumnarDirectFlights().execute(graph, flight_filter), [])
+        self.assertEqual(
+            await ColumnarOneStopJourneyStrategy().execute(graph, flight_filter), []
+        )
+
+    async def test_departures_on_selects_origin_and_day(self):
+        graph = FlightGraph(random_events(300))
+        table = ColumnarFlightTable.of(graph)
+        day = datetime(2024, 9, 12).date()
+
+        rows = table.departures_on("BUE", day.toordinal()).tolist()
+
+        self.assertEqual(
+            [table.events[i] for i in rows],
+            list(graph.departures_from("BUE").departing_on(day)),
+        )
+
+    async def test_table_is_built_once_per_graph(self):
+        graph = FlightGraph(random_events(20))
+        self.assertIs(ColumnarFlightTable.of(graph), ColumnarFlightTable.of(graph))
+
+    async def test_empty_graph(self):
+        graph = FlightGraph([])
+        self.assertEqual(await ColumnarDirectFlights().execute(graph, self.filter), [])
+        self.assertEqual(
+            await ColumnarOneStopJourneyStrategy().execute(graph, self.filter), []
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import List
 
 from app.core.strategies.direct_flights import JourneyDirectFlights
@@ -46,6 +46,30 @@ class TestJourneyDirectFlights(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result[0]["path"][0].flight_number, "XX1234")
         self.assertEqual(result[0]["connections"], 0)
 
+    async def test_departure_date_is_local_with_mixed_offsets(self):
+        ahead = create_event(
+            "XX1",
+            "BUE",
+            "MAD",
+            datetime(2024, 9, 13, 1, 0, tzinfo=timezone(timedelta(hours=5))),
+            datetime(2024, 9, 13, 12, 0, tzinfo=timezone(timedelta(hours=5))),
+        )
+        behind = create_event(
+            "XX2",
+            "BUE",
+            "MAD",
+            datetime(2024, 9, 12, 22, 0, tzinfo=timezone.utc),
+            datetime(2024, 9, 13, 8, 0, tzinfo=timezone.utc),
+        )
+
+        result = await self.strategy.execute([ahead, behind], self.filter)
+        self.assertEqual([j["path"][0] for j in result], [behind])
+        next_day = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
+        )
+        result = await self.strategy.execute([ahead, behind], next_day)
+        self.assertEqual([j["path"][0] for j in result], [ahead])
+
     async def test_no_direct_flights_match(self):
         filter = FlightFilterDTO(
             date=datetime(2024, 9, 12), origin="BUE", destination="NYC"
@@ -0,0 +1,144 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from app.core.strategies.multi_stop import MultiStopJourneyStrategy
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.services.journey_service import JourneyService
+
+
+def create_event(
+    flight_number: str,
+    departure_city: str,
+    arrival_city: str,
+    departure_dt: datetime,
+    arrival_dt: datetime,
+) -> FlightEventDTO:
+    return FlightEventDTO(
+        flight_number=flight_number,
+        departure_city=departure_city,
+        arrival_city=arrival_city,
+        departure_datetime=departure_dt,
+        arrival_datetime=arrival_dt,
+    )
+
+
+def flight_numbers(journeys):
+    return [[e.flight_number for e in j["path"]] for j in journeys]
+
+
+class TestMultiStopJourneyStrategy(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.filter = FlightFilterDTO(
+            date=datetime(2024, 9, 12).date(), origin="BUE", destination="PMI"
+        )
+        self.direct = create_event(
+            "D1", "BUE", "PMI", datetime(2024, 9, 12, 6, 0), datetime(2024, 9, 12, 18, 0)
+        )
+        self.bue_mad = create_event(
+            "F1", "BUE", "MAD", datetime(2024, 9, 12, 7, 0), datetime(2024, 9, 12, 13, 0)
+        )
+        self.mad_pmi = create_event(
+            "F2", "MAD", "PMI", datetime(2024, 9, 12, 14, 0), datetime(2024, 9, 12, 15, 0)
+        )
+        self.mad_bcn = create_event(
+            "F3", "MAD", "BCN", datetime(2024, 9, 12, 14, 0), datetime(2024, 9, 12, 15, 0)
+        )
+        self.bcn_pmi = create_event(
+            "F4", "BCN", "PMI", datetime(2024, 9, 12, 16, 0), datetime(2024, 9, 12, 17, 0)
+        )
+        self.events = [
+            self.direct,
+            self.bue_mad,
+            self.mad_pmi,
+            self.mad_bcn,
+            self.bcn_pmi,
+        ]
+
+    async def test_finds_journeys_up_to_max_connections(self):
+        strategy = MultiStopJourneyStrategy(max_connections=2)
+        journeys = await strategy.execute(self.events, self.filter)
+
+        self.assertEqual(
+            flight_numbers(journeys), [["D1"], ["F1", "F2"], ["F1", "F3", "F4"]]
+        )
+        self.assertEqual([j["connections"] for j in journeys], [0, 1, 2])
+
+    async def test_min_connections_skips_shorter_journeys(self):
+        strategy = MultiStopJourneyStrategy(max_connections=2, min_connections=2)
+        journeys = await strategy.execute(self.events, self.filter)
+
+        self.assertEqual(flight_numbers(journeys), [["F1", "F3", "F4"]])
+
+    async def test_max_connections_limits_depth(self):
+        strategy = MultiStopJourneyStrategy(max_connections=1)
+        journeys = await strategy.execute(self.events, self.filter)
+
+        self.assertEqual(flight_numbers(journeys), [["D1"], ["F1", "F2"]])
+
+    async def test_long_layover_is_pruned(self):
+        late = create_event(
+            "F5", "BCN", "PMI", datetime(2024, 9, 12, 20, 0), datetime(2024, 9, 12, 21, 0)
+        )
+        strategy = MultiStopJourneyStrategy(max_connections=2, min_connections=2)
+        journeys = await strategy.execute(
+            [self.bue_mad, self.mad_bcn, late], self.filter
+        )
+
+        self.assertEqual(journeys, [])
+
+    async def test_total_duration_is_pruned(self):
+        slow = create_event(
+            "F6", "BCN", "PMI", datetime(2024, 9, 12, 16, 0), datetime(2024, 9, 13, 8, 0)
+        )
+        strategy = MultiStopJourneyStrategy(max_connections=2, min_connections=2)
+        journeys = await strategy.execute(
+            [self.bue_mad, self.mad_bcn, slow], self.filter
+        )
+
+        self.assertEqual(journeys, [])
+
+    async def test_cities_are_not_revisited(self):
+        back_to_bue = create_event(
+            "F7", "MAD", "BUE", datetime(2024, 9, 12, 14, 0), datetime(2024, 9, 12, 15, 0)
+        )
+        bue_pmi = create_event(
+            "F8", "BUE", "PMI", datetime(2024, 9, 12, 16, 0), datetime(2024, 9, 12, 17, 0)
+        )
+        strategy = MultiStopJourneyStrategy(max_connections=3, min_connections=1)
+        journeys = await strategy.execute(
+            [self.bue_mad, back_to_bue, bue_pmi], self.filter
+        )
+
+        self.assertEqual(journeys, [])
+
+    async def test_first_leg_must_match_origin_and_date(self):
+        next_day = create_event(
+            "D2", "BUE", "PMI", datetime(2024, 9, 13, 6, 0), datetime(2024, 9, 13, 18, 0)
+        )
+        other_origin = create_event(
+            "D3", "MAD", "PMI", datetime(2024, 9, 12, 6, 0), datetime(2024, 9, 12, 8, 0)
+        )
+        strategy = MultiStopJourneyStrategy(max_connections=2)
+        journeys = await strategy.execute([next_day, other_origin], self.filter)
+
+        self.assertEqual(journeys, [])
+
+    @patch("app.services.journey_service.ConfigVars.MAX_CONNECTIONS", 3)
+    async def test_service_adds_multi_stop_when_configured(self):
+        strategies = JourneyService.default_strategies()
+
+        self.assertIsInstance(strategies[-1], MultiStopJourneyStrategy)
+        self.assertEqual(strategies[-1].min_connections, 2)
+
+    async def test_service_default_has_no_multi_stop(self):
+        strategies = JourneyService.default_strategies()
+
+        self.assertFalse(
+            any(isinstance(s, MultiStopJourneyStrategy) for s in strategies)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
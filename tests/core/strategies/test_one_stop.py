@@ -145,8 +145,36 @@ class TestOneStopJourneyStrategy(unittest.IsolatedAsyncioTestCase):
         journeys = await self.strategy.execute([flight1, flight2, flight3], self.filter)
         self.assertEqual(len(journeys), 2)
 
+    async def test_first_leg_must_match_origin_and_date(self):
+        other_origin = create_event(
+            "F1",
+            "GRU",
+            "MAD",
+            datetime(2024, 9, 12, 7, 0),
+            datetime(2024, 9, 12, 13, 0),
+        )
+        other_date = create_event(
+            "F2",
+            "BUE",
+            "MAD",
+            datetime(2024, 9, 11, 22, 0),
+            datetime(2024, 9, 12, 12, 0),
+        )
+        second_leg = create_event(
+            "F3",
+            "MAD",
+            "PMI",
+            datetime(2024, 9, 12, 14, 0),
+            datetime(2024, 9, 12, 15, 0),
+        )
+
+        journeys = await self.strategy.execute(
+            [other_origin, other_date, second_leg], self.filter
+        )
+        self.assertEqual(journeys, [])
+
     async def test_no_flights_returns_empty(self):
-        result = await self.strategy.find_next_stopovers(self.first_leg, [], "PMI")
+        result = self.strategy.find_next_stopovers(self.first_leg, [], "PMI")
         self.assertEqual(result, [])
 
     async def test_valid_flight_is_included(self):
@@ -157,7 +185,7 @@ class TestOneStopJourneyStrategy(unittest.IsolatedAsyncioTestCase):
             departure_datetime=datetime(2024, 9, 12, 14, 0),
             arrival_datetime=datetime(2024, 9, 12, 15, 0),
         )
-        result = await self.strategy.find_next_stopovers(
+        result = self.strategy.find_next_stopovers(
             self.first_leg, [valid_leg], "PMI"
         )
         self.assertIn(valid_leg, result)
@@ -170,7 +198,7 @@ class TestOneStopJourneyStrategy(unittest.IsolatedAsyncioTestCase):
             departure_datetime=datetime(2024, 9, 12, 14, 0),
             arrival_datetime=datetime(2024, 9, 12, 15, 0),
         )
-        result = await self.strategy.find_next_stopovers(
+        result = self.strategy.find_next_stopovers(
             self.first_leg, [wrong_departure], "PMI"
         )
         self.assertNotIn(wrong_departure, result)
@@ -183,7 +211,7 @@ class TestOneStopJourneyStrategy(unittest.IsolatedAsyncioTestCase):
             departure_datetime=datetime(2024, 9, 12, 14, 0),
             arrival_datetime=datetime(2024, 9, 12, 15, 0),
         )
-        result = await self.strategy.find_next_stopovers(
+        result = self.strategy.find_next_stopovers(
             self.first_leg, [wrong_arrival], "PMI"
         )
         self.assertNotIn(wrong_arrival, result)
@@ -196,7 +224,7 @@ class TestOneStopJourneyStrategy(unittest.IsolatedAsyncioTestCase):
             departure_datetime=datetime(2024, 9, 12, 12, 0),
             arrival_datetime=datetime(2024, 9, 12, 13, 0),
         )
-        result = await self.strategy.find_next_stopovers(
+        result = self.strategy.find_next_stopovers(
             self.first_leg, [early_departure], "PMI"
         )
         self.assertNotIn(early_departure, result)
@@ -216,7 +244,7 @@ class TestOneStopJourneyStrategy(unittest.IsolatedAsyncioTestCase):
             departure_datetime=self.first_leg.arrival_datetime.replace(hour=23),
             arrival_datetime=datetime(2024, 9, 13, 1, 0),
         )
-        result = await self.strategy.find_next_stopovers(
+        result = self.strategy.find_next_stopovers(
             self.first_leg, [zero_layover, long_layover], "PMI"
         )
         self.assertNotIn(zero_layover, result)
@@ -237,7 +265,7 @@ class TestOneStopJourneyStrategy(unittest.IsolatedAsyncioTestCase):
             departure_datetime=self.first_leg.arrival_datetime.replace(hour=15),
             arrival_datetime=datetime(2024, 9, 12, 16, 0),
         )
-        result = await self.strategy.find_next_stopovers(
+        result = self.strategy.find_next_stopovers(
             self.first_leg, [valid1, valid2], "PMI"
         )
         self.assertIn(valid1, result)
@@ -0,0 +1,82 @@
+import json
+import unittest
+from datetime import datetime
+
+from app.api.v1.responses.journey_response import FlightItem
+from app.core.event_fragments import EventFragments
+from app.dtos.flight_event_dto import FlightEventDTO
+from tests.commons.factorie import create_flight_event_dict
+
+
+def create_event(flight_number: str, departure_city: str, arrival_city: str):
+    return FlightEventDTO(
+        flight_number=flight_number,
+        departure_city=departure_city,
+        arrival_city=arrival_city,
+        departure_datetime=datetime(2024, 9, 12, 7, 5),
+        arrival_datetime=datetime(2024, 9, 12, 13, 0),
+    )
+
+
+class TestEventFragments(unittest.TestCase):
+    def setUp(self):
+        self.event = create_event("IB\"12", "BUE", "MAD")
+
+    def test_fragment_matches_flight_item(self):
+        fragment = EventFragments().fragment(self.event)
+        self.assertEqual(
+            json.loads(fragment),
+            FlightItem.from_dto(self.event).model_dump(by_alias=True),
+        )
+
+    def test_events_are_rendered_up_front(self):
+        other = create_event("F2", "MAD", "PMI")
+        fragments = EventFragments([self.event, other])
+
+        self.assertEqual(len(fragments), 2)
+        self.assertGreater(fragments.nbytes(), 0)
+
+    def test_unknown_event_is_rendered_once(self):
+        fragments = EventFragments()
+
+        first = fragments.fragment(self.event)
+
+        self.assertIs(fragments.fragment(self.event), first)
+        self.assertEqual(len(fragments), 1)
+
+    def test_prerendered_fragments_do_not_keep_unknown_events(self):
+        fragments = EventFragments([self.event])
+        other = create_event("F2", "MAD", "PMI")
+
+        self.assertEqual(
+            fragments.fragment(other), EventFragments().fragment(other)
+        )
+        self.assertEqual(len(fragments), 1)
+
+    def test_same_instant_in_other_offsets_keeps_its_local_times(self):
+        events = [
+            FlightEventDTO.from_dict(
+                create_flight_event_dict(
+                    "F1",
+                    departure_datetime="2024-09-13T01:00:00+05:00",
+                    arrival_datetime="2024-09-13T09:00:00+05:00",
+                )
+            ),
+            FlightEventDTO.from_dict(
+                create_flight_event_dict(
+                    "F2",
+                    departure_datetime="2024-09-12T20:00:00Z",
+                    arrival_datetime="2024-09-13T04:00:00Z",
+                )
+            ),
+        ]
+        for fragments in (EventFragments(events), EventFragments()):
+            for event in events:
+                self.assertEqual(
+                    json.loads(fragments.fragment(event)),
+                    FlightItem.from_dto(event).model_dump(by_alias=True),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from app.core.flight_graph import FlightGraph, FlightGraphBuilder
+from app.dtos.flight_event_dto import FlightEventDTO
+
+
+def create_event(
+    flight_number: str,
+    departure_city: str,
+    arrival_city: str,
+    departure_datetime: datetime,
+    arrival_datetime: datetime,
+) -> FlightEventDTO:
+    return FlightEventDTO(
+        flight_number=flight_number,
+        departure_city=departure_city,
+        arrival_city=arrival_city,
+        departure_datetime=departure_datetime,
+        arrival_datetime=arrival_datetime,
+    )
+
+
+class TestFlightGraph(unittest.TestCase):
+    def setUp(self):
+        self.late = create_event(
+            "F1", "BUE", "MAD", datetime(2024, 9, 12, 18, 0), datetime(2024, 9, 13, 4, 0)
+        )
+        self.early = create_event(
+            "F2", "BUE", "MAD", datetime(2024, 9, 12, 6, 0), datetime(2024, 9, 12, 16, 0)
+        )
+        self.next_day = create_event(
+            "F3", "BUE", "MAD", datetime(2024, 9, 13, 6, 0), datetime(2024, 9, 13, 16, 0)
+        )
+        self.other_route = create_event(
+            "F4", "BUE", "GRU", datetime(2024, 9, 12, 9, 0), datetime(2024, 9, 12, 12, 0)
+        )
+        self.graph = FlightGraph(
+            [self.late, self.next_day, self.other_route, self.early]
+        )
+
+    def test_events_are_sorted_by_departure(self):
+        self.assertEqual(
+            self.graph.events, [self.early, self.other_route, self.late, self.next_day]
+        )
+
+    def test_route_bucket_is_sorted_and_filtered(self):
+        bucket = self.graph.route("BUE", "MAD")
+        self.assertEqual(bucket.events, [self.early, self.late, self.next_day])
+
+    def test_departures_from_city(self):
+        self.assertEqual(len(self.graph.departures_from("BUE")), 4)
+        self.assertEqual(len(self.graph.departures_from("MAD")), 0)
+
+    def test_departures_on_date(self):
+        bucket = self.graph.departures_on(datetime(2024, 9, 12).date())
+        self.assertEqual(bucket.events, [self.early, self.other_route, self.late])
+
+    def test_departing_on_within_route(self):
+        result = self.graph.route("BUE", "MAD").departing_on(
+            datetime(2024, 9, 13).date()
+        )
+        self.assertEqual(result, [self.next_day])
+
+    def test_departing_on_uses_local_dates_with_mixed_offsets(self):
+        # Departs first in UTC (20:00Z) but on the later local date.
+        ahead = create_event(
+            "F5",
+            "BUE",
+            "MAD",
+            datetime(2024, 9, 13, 1, 0, tzinfo=timezone(timedelta(hours=5))),
+            datetime(2024, 9, 13, 12, 0, tzinfo=timezone(timedelta(hours=5))),
+        )
+        behind = create_event(
+            "F6",
+            "BUE",
+            "MAD",
+            datetime(2024, 9, 12, 22, 0, tzinfo=timezone.utc),
+            datetime(2024, 9, 13, 8, 0, tzinfo=timezone.utc),
+        )
+        bucket = FlightGraph([behind, ahead]).route("BUE", "MAD")
+        self.assertEqual(bucket.events, [ahead, behind])
+        self.assertEqual(bucket.departing_on(datetime(2024, 9, 12).date()), [behind])
+        self.assertEqual(bucket.departing_on(datetime(2024, 9, 13).date()), [ahead])
+
+    def test_departing_between_excludes_start_and_includes_end(self):
+        bucket = self.graph.route("BUE", "MAD")
+        result = bucket.departing_between(
+            self.early.departure_ts, self.next_day.departure_ts
+        )
+        self.assertEqual(result, [self.late, self.next_day])
+
+    def test_unknown_route_is_empty(self):
+        self.assertEqual(self.graph.route("MAD", "BUE").events, [])
+
+    def test_of_reuses_existing_graph(self):
+        self.assertIs(FlightGraph.of(self.graph), self.graph)
+        self.assertIsInstance(FlightGraph.of([self.early]), FlightGraph)
+
+    def test_builder_matches_graph_built_from_list(self):
+        builder = FlightGraphBuilder()
+        for event in [self.late, self.next_day, self.other_route, self.early]:
+            builder.add(event)
+        graph = builder.build()
+
+        self.assertEqual(len(builder), 4)
+        self.assertEqual(graph.events, self.graph.events)
+        self.assertEqual(graph.route("BUE", "MAD").events, self.graph.route("BUE", "MAD").events)
+
+
+if __name__ == "__main__":
+    unittest.main()
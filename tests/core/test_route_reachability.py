@@ -0,0 +1,95 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from app.core.flight_graph import FlightGraph
+from app.core.route_reachability import RouteReachability
+from app.core.strategies.direct_flights import JourneyDirectFlights
+from app.core.strategies.one_stop import OneStopJourneyStrategy
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+
+
+def create_event(
+    flight_number: str,
+    departure_city: str,
+    arrival_city: str,
+    departure_datetime: datetime,
+    arrival_datetime: datetime,
+) -> FlightEventDTO:
+    return FlightEventDTO(
+        flight_number=flight_number,
+        departure_city=departure_city,
+        arrival_city=arrival_city,
+        departure_datetime=departure_datetime,
+        arrival_datetime=arrival_datetime,
+    )
+
+
+class TestRouteReachability(unittest.TestCase):
+    def setUp(self):
+        self.day = datetime(2024, 9, 12).date()
+        self.reachability = RouteReachability(
+            FlightGraph(
+                [
+                    create_event(
+                        "F1", "BUE", "MAD",
+                        datetime(2024, 9, 12, 7, 0), datetime(2024, 9, 12, 13, 0),
+                    ),
+                    create_event(
+                        "F2", "MAD", "PMI",
+                        datetime(2024, 9, 12, 14, 0), datetime(2024, 9, 12, 15, 0),
+                    ),
+                    create_event(
+                        "F3", "PMI", "BCN",
+                        datetime(2024, 9, 12, 16, 0), datetime(2024, 9, 12, 17, 0),
+                    ),
+                ]
+            )
+        )
+
+    def test_direct_pair_is_reachable(self):
+        self.assertTrue(self.reachability.may_connect(self.day, "BUE", "MAD"))
+
+    def test_one_hop_pair_is_reachable(self):
+        self.assertTrue(self.reachability.may_connect(self.day, "BUE", "PMI"))
+
+    def test_two_hop_pair_is_not_reachable(self):
+        self.assertFalse(self.reachability.may_connect(self.day, "BUE", "BCN"))
+
+    def test_first_leg_must_depart_on_the_date(self):
+        next_day = self.day + timedelta(days=1)
+        self.assertFalse(self.reachability.may_connect(next_day, "BUE", "MAD"))
+
+    def test_unknown_cities_are_not_reachable(self):
+        self.assertFalse(self.reachability.may_connect(self.day, "XXX", "MAD"))
+        self.assertFalse(self.reachability.may_connect(self.day, "BUE", "YYY"))
+
+    def test_is_a_superset_of_strategy_results(self):
+        rng = random.Random(3)
+        cities = ["BUE", "MAD", "GRU", "SCL", "JFK", "ATL", "PMI"]
+        events = []
+        for i in range(400):
+            origin, destination = rng.sample(cities, 2)
+            departure = datetime(2024, 9, 12) + timedelta(
+                minutes=rng.randrange(0, 3 * 24 * 60, 15)
+            )
+            arrival = departure + timedelta(minutes=rng.randrange(60, 12 * 60, 15))
+            events.append(create_event(f"R{i}", origin, destination, departure, arrival))
+        graph = FlightGraph(events)
+        reachability = RouteReachability(graph)
+
+        for origin in cities:
+            for destination in cities:
+                flight_filter = FlightFilterDTO(self.day, origin, destination)
+                found = JourneyDirectFlights().find_journeys(
+                    graph, flight_filter
+                ) or OneStopJourneyStrategy().find_journeys(graph, flight_filter)
+                if found:
+                    self.assertTrue(
+                        reachability.may_connect(self.day, origin, destination)
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
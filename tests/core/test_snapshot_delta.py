@@ -0,0 +1,242 @@
+import random
+import unittest
+from collections import Counter
+from datetime import datetime, timedelta
+
+from app.core.flight_graph import FlightGraph
+from app.core.flight_snapshot import FlightSnapshot
+from app.core.route_reachability import RouteReachability
+from app.core.snapshot_delta import FeedDiffer, SnapshotDelta, event_index
+from app.core.strategies.direct_flights import JourneyDirectFlights
+from app.core.strategies.one_stop import OneStopJourneyStrategy
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from tests.commons.factorie import create_flight_event_dict
+
+CITIES = ["BUE", "MAD", "GRU", "SCL", "JFK", "PMI"]
+
+
+def random_feed(rng: random.Random, count: int):
+    feed = []
+    for i in range(count):
+        origin, destination = rng.sample(CITIES, 2)
+        departure = datetime(2024, 9, 12) + timedelta(
+            minutes=rng.randrange(0, 3 * 24 * 60, 30)
+        )
+        arrival = departure + timedelta(minutes=rng.randrange(60, 10 * 60, 30))
+        feed.append(
+            create_flight_event_dict(
+                f"R{i}",
+                origin,
+                destination,
+                departure.isoformat() + "Z",
+                arrival.isoformat() + "Z",
+            )
+        )
+    return feed
+
+
+def churn(rng: random.Random, feed, changes: int):
+    feed = list(feed)
+    for i in rng.sample(range(len(feed)), changes):
+        feed[i] = dict(feed[i], arrival_city=rng.choice(CITIES))
+    for i in sorted(rng.sample(range(len(feed)), changes), reverse=True):
+        del feed[i]
+    return feed + random_feed(rng, changes)[: changes // 2]
+
+
+def diff(previous: FlightGraph, feed, max_connections=1):
+    differ = FeedDiffer(event_index(previous))
+    for raw_event in feed:
+        differ.add(raw_event)
+    delta = SnapshotDelta(1, differ.added, differ.removed(), 24, max_connections)
+    return delta, differ
+
+
+def journeys(graph: FlightGraph, flight_filter: FlightFilterDTO):
+    return [
+        [e.flight_number for e in journey["path"]]
+        for strategy in (JourneyDirectFlights(), OneStopJourneyStrategy())
+        for journey in strategy.find_journeys(graph, flight_filter)
+    ]
+
+
+class TestFeedDiffer(unittest.TestCase):
+    def setUp(self):
+        self.feed = [
+            create_flight_event_dict("F1"),
+            create_flight_event_dict("F2", departure_datetime="2024-09-13T08:00:00Z"),
+            create_flight_event_dict("F3", "MAD", "PMI"),
+        ]
+        self.previous = event_index(map(FlightEventDTO.from_dict, self.feed))
+
+    def test_unchanged_events_are_reused(self):
+        delta, differ = diff(self.previous.values(), self.feed)
+
+        self.assertFalse(delta)
+        self.assertEqual(list(differ.index.values()), list(self.previous.values()))
+
+    def test_changed_event_is_removed_and_added(self):
+        feed = [self.feed[0], dict(self.feed[1], arrival_city="GRU"), self.feed[2]]
+        delta, _ = diff(self.previous.values(), feed)
+
+        self.assertEqual([e.arrival_city for e in delta.added], ["GRU"])
+        self.assertEqual([e.flight_number for e in delta.removed], ["F2"])
+
+    def test_new_and_missing_events(self):
+        feed = [self.feed[0], self.feed[2], create_flight_event_dict("F4")]
+        delta, _ = diff(self.previous.values(), feed)
+
+        self.assertEqual([e.flight_number for e in delta.added], ["F4"])
+        self.assertEqual([e.flight_number for e in delta.removed], ["F2"])
+
+    def test_repeated_flight_and_time_are_kept_apart(self):
+        feed = self.feed + [self.feed[0]]
+        delta, differ = diff(self.previous.values(), feed)
+
+        self.assertEqual([e.flight_number for e in delta.added], ["F1"])
+        self.assertEqual(delta.removed, [])
+        self.assertEqual(len(differ), 4)
+
+    def test_offset_change_is_a_change(self):
+        feed = [
+            dict(
+                self.feed[0],
+                departure_datetime="2024-09-13T09:00:00+02:00",
+                arrival_datetime="2024-09-13T15:00:00+02:00",
+            )
+        ] + self.feed[1:]
+        delta, _ = diff(self.previous.values(), feed)
+
+        self.assertEqual([e.flight_number for e in delta.added], ["F1"])
+        self.assertEqual([e.flight_number for e in delta.removed], ["F1"])
+
+
+    def test_parsed_events_diff_like_raw_ones(self):
+        feed = [self.feed[0], dict(self.feed[1], arrival_city="GRU")]
+        differ = FeedDiffer(self.previous)
+        for event in map(FlightEventDTO.from_dict, feed):
+            differ.add_event(event)
+
+        self.assertIs(
+            list(differ.index.values())[0], list(self.previous.values())[0]
+        )
+        self.assertEqual([e.arrival_city for e in differ.added], ["GRU"])
+        self.assertEqual(
+            sorted(e.flight_number for e in differ.removed()), ["F2", "F3"]
+        )
+
+
+class TestSnapshotDelta(unittest.TestCase):
+    def setUp(self):
+        self.day = datetime(2024, 9, 13).date()
+        self.delta = SnapshotDelta(
+            1, [FlightEventDTO.from_dict(create_flight_event_dict())], [], 24, 1
+        )
+
+    def test_affects_routes_touching_the_change(self):
+        self.assertTrue(self.delta.affects(self.day, "BUE", "PMI"))
+        self.assertTrue(self.delta.affects(self.day, "GRU", "MAD"))
+        self.assertFalse(self.delta.affects(self.day, "GRU", "PMI"))
+
+    def test_affects_journeys_starting_the_day_before(self):
+        day_before = self.day - timedelta(days=1)
+        self.assertTrue(self.delta.affects(day_before, "BUE", "PMI"))
+        self.assertFalse(self.delta.affects(self.day + timedelta(days=1), "BUE", "MAD"))
+
+    def test_affects_first_legs_in_an_eastern_offset(self):
+        first_leg = FlightEventDTO.from_dict(
+            create_flight_event_dict(
+                "L1",
+                "AAA",
+                "BBB",
+                "2024-09-13T06:00:00+12:00",
+                "2024-09-13T09:00:00+12:00",
+            )
+        )
+        # Lands 2024-09-12T21:00Z; the next leg departs an hour later but on
+        # the previous local date.
+        second_leg = FlightEventDTO.from_dict(
+            create_flight_event_dict(
+                "L2",
+                "BBB",
+                "CCC",
+                "2024-09-12T12:00:00-10:00",
+                "2024-09-12T15:00:00-10:00",
+            )
+        )
+        graph = FlightGraph([first_leg, second_leg])
+        flight_filter = FlightFilterDTO(self.day, "AAA", "CCC")
+        self.assertEqual(journeys(graph, flight_filter), [["L1", "L2"]])
+
+        delta = SnapshotDelta(1, [second_leg], [], 24, 1)
+
+        self.assertTrue(delta.affects(self.day, "AAA", "CCC"))
+
+    def test_multi_stop_affects_every_route_of_the_day(self):
+        delta = SnapshotDelta(1, self.delta.added, [], 24, 2)
+
+        self.assertTrue(delta.affects(self.day, "GRU", "PMI"))
+
+
+class TestIncrementalSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(5)
+        self.feed = random_feed(self.rng, 300)
+        self.previous = FlightSnapshot(
+            list(map(FlightEventDTO.from_dict, self.feed)), version=1
+        )
+
+    def test_matches_a_full_rebuild(self):
+        feed = churn(self.rng, self.feed, 30)
+        delta, differ = diff(self.previous.graph, feed)
+        snapshot = FlightSnapshot.from_delta(self.previous, delta, 2, differ.index)
+        rebuilt = FlightGraph(differ.index.values())
+
+        self.assertEqual(len(snapshot.graph), len(rebuilt))
+        self.assertEqual(
+            [e.departure_ts for e in snapshot.events],
+            [e.departure_ts for e in rebuilt.events],
+        )
+        for name in ("by_departure_city", "by_route", "by_departure_date"):
+            patched, full = getattr(snapshot.graph, name), getattr(rebuilt, name)
+            self.assertEqual(patched.keys(), full.keys())
+            for key in full:
+                self.assertEqual(Counter(patched[key].events), Counter(full[key].events))
+
+        reachability = RouteReachability(rebuilt)
+        self.assertEqual(snapshot.reachability.hubs, reachability.hubs)
+        self.assertEqual(snapshot.reachability.sources, reachability.sources)
+        self.assertEqual(
+            set(snapshot.fragments._fragments), set(snapshot.graph.events)
+        )
+
+    def test_previous_snapshot_is_untouched(self):
+        events = list(self.previous.events)
+        hubs = dict(self.previous.reachability.hubs)
+        delta, differ = diff(self.previous.graph, churn(self.rng, self.feed, 30))
+        FlightSnapshot.from_delta(self.previous, delta, 2, differ.index)
+
+        self.assertEqual(self.previous.events, events)
+        self.assertEqual(self.previous.reachability.hubs, hubs)
+        self.assertEqual(len(self.previous.fragments), len(events))
+
+    def test_unaffected_searches_keep_their_results(self):
+        delta, differ = diff(self.previous.graph, churn(self.rng, self.feed, 5))
+        snapshot = FlightSnapshot.from_delta(self.previous, delta, 2, differ.index)
+
+        for offset in range(3):
+            day = datetime(2024, 9, 12).date() + timedelta(days=offset)
+            for origin in CITIES:
+                for destination in CITIES:
+                    if origin == destination or delta.affects(day, origin, destination):
+                        continue
+                    flight_filter = FlightFilterDTO(day, origin, destination)
+                    self.assertEqual(
+                        journeys(snapshot.graph, flight_filter),
+                        journeys(self.previous.graph, flight_filter),
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
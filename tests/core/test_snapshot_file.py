@@ -0,0 +1,168 @@
+import os
+import struct
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from app.core import snapshot_file
+from app.core.snapshot_file import (
+    HEADER,
+    SnapshotFile,
+    SnapshotFileError,
+    read_written_at,
+    write_snapshot_file,
+)
+from app.dtos.flight_event_dto import FlightEventDTO
+from tests.commons.factorie import create_flight_event_dict
+
+
+def fields(event: FlightEventDTO):
+    return (
+        event.flight_number,
+        event.departure_city,
+        event.arrival_city,
+        event.departure_datetime,
+        event.departure_datetime.utcoffset(),
+        event.arrival_datetime,
+        event.arrival_datetime.utcoffset(),
+        event.departure_date,
+        event.departure_ts,
+        event.arrival_ts,
+    )
+
+
+class TestSnapshotFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "flights.snapshot")
+        self.events = [
+            FlightEventDTO.from_dict(create_flight_event_dict()),
+            FlightEventDTO.from_dict(
+                create_flight_event_dict(
+                    "IB6844",
+                    "MAD",
+                    "BUE",
+                    "2024-09-13T23:30:00+02:00",
+                    "2024-09-14T08:10:00-03:00",
+                )
+            ),
+            FlightEventDTO(
+                "LA2000",
+                "BUE",
+                "GRU",
+                datetime(2024, 9, 12, 6, 0),
+                datetime(2024, 9, 12, 9, 0),
+            ),
+        ]
+
+    def test_round_trip_keeps_every_field(self):
+        write_snapshot_file(self.path, self.events, written_at=1234.5)
+
+        with SnapshotFile(self.path) as snapshot:
+            self.assertEqual(snapshot.written_at, 1234.5)
+            self.assertEqual(len(snapshot), 3)
+            events = list(snapshot.events())
+
+        self.assertEqual(list(map(fields, events)), list(map(fields, self.events)))
+        self.assertIsNone(events[2].departure_datetime.tzinfo)
+
+    def test_strings_are_stored_once(self):
+        size = write_snapshot_file(self.path, self.events * 100)
+
+        with SnapshotFile(self.path) as snapshot:
+            self.assertEqual(
+                sorted(snapshot.strings),
+                ["BUE", "F1", "GRU", "IB6844", "LA2000", "MAD"],
+            )
+        self.assertLess(size, 40 * 300)
+
+    def test_empty_snapshot(self):
+        write_snapshot_file(self.path, [])
+
+        with SnapshotFile(self.path) as snapshot:
+            self.assertEqual(list(snapshot.events()), [])
+
+    def test_written_at_is_read_from_the_header(self):
+        write_snapshot_file(self.path, self.events, written_at=1234.5)
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1234_500_000_000)
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\xff")
+
+        # Only the header is read, so the corrupt body goes unnoticed.
+        self.assertEqual(read_written_at(self.path), 1234.5)
+        with open(self.path, "r+b") as f:
+            f.truncate(HEADER.size - 1)
+        with self.assertRaises(SnapshotFileError):
+            read_written_at(self.path)
+
+    def test_other_format_version_is_rejected(self):
+        write_snapshot_file(self.path, self.events)
+
+        with patch.object(snapshot_file, "FORMAT_VERSION", 2):
+            with self.assertRaises(SnapshotFileError) as context:
+                SnapshotFile(self.path)
+        self.assertIn("format version 1", str(context.exception))
+
+    def test_foreign_file_is_rejected(self):
+        with open(self.path, "wb") as f:
+            f.write(b"[" + b" " * HEADER.size + b"]")
+
+        with self.assertRaises(SnapshotFileError):
+            SnapshotFile(self.path)
+
+    def test_truncated_file_is_rejected(self):
+        write_snapshot_file(self.path, self.events)
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 4)
+
+        with self.assertRaises(SnapshotFileError):
+            SnapshotFile(self.path)
+
+    def test_corrupt_file_is_rejected(self):
+        write_snapshot_file(self.path, self.events)
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\xff")
+
+        with self.assertRaises(SnapshotFileError) as context:
+            SnapshotFile(self.path)
+        self.assertIn("checksum", str(context.exception))
+
+    def test_failed_write_keeps_previous_file(self):
+        write_snapshot_file(self.path, self.events, written_at=1.0)
+
+        with patch("app.core.snapshot_file.os.replace", side_effect=OSError("crash")):
+            with self.assertRaises(OSError):
+                write_snapshot_file(self.path, self.events[:1], written_at=2.0)
+
+        with SnapshotFile(self.path) as snapshot:
+            self.assertEqual(snapshot.written_at, 1.0)
+            self.assertEqual(len(snapshot), 3)
+        self.assertEqual(os.listdir(self.directory.name), ["flights.snapshot"])
+
+    def test_open_reader_keeps_old_data_after_replace(self):
+        write_snapshot_file(self.path, self.events, written_at=1.0)
+
+        with SnapshotFile(self.path) as old:
+            write_snapshot_file(self.path, self.events[:1], written_at=2.0)
+            with SnapshotFile(self.path) as new:
+                self.assertEqual(len(new), 1)
+                self.assertEqual(new.written_at, 2.0)
+            self.assertEqual(len(old), 3)
+            self.assertEqual(
+                [e.flight_number for e in old.events()], ["F1", "IB6844", "LA2000"]
+            )
+
+    def test_header_is_little_endian(self):
+        write_snapshot_file(self.path, self.events, written_at=1.0)
+
+        with open(self.path, "rb") as f:
+            magic, version, count = struct.unpack_from("<8sII", f.read(16))
+        self.assertEqual((magic, version, count), (b"FLTSNAP\0", 1, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
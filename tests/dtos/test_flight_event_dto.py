@@ -0,0 +1,61 @@
+import unittest
+from datetime import datetime, timezone
+
+from app.dtos.flight_event_dto import FlightEventDTO, to_epoch_seconds
+from tests.commons.factorie import create_flight_event_dict
+
+
+class TestFlightEventDTO(unittest.TestCase):
+    def setUp(self):
+        self.event = FlightEventDTO.from_dict(
+            create_flight_event_dict(
+                departure_datetime="2024-09-13T23:30:00Z",
+                arrival_datetime="2024-09-14T05:00:00Z",
+            )
+        )
+
+    def test_from_dict_parses_utc_datetimes(self):
+        self.assertEqual(
+            self.event.departure_datetime,
+            datetime(2024, 9, 13, 23, 30, tzinfo=timezone.utc),
+        )
+        self.assertEqual(self.event.departure_date, datetime(2024, 9, 13).date())
+        self.assertEqual(self.event.arrival_date, datetime(2024, 9, 14).date())
+
+    def test_epoch_timestamps(self):
+        self.assertEqual(self.event.departure_ts, 1726270200)
+        self.assertEqual(self.event.arrival_ts - self.event.departure_ts, 5.5 * 3600)
+
+    def test_naive_datetimes_are_read_as_utc(self):
+        self.assertEqual(to_epoch_seconds(datetime(2024, 9, 13, 23, 30)), 1726270200)
+
+    def test_codes_are_interned(self):
+        other = FlightEventDTO.from_dict(
+            create_flight_event_dict(departure_city="".join(["B", "U", "E"]))
+        )
+        self.assertIs(other.departure_city, self.event.departure_city)
+        self.assertIs(other.flight_number, self.event.flight_number)
+
+    def test_equal_timestamps_share_parsed_values(self):
+        other = FlightEventDTO.from_dict(
+            create_flight_event_dict(
+                flight_number="F2",
+                departure_datetime="2024-09-13T23:30:00Z",
+                arrival_datetime="2024-09-14T05:00:00Z",
+            )
+        )
+        self.assertIs(other.departure_datetime, self.event.departure_datetime)
+        self.assertIs(other.departure_ts, self.event.departure_ts)
+
+    def test_is_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.event.departure_city = "MAD"
+        with self.assertRaises(AttributeError):
+            del self.event.arrival_city
+
+    def test_has_no_instance_dict(self):
+        self.assertFalse(hasattr(self.event, "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
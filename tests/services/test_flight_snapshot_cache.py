@@ -0,0 +1,294 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from app.core.snapshot_file import SnapshotFile, read_written_at, write_snapshot_file
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.services.flight_snapshot_cache import FlightSnapshotCache
+from tests.commons.factorie import (
+    create_flight_event_dict,
+    generate_flight_event_json,
+    stream_flight_events,
+)
+
+
+class TestFlightSnapshotCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = FlightSnapshotCache(ttl_seconds=60)
+        self.fetch = AsyncMock(
+            side_effect=stream_flight_events(generate_flight_event_json())
+        )
+        self.cache.adapter.stream_flight_events = self.fetch
+
+    async def test_first_call_loads_snapshot(self):
+        snapshot = await self.cache.get_snapshot()
+
+        self.assertEqual(len(snapshot.events), 12)
+        self.assertIs(self.cache.snapshot, snapshot)
+        self.fetch.assert_awaited_once()
+
+    async def test_fresh_snapshot_is_reused(self):
+        first = await self.cache.get_snapshot()
+        second = await self.cache.get_snapshot()
+
+        self.assertIs(first, second)
+        self.fetch.assert_awaited_once()
+
+    async def test_concurrent_cold_requests_share_one_fetch(self):
+        snapshots = await asyncio.gather(
+            *(self.cache.get_snapshot() for _ in range(10))
+        )
+
+        self.assertTrue(all(s is snapshots[0] for s in snapshots))
+        self.fetch.assert_awaited_once()
+
+    async def test_stale_snapshot_is_served_while_refreshing(self):
+        first = await self.cache.get_snapshot()
+        self.cache.ttl_seconds = 0
+
+        stale = await self.cache.get_snapshot()
+        self.assertIs(stale, first)
+
+        await self.cache.refresh()
+        self.assertIsNot(self.cache.snapshot, first)
+        self.assertEqual(self.fetch.await_count, 2)
+
+    async def test_unchanged_feed_keeps_version(self):
+        first = await self.cache.get_snapshot()
+        await self.cache.refresh()
+
+        snapshot = self.cache.snapshot
+        self.assertEqual(snapshot.version, first.version)
+        self.assertIs(snapshot.graph, first.graph)
+        self.assertGreaterEqual(snapshot.loaded_at, first.loaded_at)
+        self.assertFalse(snapshot.delta)
+
+    async def test_changed_feed_is_applied_as_delta(self):
+        first = await self.cache.get_snapshot()
+        feed = generate_flight_event_json()
+        moved = dict(feed[0], arrival_city="PMI")
+        extra = create_flight_event_dict(flight_number="IB3000")
+        self.fetch.side_effect = stream_flight_events([moved] + feed[2:] + [extra])
+
+        await self.cache.refresh()
+
+        snapshot = self.cache.snapshot
+        self.assertGreater(snapshot.version, first.version)
+        self.assertEqual(snapshot.delta.base_version, first.version)
+        self.assertEqual(
+            sorted(e.flight_number for e in snapshot.delta.added),
+            ["AR1000", "IB3000"],
+        )
+        self.assertEqual(
+            sorted(e.flight_number for e in snapshot.delta.removed),
+            ["AR1000", "AR1001"],
+        )
+        self.assertEqual(len(snapshot.events), 12)
+        self.assertEqual(len(set(first.events) & set(snapshot.events)), 10)
+
+    @patch("app.services.flight_snapshot_cache.ConfigVars.SNAPSHOT_DELTA_ENABLED", False)
+    async def test_delta_can_be_disabled(self):
+        first = await self.cache.get_snapshot()
+        await self.cache.refresh()
+
+        self.assertGreater(self.cache.snapshot.version, first.version)
+        self.assertIsNone(self.cache.snapshot.delta)
+
+    @patch("app.services.flight_snapshot_cache.report_error")
+    async def test_failed_refresh_keeps_stale_snapshot(self, mock_report_error):
+        first = await self.cache.get_snapshot()
+        self.cache.ttl_seconds = 0
+        self.fetch.side_effect = stream_flight_events(None)
+
+        await self.cache.get_snapshot()
+        with self.assertRaises(Exception):
+            await self.cache.refresh()
+
+        self.assertIs(self.cache.snapshot, first)
+        mock_report_error.assert_called_once()
+
+    @patch("app.services.flight_snapshot_cache.report_error")
+    async def test_failed_refresh_backs_off(self, mock_report_error):
+        first = await self.cache.get_snapshot()
+        first.loaded_at -= 120
+        self.fetch.side_effect = stream_flight_events(None)
+
+        await self.cache.get_snapshot()
+        with self.assertRaises(Exception):
+            await self.cache._refresh_task
+        for _ in range(10):
+            self.assertIs(await self.cache.get_snapshot(), first)
+        self.assertTrue(self.cache._refresh_task.done())
+        self.assertEqual(self.fetch.await_count, 2)
+
+        # Retried after min(ttl, FLIGHT_EVENTS_RETRY_SECONDS).
+        self.cache._failed_at -= 5
+        await self.cache.get_snapshot()
+        with self.assertRaises(Exception):
+            await self.cache._refresh_task
+        self.assertEqual(self.fetch.await_count, 3)
+
+    async def test_empty_feed_raises(self):
+        self.fetch.side_effect = stream_flight_events([])
+        with self.assertRaises(Exception) as context:
+            await self.cache.get_snapshot()
+        self.assertIn("no flight events", str(context.exception).lower())
+        self.assertIsNone(self.cache.snapshot)
+
+    async def test_clear_forces_reload(self):
+        first = await self.cache.get_snapshot()
+        self.cache.clear()
+        snapshot = await self.cache.get_snapshot()
+
+        self.assertGreater(snapshot.version, first.version)
+        self.assertEqual(self.fetch.await_count, 2)
+
+
+class TestFlightSnapshotCacheFile(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "flights.snapshot")
+        self.feed = generate_flight_event_json()
+        self.workers = []
+
+    async def asyncTearDown(self):
+        for cache in self.workers:
+            if cache._write_task is not None:
+                await cache._write_task
+
+    def worker(self) -> FlightSnapshotCache:
+        cache = FlightSnapshotCache(ttl_seconds=60, snapshot_path=self.path)
+        self.workers.append(cache)
+        cache.adapter.stream_flight_events = AsyncMock(
+            side_effect=stream_flight_events(self.feed)
+        )
+        return cache
+
+    async def test_fetched_feed_is_written_to_the_file(self):
+        cache = self.worker()
+        snapshot = await cache.get_snapshot()
+        await cache._write_task
+
+        with SnapshotFile(self.path) as snapshot_file:
+            self.assertEqual(len(snapshot_file), len(snapshot.events))
+            self.assertLessEqual(snapshot_file.written_at, time.time())
+
+    async def test_second_worker_starts_from_the_file(self):
+        first = self.worker()
+        await first.get_snapshot()
+        await first._write_task
+
+        second = self.worker()
+        snapshot = await second.get_snapshot()
+
+        second.adapter.stream_flight_events.assert_not_awaited()
+        self.assertEqual(len(snapshot.events), 12)
+        self.assertIsNone(second._write_task)
+
+    async def test_stale_file_is_ignored(self):
+        write_snapshot_file(
+            self.path,
+            map(FlightEventDTO.from_dict, self.feed[:1]),
+            written_at=time.time() - 120,
+        )
+        cache = self.worker()
+
+        snapshot = await cache.get_snapshot()
+
+        cache.adapter.stream_flight_events.assert_awaited_once()
+        self.assertEqual(len(snapshot.events), 12)
+
+    async def test_newer_file_replaces_snapshot_on_refresh(self):
+        cache = self.worker()
+        first = await cache.get_snapshot()
+        await cache._write_task
+        write_snapshot_file(
+            self.path, map(FlightEventDTO.from_dict, self.feed[:3]), time.time() + 1
+        )
+
+        await cache.refresh()
+
+        self.assertEqual(len(cache.snapshot.events), 3)
+        self.assertGreater(cache.snapshot.version, first.version)
+        cache.adapter.stream_flight_events.assert_awaited_once()
+
+    async def test_own_file_is_not_reloaded(self):
+        cache = self.worker()
+        await cache.get_snapshot()
+        await cache._write_task
+
+        await cache.refresh()
+
+        self.assertEqual(cache.adapter.stream_flight_events.await_count, 2)
+
+    async def test_unchanged_refresh_only_touches_the_file(self):
+        cache = self.worker()
+        first = await cache.get_snapshot()
+        await cache._write_task
+        written_at = read_written_at(self.path)
+        mtime_ns = os.stat(self.path).st_mtime_ns
+
+        await cache.refresh()
+        await cache._write_task
+
+        self.assertEqual(cache.snapshot.version, first.version)
+        self.assertEqual(read_written_at(self.path), written_at)
+        self.assertGreater(os.stat(self.path).st_mtime_ns, mtime_ns)
+
+    async def test_touched_file_renews_snapshot_without_decoding(self):
+        first = self.worker()
+        await first.get_snapshot()
+        await first._write_task
+        second = self.worker()
+        served = await second.get_snapshot()
+        await first.refresh()
+        await first._write_task
+
+        with patch("app.services.flight_snapshot_cache.SnapshotFile") as mapped:
+            await second.refresh()
+
+        mapped.assert_not_called()
+        second.adapter.stream_flight_events.assert_not_awaited()
+        self.assertEqual(second.snapshot.version, served.version)
+        self.assertIs(second.snapshot.graph, served.graph)
+        self.assertGreaterEqual(second.snapshot.loaded_at, served.loaded_at)
+
+    async def test_changed_file_is_diffed_against_the_snapshot(self):
+        cache = self.worker()
+        first = await cache.get_snapshot()
+        await cache._write_task
+        moved = dict(self.feed[0], arrival_city="PMI")
+        write_snapshot_file(
+            self.path,
+            map(FlightEventDTO.from_dict, [moved] + self.feed[1:]),
+            time.time() + 1,
+        )
+
+        await cache.refresh()
+
+        snapshot = cache.snapshot
+        self.assertGreater(snapshot.version, first.version)
+        self.assertEqual([e.arrival_city for e in snapshot.delta.added], ["PMI"])
+        self.assertEqual(len(snapshot.delta.removed), 1)
+        self.assertEqual(len(set(first.events) & set(snapshot.events)), 11)
+        cache.adapter.stream_flight_events.assert_awaited_once()
+
+    @patch("app.services.flight_snapshot_cache.report_error")
+    async def test_corrupt_file_falls_back_to_upstream(self, mock_report_error):
+        with open(self.path, "wb") as f:
+            f.write(b"not a snapshot" * 10)
+        cache = self.worker()
+
+        snapshot = await cache.get_snapshot()
+
+        self.assertEqual(len(snapshot.events), 12)
+        mock_report_error.assert_called_once()
+        self.assertIn("snapshot file", mock_report_error.call_args[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch, AsyncMock
+
+from app.core.flight_snapshot import FlightSnapshot
+from app.core.snapshot_delta import SnapshotDelta
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.services.flight_snapshot_cache import FlightSnapshotCache
+from app.services.hot_route_cache import HotRouteCache, parse_routes
+from app.services.journey_result_cache import JourneyResultCache
+from app.services.journey_service import JourneyService
+from tests.commons.factorie import (
+    create_flight_event_dict,
+    generate_flight_event_json,
+    stream_flight_events,
+)
+
+
+class TestParseRoutes(unittest.TestCase):
+    def test_parses_comma_separated_routes(self):
+        self.assertEqual(
+            parse_routes(" bue-mad, MAD-BUE ,"), [("BUE", "MAD"), ("MAD", "BUE")]
+        )
+
+    def test_empty_string_disables_hot_routes(self):
+        self.assertEqual(parse_routes(""), [])
+        self.assertFalse(HotRouteCache(routes=[]).enabled)
+
+    def test_invalid_route_raises(self):
+        with self.assertRaises(ValueError):
+            parse_routes("BUEMAD")
+
+
+class TestHotRouteCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.snapshot = FlightSnapshot(
+            list(map(FlightEventDTO.from_dict, generate_flight_event_json())),
+            version=1,
+        )
+        self.hot_routes = HotRouteCache(routes=[("BUE", "MAD")], days=3)
+        self.service = JourneyService(
+            result_cache=JourneyResultCache(max_entries=0), hot_routes=self.hot_routes
+        )
+        self.filter = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
+        )
+        self.start = datetime(2024, 9, 12).date()
+
+    async def test_materialized_journeys_match_live_search(self):
+        expected = await self.service.run_strategies(self.snapshot, self.filter)
+
+        table = await self.hot_routes.build(
+            self.snapshot, self.service.run_strategies, self.start
+        )
+
+        self.assertEqual(len(table.journeys), 3)
+        self.assertEqual(self.hot_routes.lookup(self.filter, 1), expected)
+        self.assertGreater(table.nbytes(), 0)
+
+    async def test_lookup_misses_other_snapshots_and_routes(self):
+        await self.hot_routes.build(
+            self.snapshot, self.service.run_strategies, self.start
+        )
+        other_route = FlightFilterDTO(self.filter.date, "MAD", "BUE")
+
+        self.assertIsNone(self.hot_routes.lookup(self.filter, 2))
+        self.assertIsNone(self.hot_routes.lookup(other_route, 1))
+
+    async def test_older_build_does_not_replace_newer_table(self):
+        newer = FlightSnapshot(self.snapshot.graph, version=2)
+        await self.hot_routes.build(newer, self.service.run_strategies, self.start)
+        await self.hot_routes.build(
+            self.snapshot, self.service.run_strategies, self.start
+        )
+
+        self.assertEqual(self.hot_routes.stats()["snapshot_version"], 2)
+
+    async def test_search_is_served_from_materialized_table(self):
+        await self.hot_routes.build(
+            self.snapshot, self.service.run_strategies, self.start
+        )
+        expected = self.hot_routes.lookup(self.filter, 1)
+
+        with patch.object(self.service, "run_strategies") as run_strategies:
+            journeys = await self.service.search(self.snapshot, self.filter)
+
+        self.assertEqual(journeys, expected)
+        run_strategies.assert_not_called()
+
+    async def test_new_snapshot_schedules_a_build(self):
+        snapshot_cache = FlightSnapshotCache()
+        snapshot_cache.adapter.stream_flight_events = AsyncMock(
+            side_effect=stream_flight_events(generate_flight_event_json())
+        )
+        snapshot_cache.add_listener(self.service.on_snapshot)
+
+        with patch("app.services.hot_route_cache.utc_today", return_value=self.start):
+            snapshot = await snapshot_cache.get_snapshot()
+            await self.hot_routes._build_task
+
+        self.assertEqual(self.hot_routes.stats()["snapshot_version"], snapshot.version)
+        self.assertEqual(len(self.hot_routes.lookup(self.filter, snapshot.version)), 4)
+
+    async def test_incremental_snapshot_only_recomputes_affected_days(self):
+        await self.hot_routes.build(
+            self.snapshot, self.service.run_strategies, self.start
+        )
+        added = FlightEventDTO.from_dict(
+            create_flight_event_dict(
+                "IB3000",
+                departure_datetime="2024-09-16T07:00:00",
+                arrival_datetime="2024-09-16T13:00:00",
+            )
+        )
+        delta = SnapshotDelta(1, [added], [], 24, 1)
+        snapshot = FlightSnapshot.from_delta(self.snapshot, delta, 2)
+
+        with patch.object(
+            self.service, "run_strategies", wraps=self.service.run_strategies
+        ) as run_strategies:
+            await self.hot_routes.build(snapshot, run_strategies, self.start)
+
+        # Of 09-12..09-14 only 09-14 journeys may still reach the new flight.
+        self.assertEqual(run_strategies.call_count, 1)
+        self.assertEqual(self.hot_routes.stats()["snapshot_version"], 2)
+
+    async def test_same_snapshot_version_is_not_rebuilt(self):
+        await self.hot_routes.build(
+            self.snapshot, self.service.run_strategies, self.start
+        )
+
+        self.assertIsNone(
+            self.hot_routes.schedule(self.snapshot, self.service.run_strategies)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import asyncio
+import unittest
+from datetime import datetime
+from unittest.mock import patch, AsyncMock
+
+from app.core.snapshot_delta import SnapshotDelta
+from app.dtos.flight_event_dto import FlightEventDTO
+from app.dtos.flight_filter_dto import FlightFilterDTO
+from app.services.flight_snapshot_cache import FlightSnapshotCache
+from app.services.journey_result_cache import JourneyResultCache
+from app.services.journey_service import JourneyService
+from tests.commons.factorie import (
+    create_flight_event_dict,
+    generate_flight_event_json,
+    stream_flight_events,
+)
+
+
+class TestJourneyResultCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cache = JourneyResultCache(max_entries=2, ttl_seconds=60)
+        self.filter = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
+        )
+
+    async def test_miss_then_hit(self):
+        compute = AsyncMock(return_value=[{"connections": 0, "path": []}])
+        key = JourneyResultCache.key_for(self.filter, 1)
+
+        first = await self.cache.get_or_compute(key, compute)
+        second = await self.cache.get_or_compute(key, compute)
+
+        self.assertEqual(first, second)
+        compute.assert_awaited_once()
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    async def test_new_snapshot_version_is_a_miss(self):
+        compute = AsyncMock(return_value=[])
+
+        await self.cache.get_or_compute(JourneyResultCache.key_for(self.filter, 1), compute)
+        await self.cache.get_or_compute(JourneyResultCache.key_for(self.filter, 2), compute)
+
+        self.assertEqual(compute.await_count, 2)
+
+    async def test_concurrent_identical_searches_are_computed_once(self):
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def compute():
+            started.set()
+            await release.wait()
+            return [{"connections": 0, "path": []}]
+
+        key = JourneyResultCache.key_for(self.filter, 1)
+        tasks = [
+            asyncio.ensure_future(self.cache.get_or_compute(key, compute))
+            for _ in range(5)
+        ]
+        await started.wait()
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        self.assertTrue(all(r == results[0] for r in results))
+        self.assertEqual(self.cache.stats()["misses"], 1)
+        self.assertEqual(self.cache.stats()["coalesced"], 4)
+
+    async def test_least_recently_used_entry_is_evicted(self):
+        compute = AsyncMock(return_value=[])
+        for key in ("a", "b"):
+            await self.cache.get_or_compute(key, compute)
+        await self.cache.get_or_compute("a", compute)
+        await self.cache.get_or_compute("c", compute)
+
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    async def test_expired_entry_is_recomputed(self):
+        self.cache.ttl_seconds = 0
+        compute = AsyncMock(return_value=[])
+
+        await self.cache.get_or_compute("a", compute)
+        await self.cache.get_or_compute("a", compute)
+
+        self.assertEqual(compute.await_count, 2)
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+    async def test_failures_are_not_cached(self):
+        compute = AsyncMock(side_effect=[Exception("boom"), []])
+
+        with self.assertRaises(Exception):
+            await self.cache.get_or_compute("a", compute)
+        self.assertEqual(await self.cache.get_or_compute("a", compute), [])
+        self.assertEqual(compute.await_count, 2)
+
+    async def test_unaffected_results_are_carried_over(self):
+        self.cache.max_entries = 10
+        other = FlightFilterDTO(self.filter.date, "GRU", "PMI")
+        self.cache.put(JourneyResultCache.key_for(self.filter, 1), ["affected"])
+        self.cache.put(JourneyResultCache.key_for(other, 1), ["kept"])
+        self.cache.put(JourneyResultCache.key_for(other, 7), ["other version"])
+        delta = SnapshotDelta(
+            1, [FlightEventDTO.from_dict(create_flight_event_dict())], [], 24, 1
+        )
+
+        self.assertEqual(self.cache.carry_over(delta, 2), 1)
+
+        self.assertIsNone(self.cache.get(JourneyResultCache.key_for(self.filter, 2)))
+        self.assertIsNone(self.cache.get(JourneyResultCache.key_for(other, 1)))
+        self.assertEqual(self.cache.get(JourneyResultCache.key_for(other, 2)), ["kept"])
+        self.assertEqual(
+            self.cache.get(JourneyResultCache.key_for(other, 7)), ["other version"]
+        )
+
+
+class TestJourneyServiceResultCache(unittest.IsolatedAsyncioTestCase):
+    async def test_repeated_search_reuses_cached_result(self):
+        snapshot_cache = FlightSnapshotCache()
+        snapshot_cache.adapter.stream_flight_events = AsyncMock(
+            side_effect=stream_flight_events(generate_flight_event_json())
+        )
+        service = JourneyService(
+            snapshot_cache=snapshot_cache, result_cache=JourneyResultCache()
+        )
+        flight_filter = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
+        )
+
+        with patch.object(
+            service, "run_strategies", wraps=service.run_strategies
+        ) as run_strategies:
+            first = await service.build_journeys(flight_filter)
+            second = await service.build_journeys(flight_filter)
+
+        self.assertEqual(len(first), 4)
+        self.assertEqual(first, second)
+        run_strategies.assert_called_once()
+
+    async def test_refresh_only_invalidates_affected_routes(self):
+        feed = generate_flight_event_json()
+        snapshot_cache = FlightSnapshotCache()
+        snapshot_cache.adapter.stream_flight_events = AsyncMock(
+            side_effect=stream_flight_events(feed)
+        )
+        service = JourneyService(
+            snapshot_cache=snapshot_cache, result_cache=JourneyResultCache()
+        )
+        snapshot_cache.add_listener(service.on_snapshot)
+        day = datetime(2024, 9, 13).date()
+        affected = FlightFilterDTO(date=day, origin="BUE", destination="MAD")
+        unaffected = FlightFilterDTO(date=day, origin="GRU", destination="PMI")
+        await service.build_journeys(affected)
+        await service.build_journeys(unaffected)
+
+        snapshot_cache.adapter.stream_flight_events.side_effect = (
+            stream_flight_events(
+                feed
+                + [
+                    create_flight_event_dict(
+                        "IB3000",
+                        departure_datetime="2024-09-13T06:00:00",
+                        arrival_datetime="2024-09-13T12:00:00",
+                    )
+                ]
+            )
+        )
+        await snapshot_cache.refresh()
+
+        with patch.object(
+            service, "run_strategies", wraps=service.run_strategies
+        ) as run_strategies:
+            self.assertEqual(len(await service.build_journeys(affected)), 5)
+            await service.build_journeys(unaffected)
+
+        run_strategies.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,19 @@
+import asyncio
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 from unittest.mock import patch, AsyncMock
 from datetime import datetime
-from app.services.journey_service import JourneyService
+from app.core.strategies.base import JourneyBuilderStrategy
+from app.services.journey_result_cache import JourneyResultCache
+from app.services.journey_service import SEARCHES, JourneyService
+from app.utils.cursor import CursorExpiredError
+from app.services.flight_snapshot_cache import flight_snapshot_cache
 from app.dtos.flight_filter_dto import FlightFilterDTO
 from app.dtos.flight_event_dto import FlightEventDTO
 from tests.commons.test_helper import vcr
-from tests.commons.factorie import generate_flight_event_json
+from tests.commons.factorie import generate_flight_event_json, stream_flight_events
 
 
 
@@ -13,6 +21,7 @@ from tests.commons.factorie import generate_flight_event_json
 class TestJourneyService(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
+        flight_snapshot_cache.clear()
         self.service = JourneyService()
         self.filter = FlightFilterDTO(
             date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
@@ -27,23 +36,23 @@ class TestJourneyService(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(flights[0].departure_city, "MAD")
 
     @patch(
-        "app.adapters.flight_event_adapter.FlightEventAdapter.fetch_flight_events",
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
         new_callable=AsyncMock,
     )
-    async def test_get_flight_events_raises_exception_when_empty(self, mock_fetch):
-        mock_fetch.return_value = []
+    async def test_get_flight_events_raises_exception_when_empty(self, mock_stream):
+        mock_stream.return_value = 0
         with self.assertRaises(Exception) as context:
             await self.service.get_flight_events()
         self.assertIn("no flight events", str(context.exception).lower())
 
     @patch(
-        "app.adapters.flight_event_adapter.FlightEventAdapter.fetch_flight_events",
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
         new_callable=AsyncMock,
     )
     async def test_build_journeys_calls_strategies_and_combines_results(
-        self, mock_fetch
+        self, mock_stream
     ):
-        mock_fetch.return_value = generate_flight_event_json()
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
 
         journeys = await self.service.build_journeys(self.filter)
 
@@ -61,11 +70,11 @@ class TestJourneyService(unittest.IsolatedAsyncioTestCase):
 
         self.assertTrue(all(j["path"][0].departure_city == "BUE" for j in journeys))
         self.assertTrue(all(j["path"][-1].arrival_city == "MAD" for j in journeys))
-        mock_fetch.assert_awaited_once()
+        mock_stream.assert_awaited_once()
 
     @patch("app.services.journey_service.report_error")
     @patch(
-        "app.adapters.flight_event_adapter.FlightEventAdapter.fetch_flight_events",
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
         new_callable=AsyncMock,
     )
     @patch(
@@ -77,9 +86,9 @@ class TestJourneyService(unittest.IsolatedAsyncioTestCase):
         new_callable=AsyncMock,
     )
     async def test_build_journeys_when_strategies_return_empty(
-        self, mock_one_stop, mock_direct, mock_fetch, mock_report_error
+        self, mock_one_stop, mock_direct, mock_stream, mock_report_error
     ):
-        mock_fetch.return_value = []
+        mock_stream.return_value = 0
 
 
         journeys = await self.service.build_journeys(self.filter)
@@ -91,4 +100,297 @@ class TestJourneyService(unittest.IsolatedAsyncioTestCase):
         )
         mock_direct.assert_not_awaited()
         mock_one_stop.assert_not_awaited()
-        mock_fetch.assert_awaited_once()
+        mock_stream.assert_awaited_once()
+
+
+class TestJourneyServiceBatch(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        flight_snapshot_cache.clear()
+        self.service = JourneyService(result_cache=JourneyResultCache())
+        self.filters = [
+            FlightFilterDTO(date=datetime(2024, 9, d).date(), origin="BUE", destination="MAD")
+            for d in (12, 13, 13)
+        ]
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_batch_uses_one_snapshot_and_keeps_order(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+
+        results = await self.service.build_journeys_batch(self.filters)
+
+        self.assertEqual([len(r) for r in results], [1, 4, 4])
+        self.assertEqual(results[1], results[2])
+        self.assertEqual(self.service.result_cache.stats()["misses"], 2)
+        mock_stream.assert_awaited_once()
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_searches_are_counted_as_computed_or_cached(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        computed = SEARCHES.labels("computed")
+        cached = SEARCHES.labels("result_cache")
+        before = computed.value, cached.value
+
+        await self.service.build_journeys_batch(self.filters)
+        self.assertEqual(
+            (computed.value - before[0], cached.value - before[1]), (2, 1)
+        )
+        await self.service.build_journeys_batch(self.filters)
+        self.assertEqual(
+            (computed.value - before[0], cached.value - before[1]), (2, 4)
+        )
+
+    @patch("app.services.journey_service.report_error")
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_batch_without_snapshot_returns_empty_results(
+        self, mock_stream, mock_report_error
+    ):
+        mock_stream.return_value = 0
+
+        results = await self.service.build_journeys_batch(self.filters)
+
+        self.assertEqual(results, [[], [], []])
+        mock_report_error.assert_called_once()
+
+
+class TestJourneyServiceStreaming(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        flight_snapshot_cache.clear()
+        self.filter = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
+        )
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_stream_matches_build_journeys_and_is_cached(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        expected = await JourneyService(
+            result_cache=JourneyResultCache(max_entries=0)
+        ).build_journeys(self.filter)
+        service = JourneyService(result_cache=JourneyResultCache())
+
+        streamed = [j async for j in service.stream_journeys(self.filter)]
+        again = [j async for j in service.stream_journeys(self.filter)]
+
+        self.assertEqual(streamed, expected)
+        self.assertEqual(again, expected)
+        self.assertEqual(service.result_cache.stats()["hits"], 1)
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_stream_closed_early_is_not_cached(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        service = JourneyService(result_cache=JourneyResultCache())
+
+        journeys = service.stream_journeys(self.filter)
+        await journeys.__anext__()
+        await journeys.aclose()
+
+        self.assertEqual(len(service.result_cache), 0)
+
+
+class TestJourneyServicePagination(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        flight_snapshot_cache.clear()
+        self.filter = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
+        )
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_pages_follow_build_journeys_order(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        service = JourneyService(result_cache=JourneyResultCache(max_entries=0))
+        expected = await service.build_journeys(self.filter)
+
+        first = await service.search_page(self.filter, limit=3)
+        second = await service.search_page(
+            self.filter, 3, first.next_offset, first.snapshot_version
+        )
+
+        self.assertEqual(first.next_offset, 3)
+        self.assertIsNone(second.next_offset)
+        self.assertEqual(first.journeys + second.journeys, expected)
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_page_filled_by_direct_flights_skips_one_stop(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        service = JourneyService(result_cache=JourneyResultCache(max_entries=0))
+
+        with patch(
+            "app.core.strategies.one_stop.OneStopJourneyStrategy.iter_journeys"
+        ) as one_stop:
+            page = await service.search_page(self.filter, limit=1)
+
+        self.assertEqual([j["connections"] for j in page.journeys], [0])
+        self.assertEqual(page.next_offset, 1)
+        one_stop.assert_not_called()
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_cached_result_is_sliced(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        service = JourneyService(result_cache=JourneyResultCache())
+        expected = await service.build_journeys(self.filter)
+
+        with patch.object(service, "first_journeys") as first_journeys:
+            page = await service.search_page(self.filter, 2, offset=2)
+
+        self.assertEqual(page.journeys, expected[2:])
+        first_journeys.assert_not_called()
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_cursor_from_replaced_snapshot_expires(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        service = JourneyService(result_cache=JourneyResultCache(max_entries=0))
+        page = await service.search_page(self.filter, limit=1)
+
+        with self.assertRaises(CursorExpiredError):
+            await service.search_page(
+                self.filter, 1, page.next_offset, page.snapshot_version + 1
+            )
+
+
+class TestJourneyServiceReachability(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        flight_snapshot_cache.clear()
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_unreachable_pair_skips_strategies(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        service = JourneyService(result_cache=JourneyResultCache())
+        flight_filter = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="MAD", destination="XXX"
+        )
+
+        with patch.object(service, "run_strategies") as run_strategies:
+            journeys = await service.build_journeys(flight_filter)
+
+        self.assertEqual(journeys, [])
+        run_strategies.assert_not_called()
+        self.assertEqual(len(service.result_cache), 0)
+
+    @patch("app.services.journey_service.ConfigVars.MAX_CONNECTIONS", 3)
+    async def test_multi_stop_search_does_not_use_reachability(self):
+        service = JourneyService()
+        self.assertFalse(service.check_reachability)
+
+
+class DelayedStrategy(JourneyBuilderStrategy):
+    def __init__(self, name: str, delay: float, timeline: list):
+        self.name = name
+        self.delay = delay
+        self.timeline = timeline
+
+    async def execute(self, flight_events, flight_filter):
+        self.timeline.append(f"start {self.name}")
+        await asyncio.sleep(self.delay)
+        self.timeline.append(f"end {self.name}")
+        return self.find_journeys(flight_events, flight_filter)
+
+    def iter_journeys(self, graph, flight_filter):
+        event = FlightEventDTO(
+            flight_number=self.name,
+            departure_city="BUE",
+            arrival_city="MAD",
+            departure_datetime=datetime(2024, 9, 13, 8, 0),
+            arrival_datetime=datetime(2024, 9, 13, 20, 0),
+        )
+        return [{"connections": 0, "path": [event]}]
+
+
+class ThreadRecordingStrategy(JourneyBuilderStrategy):
+    cpu_bound = True
+
+    def __init__(self):
+        self.thread = None
+
+    def iter_journeys(self, graph, flight_filter):
+        self.thread = threading.current_thread()
+        return []
+
+
+class TestJourneyServiceConcurrency(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        flight_snapshot_cache.clear()
+        self.filter = FlightFilterDTO(
+            date=datetime(2024, 9, 13).date(), origin="BUE", destination="MAD"
+        )
+
+    async def test_strategies_run_concurrently_and_keep_their_order(self):
+        service = JourneyService(result_cache=JourneyResultCache(max_entries=0))
+        timeline = []
+        service.strategies = [
+            DelayedStrategy("slow", 0.05, timeline),
+            DelayedStrategy("fast", 0, timeline),
+        ]
+        journeys = await service.run_strategies(
+            SimpleNamespace(graph=[]), self.filter
+        )
+
+        self.assertEqual(
+            timeline, ["start slow", "start fast", "end fast", "end slow"]
+        )
+        self.assertEqual(
+            [j["path"][0].flight_number for j in journeys], ["slow", "fast"]
+        )
+
+    @patch(
+        "app.adapters.flight_event_adapter.FlightEventAdapter.stream_flight_events",
+        new_callable=AsyncMock,
+    )
+    async def test_executor_returns_the_same_journeys(self, mock_stream):
+        mock_stream.side_effect = stream_flight_events(generate_flight_event_json())
+        inline = JourneyService(result_cache=JourneyResultCache(max_entries=0))
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pooled = JourneyService(
+                result_cache=JourneyResultCache(max_entries=0), executor=executor
+            )
+
+            expected = await inline.build_journeys(self.filter)
+            journeys = await pooled.build_journeys(self.filter)
+
+        self.assertEqual(len(journeys), 4)
+        self.assertEqual(journeys, expected)
+
+    async def test_only_cpu_bound_strategies_are_offloaded(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            service = JourneyService(
+                result_cache=JourneyResultCache(max_entries=0), executor=executor
+            )
+            offloaded = ThreadRecordingStrategy()
+            service.strategies = [offloaded]
+
+            await service.run_strategies(SimpleNamespace(graph=[]), self.filter)
+
+        self.assertIsNot(offloaded.thread, threading.current_thread())
@@ -0,0 +1,21 @@
+import unittest
+
+from app.utils.cursor import decode_cursor, encode_cursor
+
+
+class TestCursor(unittest.TestCase):
+    def test_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(12, 40)), (12, 40))
+
+    def test_cursor_is_url_safe(self):
+        cursor = encode_cursor(123456789, 987654321)
+        self.assertRegex(cursor, r"^[A-Za-z0-9_-]+$")
+
+    def test_malformed_cursor_raises_value_error(self):
+        for cursor in ("", "not-a-cursor", encode_cursor(1, 2) + "!", "LTE6Mg"):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import json
+import unittest
+
+from app.utils.json_stream import JSONArrayStreamParser
+from tests.commons.factorie import generate_flight_event_json
+
+
+def parse_in_chunks(payload: bytes, chunk_size: int):
+    parser = JSONArrayStreamParser()
+    items = []
+    for i in range(0, len(payload), chunk_size):
+        items.extend(parser.feed(payload[i : i + chunk_size]))
+    items.extend(parser.close())
+    return items
+
+
+class TestJSONArrayStreamParser(unittest.TestCase):
+    def test_parses_whole_document(self):
+        events = generate_flight_event_json()
+        payload = json.dumps(events).encode()
+        self.assertEqual(parse_in_chunks(payload, len(payload)), events)
+
+    def test_parses_byte_by_byte(self):
+        events = generate_flight_event_json()
+        payload = json.dumps(events, indent=2).encode()
+        self.assertEqual(parse_in_chunks(payload, 1), events)
+
+    def test_yields_elements_before_the_array_ends(self):
+        parser = JSONArrayStreamParser()
+        items = parser.feed(b'[{"a": 1}, {"b"')
+        self.assertEqual(items, [{"a": 1}])
+        self.assertEqual(parser.feed(b": 2}]"), [{"b": 2}])
+        self.assertEqual(parser.close(), [])
+
+    def test_multibyte_characters_split_across_chunks(self):
+        payload = json.dumps([{"city": "São Paulo"}], ensure_ascii=False).encode()
+        self.assertEqual(parse_in_chunks(payload, 1), [{"city": "São Paulo"}])
+
+    def test_numbers_split_across_chunks(self):
+        self.assertEqual(parse_in_chunks(b"[12345, 678]", 2), [12345, 678])
+
+    def test_empty_array(self):
+        self.assertEqual(parse_in_chunks(b" [ ] ", 1), [])
+
+    def test_truncated_array_raises(self):
+        with self.assertRaises(ValueError):
+            parse_in_chunks(b'[{"a": 1}, ', 4)
+
+    def test_non_array_document_raises(self):
+        with self.assertRaises(ValueError):
+            parse_in_chunks(b'{"a": 1}', 4)
+
+    def test_trailing_data_raises(self):
+        with self.assertRaises(ValueError):
+            parse_in_chunks(b"[1] [2]", 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import io
+import json
+import logging
+import queue
+import unittest
+
+from logging.handlers import QueueListener
+from unittest.mock import patch
+from app.utils.logger import (
+    JSONFormatter,
+    LOG_RECORDS_DROPPED,
+    NonBlockingQueueHandler,
+    RepeatFilter,
+    TextFormatter,
+)
+
+
+def make_record(message: str, level: int = logging.ERROR, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("flights_api", level, __file__, 1, message, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestLogger(unittest.TestCase):
+    def test_json_formatter_includes_extra_fields(self):
+        line = JSONFormatter().format(make_record("boom", route="BUE-MAD"))
+        entry = json.loads(line)
+        self.assertEqual(entry["level"], "ERROR")
+        self.assertEqual(entry["logger"], "flights_api")
+        self.assertEqual(entry["message"], "boom")
+        self.assertEqual(entry["route"], "BUE-MAD")
+        self.assertNotIn("suppressed", entry)
+
+    def test_formatters_report_suppressed_records(self):
+        record = make_record("boom", suppressed=4)
+        self.assertEqual(json.loads(JSONFormatter().format(record))["suppressed"], 4)
+        self.assertIn("4 similar messages suppressed", TextFormatter().format(record))
+
+    @patch("app.utils.logger.time.monotonic")
+    def test_repeat_filter_limits_identical_messages_per_window(self, mock_monotonic):
+        repeat_filter = RepeatFilter(limit=2, window_seconds=60)
+        mock_monotonic.return_value = 0.0
+        passed = [repeat_filter.filter(make_record("boom")) for _ in range(5)]
+        self.assertEqual(passed, [True, True, False, False, False])
+        self.assertTrue(repeat_filter.filter(make_record("other")))
+        self.assertTrue(repeat_filter.filter(make_record("boom", logging.INFO)))
+
+        mock_monotonic.return_value = 61.0
+        record = make_record("boom")
+        self.assertTrue(repeat_filter.filter(record))
+        self.assertEqual(record.suppressed, 3)
+
+    def test_repeat_filter_can_be_disabled(self):
+        repeat_filter = RepeatFilter(limit=0, window_seconds=60)
+        self.assertTrue(all(repeat_filter.filter(make_record("boom")) for _ in range(50)))
+
+    def test_full_queue_drops_records_without_blocking(self):
+        handler = NonBlockingQueueHandler(queue.Queue(1))
+        dropped = LOG_RECORDS_DROPPED.labels("queue_full")
+        before = dropped.value
+        handler.handle(make_record("first"))
+        handler.handle(make_record("second"))
+        self.assertEqual(handler.queue.qsize(), 1)
+        self.assertEqual(dropped.value, before + 1)
+
+    def test_records_are_written_by_listener(self):
+        stream = io.StringIO()
+        output = logging.StreamHandler(stream)
+        output.setFormatter(JSONFormatter())
+        handler = NonBlockingQueueHandler(queue.Queue())
+        logger = logging.getLogger("flights_api.test_listener")
+        logger.propagate = False
+        logger.addHandler(handler)
+        listener = QueueListener(handler.queue, output)
+        listener.start()
+        try:
+            logger.error("upstream %s failed", "feed", extra={"status": 503})
+        finally:
+            listener.stop()
+            logger.removeHandler(handler)
+
+        entry = json.loads(stream.getvalue())
+        self.assertEqual(entry["message"], "upstream feed failed")
+        self.assertEqual(entry["status"], 503)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from app.utils.metrics import Counter, Gauge, Histogram, Metric, Registry
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_renders_per_label_series(self):
+        requests = self.registry.register(
+            Counter("requests_total", "Requests.", ("outcome",))
+        )
+        requests.labels("ok").inc()
+        requests.labels("ok").inc(2)
+        requests.labels("error").inc()
+
+        text = self.registry.render()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{outcome="ok"} 3', text)
+        self.assertIn('requests_total{outcome="error"} 1', text)
+
+    def test_wrong_label_count_raises_value_error(self):
+        requests = Counter("requests_total", "Requests.", ("outcome",))
+        with self.assertRaises(ValueError):
+            requests.labels("ok", "extra")
+
+    def test_duplicate_name_raises_value_error(self):
+        self.registry.register(Gauge("size", "Size."))
+        with self.assertRaises(ValueError):
+            self.registry.register(Gauge("size", "Size."))
+
+    def test_metric_kind_must_define_its_series(self):
+        with self.assertRaises(TypeError):
+            Metric("size", "Size.")
+
+    def test_histogram_buckets_are_cumulative(self):
+        latency = self.registry.register(
+            Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        )
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+
+        text = self.registry.render()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("latency_seconds_count 4", text)
+        self.assertIn("latency_seconds_sum 3.65", text)
+
+    def test_histogram_timer_observes_block(self):
+        latency = Histogram("latency_seconds", "Latency.", ("stage",))
+        with latency.labels("parse").time():
+            pass
+        self.assertEqual(latency.labels("parse").count, 1)
+        self.assertEqual(latency.labels("index").count, 0)
+
+    def test_collector_families_are_rendered(self):
+        self.registry.add_collector(
+            lambda: [("cache_entries", "gauge", "Entries.", [("cache_entries", {}, 7)])]
+        )
+        self.assertIn("cache_entries 7", self.registry.render())
+
+    def test_label_values_are_escaped(self):
+        requests = self.registry.register(Counter("requests_total", "R.", ("path",)))
+        requests.labels('a"b\\c').inc()
+        self.assertIn('requests_total{path="a\\"b\\\\c"} 1', self.registry.render())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from unittest.mock import patch
+from app.utils.metrics import Histogram
+from app.utils.profiling import (
+    InlineExecutor,
+    ProfilerBusyError,
+    RequestProfiler,
+    profiling_allowed,
+)
+
+
+class TestProfiling(unittest.TestCase):
+    def test_profiling_is_disabled_by_default(self):
+        self.assertFalse(profiling_allowed(""))
+        self.assertFalse(profiling_allowed("secret"))
+
+    @patch("app.utils.profiling.ConfigVars.PROFILING_TOKENS", " a , secret ,")
+    def test_token_must_be_in_allowlist(self):
+        self.assertTrue(profiling_allowed("secret"))
+        self.assertFalse(profiling_allowed("secre"))
+        self.assertFalse(profiling_allowed(""))
+
+    def test_profiler_records_observations_made_inside_it(self):
+        stages = Histogram("stage_seconds", "Stages.", ("stage",))
+        stages.labels("sort").observe(5.0)
+        with RequestProfiler() as profiler:
+            stages.labels("sort").observe(0.25)
+            stages.labels("sort").observe(0.5)
+            sorted(range(100))
+        stages.labels("sort").observe(7.0)
+
+        report = profiler.report(journeys=0)
+        self.assertEqual(report["breakdown"], {"stage": {"sort": 0.75}})
+        self.assertEqual(report["journeys"], 0)
+        self.assertTrue(
+            any("sorted" in row["function"] for row in report["top_functions"])
+        )
+
+    def test_one_request_is_profiled_at_a_time(self):
+        with RequestProfiler():
+            with self.assertRaises(ProfilerBusyError):
+                with RequestProfiler():
+                    pass
+        with RequestProfiler():
+            pass
+
+    def test_inline_executor_runs_on_calling_thread(self):
+        future = InlineExecutor().submit(lambda x: x * 2, 21)
+        self.assertEqual(future.result(), 42)
+        failed = InlineExecutor().submit(lambda: 1 / 0)
+        self.assertIsInstance(failed.exception(), ZeroDivisionError)
+
+
+if __name__ == "__main__":
+    unittest.main()